@@ -44,6 +44,10 @@ app.register_blueprint(pipeline_bp)
 from routes.upload_routes import upload_bp
 app.register_blueprint(upload_bp)
 
+# Background uploads from a previous run were lost with its process
+from controllers.upload_controller import fail_stale_upload_jobs
+fail_stale_upload_jobs()
+
 from routes.dataset_routes import dataset_bp
 app.register_blueprint(dataset_bp)
 
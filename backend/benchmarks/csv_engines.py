@@ -0,0 +1,66 @@
+# backend/benchmarks/csv_engines.py
+# python benchmarks/csv_engines.py [file.csv ...] [--repeat 5] [--scale 20]
+#
+# Compares the CSV parse engines CSVDataIngestor can use. With no files it runs on
+# the bundled AmesHousing.csv, plus a copy scaled up --scale times so the
+# multithreaded engine has enough blocks to parallelise (pass the taxi data or
+# any other large CSV explicitly).
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from core.src.ingest_data import read_csv
+
+AMES_CSV = os.path.join(os.path.dirname(__file__), "..", "backend", "extracted_data", "AmesHousing.csv")
+CONFIGURATIONS = [
+    ("c", "numpy"),
+    ("pyarrow", "numpy"),
+    ("pyarrow", "pyarrow"),
+]
+
+
+def time_read(file_path, engine, dtype_backend, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_csv(file_path, engine=engine, dtype_backend=dtype_backend)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV parse engines")
+    parser.add_argument("files", nargs="*", help="CSV files to parse (default: AmesHousing.csv)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per configuration; the median is reported")
+    parser.add_argument("--scale", type=int, default=20, help="Row multiplier for the scaled AmesHousing copy")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = args.files
+        if not files:
+            scaled_path = os.path.join(temp_dir, f"AmesHousing_x{args.scale}.csv")
+            pd.concat([pd.read_csv(AMES_CSV)] * args.scale).to_csv(scaled_path, index=False)
+            files = [AMES_CSV, scaled_path]
+
+        print(f"CPUs: {os.cpu_count()}, runs per configuration: {args.repeat}")
+        for file_path in files:
+            size_mb = os.path.getsize(file_path) / 1024 ** 2
+            print(f"\n{os.path.basename(file_path)} ({size_mb:.1f} MB)")
+            baseline = None
+            for engine, dtype_backend in CONFIGURATIONS:
+                seconds = time_read(file_path, engine, dtype_backend, args.repeat)
+                baseline = baseline or seconds
+                print(f"  engine={engine:<8} dtype_backend={dtype_backend:<8} "
+                      f"{seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/eda_profile.py
+# python benchmarks/eda_profile.py [file.csv ...] [--repeat 5] [--scale 20] [--wide 200]
+#
+# Compares the EDA statistics computed the previous way (isnull().sum(),
+# describe(include="all"), dtypes and head as separate scans) with the
+# single-pass profile_dataframe. With no files it profiles the bundled
+# AmesHousing.csv, a copy scaled up --scale times, and a synthetic frame with
+# --wide numeric and text columns.
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from utils.eda_utils import profile_dataframe, records_for_json
+
+AMES_CSV = os.path.join(os.path.dirname(__file__), "..", "backend", "extracted_data", "AmesHousing.csv")
+
+
+def multi_scan_eda(df):
+    """The statistics generate_eda used to compute, one full scan each."""
+    return {
+        "shape": df.shape,
+        "columns": list(df.columns),
+        "dtypes": df.dtypes.astype(str).to_dict(),
+        "missing_values": df.isnull().sum().to_dict(),
+        "summary": df.describe(include="all").fillna("").to_dict(),
+        "head": records_for_json(df.head(5)),
+    }
+
+
+def wide_frame(n_columns, n_rows=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(n_columns):
+        if i % 4 == 3:
+            data[f"text_{i}"] = rng.choice(["north", "south", "east", "west", None], n_rows)
+        else:
+            values = rng.normal(size=n_rows)
+            values[rng.random(n_rows) < 0.05] = np.nan
+            data[f"num_{i}"] = values
+    return pd.DataFrame(data)
+
+
+def median_seconds(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EDA profiling")
+    parser.add_argument("files", nargs="*", help="CSV files to profile (default: AmesHousing.csv)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per implementation; the median is reported")
+    parser.add_argument("--scale", type=int, default=20, help="Row multiplier for the scaled AmesHousing frame")
+    parser.add_argument("--wide", type=int, default=200, help="Columns in the synthetic wide frame (0 skips it)")
+    args = parser.parse_args()
+
+    frames = [(os.path.basename(path), pd.read_csv(path)) for path in args.files]
+    if not frames:
+        ames = pd.read_csv(AMES_CSV)
+        frames = [("AmesHousing", ames), (f"AmesHousing x{args.scale}", pd.concat([ames] * args.scale))]
+        if args.wide:
+            frames.append((f"synthetic {args.wide} columns", wide_frame(args.wide)))
+
+    print(f"CPUs: {os.cpu_count()}, runs per implementation: {args.repeat}")
+    for name, df in frames:
+        before = median_seconds(multi_scan_eda, df, args.repeat)
+        after = median_seconds(profile_dataframe, df, args.repeat)
+        print(f"\n{name} ({df.shape[0]} rows x {df.shape[1]} columns)")
+        print(f"  multi-scan generate_eda  {before * 1000:9.1f} ms")
+        print(f"  profile_dataframe        {after * 1000:9.1f} ms  {before / after:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
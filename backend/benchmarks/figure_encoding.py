@@ -0,0 +1,77 @@
+# backend/benchmarks/figure_encoding.py
+# python benchmarks/figure_encoding.py [--points 1000000] [--repeat 5]
+#
+# Compares how generate_plot used to encode figures
+# (PlotlyJSONEncoder().encode(fig.to_plotly_json())) with encode_figure, on a
+# scatter of --points points built from numpy arrays (as plotly express
+# builds it) and from Python lists (as figures built from stored aggregates
+# are), and reports the response size with each content coding.
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from plotly.utils import PlotlyJSONEncoder
+from utils import figure_encoding
+from utils.figure_encoding import encode_figure, compress, ENCODINGS
+
+
+def previous_encoding(fig):
+    return PlotlyJSONEncoder().encode(fig.to_plotly_json()).encode("utf-8")
+
+
+def encode_without_orjson(fig):
+    orjson, figure_encoding.orjson = figure_encoding.orjson, None
+    try:
+        return encode_figure(fig)
+    finally:
+        figure_encoding.orjson = orjson
+
+
+def median_seconds(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark figure encoding")
+    parser.add_argument("--points", type=int, default=1_000_000, help="Points in the scatter figure")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per encoder; the median is reported")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=args.points), rng.normal(size=args.points)
+    y[::1000] = np.nan
+    figures = [
+        ("numpy arrays", go.Figure(go.Scattergl(x=x, y=y, mode="markers"))),
+        ("Python lists", go.Figure(go.Scattergl(x=x.tolist(), y=y.tolist(), mode="markers"))),
+    ]
+    encoders = [("PlotlyJSONEncoder", previous_encoding), ("encode_figure", encode_figure)]
+    if figure_encoding.orjson:
+        encoders.append(("  without orjson", encode_without_orjson))
+
+    print(f"{args.points:,} points, runs per encoder: {args.repeat}, "
+          f"orjson: {'yes' if figure_encoding.orjson else 'no'}, codings: {', '.join(ENCODINGS)}")
+    for name, fig in figures:
+        print(f"\nScatter from {name}")
+        for label, encode in encoders:
+            seconds, body = median_seconds(lambda: encode(fig), args.repeat)
+            sizes = [f"{len(body) / 1024 ** 2:6.1f} MB raw"]
+            for encoding in ENCODINGS:
+                compress_seconds, compressed = median_seconds(lambda: compress(body, encoding), 1)
+                sizes.append(f"{len(compressed) / 1024 ** 2:6.1f} MB {encoding} ({compress_seconds * 1000:.0f} ms)")
+            print(f"  {label:<18} {seconds * 1000:8.1f} ms  " + "  ".join(sizes))
+
+
+if __name__ == "__main__":
+    main()
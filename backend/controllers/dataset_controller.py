@@ -1,11 +1,18 @@
 import os
 import pandas as pd
 from utils.db import Database
+from utils.arrow_cache import dataset_cache
+from utils.frame_cache import frame_cache
+from utils.sketches import DatasetSketch
+from utils.eda_store import PROFILE_SECTIONS, load_eda_profile, delete_eda_profile, load_sketches, delete_sketches
+from utils.plot_aggregates import aggregates_version, delete_plot_aggregates
 from bson.objectid import ObjectId
 
 # Controller for:
 # - Listing datasets (optionally filtered by user)
 # - Getting dataset details
+# - Reading EDA sections lazily from the compressed profile store
+# - Approximate statistics from the stored column sketches
 # - Deleting datasets
 
 class DatasetController:
@@ -43,20 +50,98 @@ class DatasetController:
     def get_dataset_details(dataset_id):
         try:
             datasets_collection = Database.get_collection("datasets")
-            dataset = datasets_collection.find_one({"_id": ObjectId(dataset_id)})
+            dataset = datasets_collection.find_one({"_id": ObjectId(dataset_id)}, {"sketches": 0})
             if dataset:
                 dataset["_id"] = str(dataset["_id"])
                 if "user_id" in dataset:
                     dataset["user_id"] = str(dataset["user_id"])
+                # Only the compact EDA; the full profile is read from /dataset/<id>/eda
+                dataset.pop("eda_profile_id", None)
             return dataset
         except Exception as e:
             raise Exception(f"Failed to get dataset details: {str(e)}")
 
+    @staticmethod
+    def get_eda(dataset_id, sections=None, columns=None):
+        """
+        The dataset's EDA: the compact fields stored inline plus the requested
+        sections (default: all) from its stored profile, optionally restricted to
+        some columns. Returns None if the dataset is not found.
+        """
+        unknown = [section for section in sections or [] if section not in PROFILE_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown EDA section(s): {', '.join(unknown)}; choose from {', '.join(PROFILE_SECTIONS)}")
+
+        try:
+            datasets_collection = Database.get_collection("datasets")
+            dataset = datasets_collection.find_one(
+                {"_id": ObjectId(dataset_id)},
+                {"dataset_id": 1, "custom_name": 1, "eda": 1, "eda_profile_id": 1}
+            )
+            if not dataset:
+                return None
+
+            eda = dict(dataset.get("eda") or {})
+            if dataset.get("eda_profile_id"):
+                eda.update(load_eda_profile(dataset["eda_profile_id"], sections, columns))
+            else:
+                # Datasets stored before profiles were split out keep the full EDA inline
+                requested = set(sections or PROFILE_SECTIONS)
+                eda = {key: value for key, value in eda.items() if key not in PROFILE_SECTIONS or key in requested}
+
+            dataset["_id"] = str(dataset["_id"])
+            dataset["eda"] = eda
+            dataset.pop("eda_profile_id", None)
+            return dataset
+        except Exception as e:
+            raise Exception(f"Failed to get dataset EDA: {str(e)}")
+
+    @staticmethod
+    def get_sketch_summary(dataset_id, factor=1.5):
+        """
+        Summary statistics and IQR outlier bounds answered from the sketches stored
+        for the dataset, without reading its data. Returns None if the dataset is
+        not found, and raises ValueError if it predates sketches.
+        """
+        try:
+            datasets_collection = Database.get_collection("datasets")
+            dataset = datasets_collection.find_one({"_id": ObjectId(dataset_id)}, {"eda_profile_id": 1, "sketches": 1})
+            if not dataset:
+                return None
+            # Datasets stored before sketches moved out of line keep them inline
+            sketches = dataset.get("sketches")
+            if not sketches and dataset.get("eda_profile_id"):
+                sketches = load_sketches(dataset["eda_profile_id"])
+        except Exception as e:
+            raise Exception(f"Failed to get dataset sketches: {str(e)}")
+        if not sketches:
+            raise ValueError("Dataset has no stored sketches; upload it again to compute them")
+
+        sketch = DatasetSketch.from_dict(sketches)
+        return {"summary": sketch.summary(), "outlier_bounds": sketch.outlier_bounds(factor)}
+
     @staticmethod
     def delete_dataset(dataset_id):
         try:
             datasets_collection = Database.get_collection("datasets")
-            result = datasets_collection.delete_one({"_id": ObjectId(dataset_id)})
-            return result.deleted_count > 0
+            dataset = datasets_collection.find_one_and_delete(
+                {"_id": ObjectId(dataset_id)}, {"eda_profile_id": 1, "processed_file_path": 1}
+            )
+            if not dataset:
+                return False
+
+            # Deduplicated uploads share the original's EDA profile and sketches
+            profile_id = dataset.get("eda_profile_id")
+            if profile_id and not datasets_collection.find_one({"eda_profile_id": profile_id}, {"_id": 1}):
+                delete_eda_profile(profile_id)
+                delete_sketches(profile_id)
+            # So do their processed file and everything cached from it
+            file_path = dataset.get("processed_file_path")
+            if file_path and not datasets_collection.find_one({"processed_file_path": file_path}, {"_id": 1}):
+                dataset_cache.invalidate(file_path)
+                frame_cache.invalidate(file_path)
+                if os.path.exists(file_path):
+                    delete_plot_aggregates(aggregates_version(file_path))
+            return True
         except Exception as e:
             raise Exception(f"Failed to delete dataset: {str(e)}")
@@ -11,8 +11,63 @@ from flask import jsonify, request, session
 from datetime import datetime
 from bson import ObjectId, json_util
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from utils.db import Database
+from utils.arrow_cache import dataset_cache
+from utils.frame_cache import frame_cache
+from utils.plot_cache import plot_cache, plot_etag, correlation_cache
+from utils.figure_encoding import encode_figure, negotiate_encoding, compress
+from utils.plot_aggregates import (
+    aggregates_version, load_plot_aggregates, column_aggregates, sample_rows, density_grid, correlation_columns,
+    column_correlation, parquet_columns, parquet_null_counts, PLOT_PARTS, PLOT_POINT_BUDGET, PLOT_SCATTER_MODE, CONTOUR_GRID_BINS
+)
+from utils.eda_utils import is_numeric_dtype
+from utils.figures import (
+    histogram_figure, box_figure, violin_figure, value_counts_figure, missing_figure, heatmap_figure,
+    correlation_top_n_figure, density_figure
+)
+from core.src.ingest_data import DataIngestorFactory, to_arrow_table
+
+# Plot types generate_plot and generate_plots accept
+PLOT_TYPES = set(PLOT_PARTS) | {"heatmap", "missing", "scatter", "correlation_top_n", "pairplot", "jointplot"}
+# Figures one batch request may ask for
+MAX_BATCH_PLOTS = int(os.environ.get("MAX_BATCH_PLOTS", 32))
+# Threads that build the figures of batch requests
+PLOT_BATCH_WORKERS = int(os.environ.get("PLOT_BATCH_WORKERS", 4))
+_plot_executor = ThreadPoolExecutor(max_workers=PLOT_BATCH_WORKERS, thread_name_prefix="plot-worker")
+
+
+class SharedIntermediates:
+    """
+    Values several figures of one batch compute from the same data (the loaded
+    frame, its numeric columns, correlation matrix and null counts). Each is
+    computed once, even when the figures are built on different threads.
+    """
+
+    def __init__(self, columns=None):
+        """
+        Parameters:
+        columns (list): Columns the batch's frame is loaded with (None loads all).
+        """
+        self.columns = columns
+        self._values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._values:
+                self._values[key] = compute()
+            return self._values[key]
+
+
+def _shared(shared, key, compute):
+    # Without a batch there is nothing to share
+    return compute() if shared is None else shared.get(key, compute)
 
 
 class EDAController:
@@ -20,27 +75,344 @@ class EDAController:
         self.datasets_collection = Database.get_collection("datasets")
         self.plots_collection = Database.get_collection("saved_plots")
 
-    def _get_dataset_df(self, dataset_id, user_id=None):
-        query = {"$or": [{"dataset_id": dataset_id}, {"_id": ObjectId(dataset_id)}]}
+    def _find_dataset(self, dataset_id, user_id=None):
+        id_filters = [{"dataset_id": dataset_id}]
+        if ObjectId.is_valid(dataset_id):
+            id_filters.append({"_id": ObjectId(dataset_id)})
+        query = {"$or": id_filters}
         if user_id:
             query["user_id"] = user_id
 
-        dataset = self.datasets_collection.find_one(query)
+        dataset = self.datasets_collection.find_one(
+            query, {"_id": 1, "dataset_id": 1, "processed_file_path": 1, "schema": 1}
+        )
         if not dataset:
             return None, "Dataset not found or access denied"
 
         file_path = dataset.get("processed_file_path")
         if not file_path or not os.path.exists(file_path):
             return None, f"Processed file not found: {file_path}"
+        return dataset, None
 
+    def _load_dataset_df(self, dataset, columns=None):
+        file_path = dataset["processed_file_path"]
         try:
-            df = pd.read_csv(file_path)
+            # Parquet for processed datasets; older datasets may still be CSV.
+            # The stored schema replaces type inference and matches the dtypes used in training.
+            ingestor = DataIngestorFactory.get_data_ingestor(
+                os.path.splitext(file_path)[1], schema=dataset.get("schema")
+            )
+            if columns and file_path.endswith(".parquet") and not dataset_cache.contains(file_path):
+                # Parquet reads just the projected columns, so a cold plot request
+                # doesn't parse the whole table to materialize it in the Arrow cache.
+                # Most plots take this path: the Arrow cache only serves them once a
+                # pipeline run has materialized the file.
+                def load():
+                    return ingestor.ingest(file_path, columns=columns)
+            else:
+                # Whole-table reads, legacy CSV datasets and files already in the
+                # Arrow cache go through the cache. Plots only read the frame, so
+                # numeric columns can stay zero-copy views of the mapped file.
+                def load():
+                    return dataset_cache.get_dataframe(
+                        file_path, lambda: to_arrow_table(ingestor.ingest(file_path)),
+                        columns=columns, zero_copy=True
+                    )
+            # Frames stay in this process's LRU cache between requests
+            df = frame_cache.get(file_path, load, columns)
             return df, None
         except Exception as e:
-            return None, f"Failed to load dataset CSV: {str(e)}"
+            return None, f"Failed to load dataset: {str(e)}"
+
+    def _get_dataset_df(self, dataset_id, user_id=None, columns=None):
+        dataset, err = self._find_dataset(dataset_id, user_id)
+        if err:
+            return None, err
+        return self._load_dataset_df(dataset, columns)
+
+    @staticmethod
+    def _dataset_dtypes(dataset):
+        """Column name -> dtype from the stored schema or the Parquet footer; None when unknown."""
+        schema = dataset.get("schema")
+        try:
+            if schema and schema.get("dtypes"):
+                dtypes = {name: pd.api.types.pandas_dtype(dtype) for name, dtype in schema["dtypes"].items()}
+                return {name: dtypes[name] for name in schema.get("columns", dtypes) if name in dtypes}
+            if dataset["processed_file_path"].endswith(".parquet"):
+                return parquet_columns(dataset["processed_file_path"])
+        except (TypeError, ValueError, OSError):
+            pass
+        return None
+
+    def _plot_columns(self, dataset, plot_type, column, column2):
+        """
+        The columns a plot reads, so only those are loaded: the selected ones for
+        single- and two-column plots, the numeric and boolean ones for correlation
+        plots, the first five numeric ones for pairplot. None means every column.
+        """
+        dtypes = self._dataset_dtypes(dataset)
+        if dtypes is None:
+            return None
+        if plot_type in PLOT_PARTS or plot_type in ("scatter", "jointplot"):
+            # A missing column comes out as an empty projection; the figure reports it
+            return [name for name in dict.fromkeys([column, column2]) if name in dtypes]
+        numeric = [name for name, dtype in dtypes.items()
+                   if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+        if plot_type == "pairplot":
+            return numeric[:5]
+        if plot_type in ("heatmap", "correlation_top_n"):
+            # Both read the matrix over numeric and boolean columns, cached per version
+            return correlation_columns(pd.Series(dtypes, dtype=object))
+        return None
+
+    def _missing_counts(self, dataset):
+        """
+        Missing values per column. Parquet files answer from their null counts;
+        only text columns the stored schema parses as dates are read, since
+        unparseable dates become missing values.
+        """
+        file_path = dataset["processed_file_path"]
+        missing = parquet_null_counts(file_path) if file_path.endswith(".parquet") else None
+        if missing is None:
+            df, err = self._load_dataset_df(dataset)
+            if err:
+                raise LookupError(err)
+            return df.isnull().sum()
+
+        dates = [name for name in (dataset.get("schema") or {}).get("datetime_formats", {}) if name in missing]
+        if dates:
+            df, err = self._load_dataset_df(dataset, dates)
+            if err:
+                raise LookupError(err)
+            missing[dates] = df[dates].isnull().sum()
+        return missing
+
+    def _figure_from_aggregates(self, dataset, plot_type, column, column2, top_n):
+        """
+        Build the figure from the aggregates precomputed at upload time. Returns
+        None when they were not precomputed or cannot answer this request, so
+        the caller falls back to the raw rows.
+        """
+        file_path = dataset["processed_file_path"]
+        version = aggregates_version(file_path)
+        if plot_type in ("heatmap", "correlation_top_n"):
+            # Correlations computed by earlier requests are cached for every file type
+            correlation = self._cached_correlation(version, file_path)
+            if correlation is not None:
+                return self._correlation_figure(plot_type, correlation, column, top_n)
+            row = correlation_cache.get(version, column) if plot_type == "correlation_top_n" else None
+            return correlation_top_n_figure(row, column, top_n) if row is not None else None
+
+        if not file_path.endswith(".parquet"):
+            return None
+
+        if plot_type in PLOT_PARTS:
+            aggregates = load_plot_aggregates(version, "column", column) if column else None
+            if not aggregates or not all(part in aggregates for part in self._parts_needed(plot_type, aggregates)):
+                return None
+            return self._column_figure(plot_type, column, aggregates)
+
+        if plot_type == "missing":
+            missing = load_plot_aggregates(version, "missing")
+            if missing is None:
+                return None
+            return missing_figure(pd.Series(dict(missing), dtype="int64"))
+
+        return None
+
+    @staticmethod
+    def _cached_correlation(version, file_path):
+        """
+        The correlation matrix of the dataset's numeric and boolean columns as
+        {"matrix": DataFrame, "bool_columns": [...]}: from this worker's cache, or
+        from the aggregates precomputed for Parquet files. None if neither has it.
+        """
+        correlation = correlation_cache.get(version)
+        if correlation is None and file_path.endswith(".parquet"):
+            stored = load_plot_aggregates(version, "correlation")
+            if stored is not None:
+                correlation = {
+                    "matrix": pd.DataFrame(stored["matrix"], index=stored["columns"],
+                                           columns=stored["columns"], dtype="float64"),
+                    "bool_columns": stored["bool_columns"],
+                }
+                correlation_cache.put(version, correlation)
+        return correlation
+
+    @staticmethod
+    def _frame_correlation(version, df):
+        """The correlation matrix of df's numeric and boolean columns, cached under the dataset version."""
+        corr = df.corr(numeric_only=True)
+        correlation = {"matrix": corr,
+                       "bool_columns": [c for c in corr.columns if pd.api.types.is_bool_dtype(df[c].dtype)]}
+        correlation_cache.put(version, correlation)
+        return correlation
+
+    @staticmethod
+    def _correlation_figure(plot_type, correlation, column, top_n):
+        corr = correlation["matrix"]
+        if plot_type == "heatmap":
+            # select_dtypes(include="number") leaves booleans out of the heatmap
+            numeric = [c for c in corr.columns if c not in correlation["bool_columns"]]
+            return heatmap_figure(corr.loc[numeric, numeric])
+        return correlation_top_n_figure(corr, column, top_n)
+
+    @staticmethod
+    def _parts_needed(plot_type, aggregates):
+        parts = PLOT_PARTS[plot_type]
+        if plot_type == "histogram" and not aggregates["numeric"] and "histogram" not in aggregates:
+            # Text columns are drawn from their value counts
+            return ("value_counts",)
+        return parts
+
+    def _column_figure(self, plot_type, column, aggregates):
+        """Single-column plots drawn from the column's aggregates rather than its raw values."""
+        if plot_type == "histogram":
+            if "histogram" in aggregates:
+                if not aggregates["histogram"]["counts"]:
+                    raise ValueError(f"Column '{column}' has no values to plot")
+                return histogram_figure(column, aggregates["histogram"])
+            return value_counts_figure(column, aggregates["value_counts"])
+
+        if plot_type == "category_distribution":
+            return value_counts_figure(column, aggregates["value_counts"], color=True)
+
+        if not aggregates["numeric"]:
+            raise ValueError(f"Column '{column}' is not numeric")
+        if not aggregates["box"]:
+            raise ValueError(f"Column '{column}' has no values to plot")
+        if plot_type == "boxplot":
+            return box_figure(column, aggregates["box"])
+        return violin_figure(column, aggregates["box"], aggregates["kde"])
+
+    @staticmethod
+    def _with_sampling(fig, mode, points, rows):
+        """Records in the figure's layout.meta how many of the rows it shows and how."""
+        fig.update_layout(meta={"sampling": {
+            "mode": mode, "points": int(points), "rows": int(rows),
+            "sampling_ratio": round(points / rows, 6) if rows else 1.0,
+        }})
+        return fig
+
+    def _point_figure(self, df, column, column2, contour):
+        """
+        Scatter (or density contour) of two columns. Above PLOT_POINT_BUDGET complete
+        pairs, numeric columns are binned into a density grid (always for contours,
+        for scatters when PLOT_SCATTER_MODE is "density"); otherwise the pairs are
+        reduced to a stratified sample that keeps the extremes.
+        """
+        points = df[list(dict.fromkeys([column, column2]))].dropna()
+        rows = len(points)
+        numeric = is_numeric_dtype(points[column].dtype) and is_numeric_dtype(points[column2].dtype)
+        if rows > PLOT_POINT_BUDGET and numeric and (contour or PLOT_SCATTER_MODE == "density"):
+            grid = density_grid(points[column], points[column2], bins=CONTOUR_GRID_BINS if contour else None)
+            return self._with_sampling(density_figure(column, column2, grid, contour=contour), "density", rows, rows)
+
+        sample = sample_rows(points, [column, column2], PLOT_POINT_BUDGET)
+        draw = px.density_contour if contour else px.scatter
+        fig = draw(points.iloc[sample], x=column, y=column2)
+        return self._with_sampling(fig, "sample" if len(sample) < rows else "full", len(sample), rows)
+
+    def _figure_from_frame(self, df, plot_type, column, column2, top_n, shared=None, version=None):
+        """
+        Build the figure from the dataset's rows. Raises ValueError for requests it cannot plot.
+        Within a batch, shared holds the intermediates other figures of the same frame reuse.
+        Correlations are cached under the dataset version.
+        """
+        if plot_type in PLOT_PARTS:
+            if column not in df:
+                raise ValueError(f"Column '{column}' not found")
+            # Bins, quartiles and densities are computed here, so the figure
+            # stays small however many rows the column has
+            return self._column_figure(plot_type, column, column_aggregates(df[column], PLOT_PARTS[plot_type]))
+
+        elif plot_type == "heatmap":
+            correlation = _shared(shared, "correlation", lambda: self._frame_correlation(version, df))
+            return self._correlation_figure(plot_type, correlation, column, top_n)
+
+        elif plot_type == "scatter":
+            if column not in df or column2 not in df:
+                raise ValueError("Both columns must be selected")
+            return self._point_figure(df, column, column2, contour=False)
+
+        elif plot_type == "correlation_top_n":
+            # One column against the rest: O(rows x columns), not the whole matrix
+            columns = correlation_columns(df.dtypes)
+            if column not in columns:
+                raise ValueError(f"{column} not found in correlation matrix")
+            row = column_correlation(df, column, columns)
+            correlation_cache.put(version, row, column)
+            return correlation_top_n_figure(row, column, top_n)
+
+        elif plot_type == "pairplot":
+            num_cols = _shared(shared, "numeric_columns", lambda: df.select_dtypes(include="number").columns.tolist())
+            if len(num_cols) < 2:
+                raise ValueError("Not enough numeric columns for pairplot")
+            dimensions = num_cols[:5]
+            # The budget counts points across all panels of a row of the matrix
+            rows = sample_rows(df[dimensions], dimensions, PLOT_POINT_BUDGET // len(dimensions))
+            fig = px.scatter_matrix(df.iloc[rows], dimensions=dimensions)
+            return self._with_sampling(fig, "sample" if len(rows) < len(df) else "full", len(rows), len(df))
+
+        elif plot_type == "jointplot":
+            if column not in df or column2 not in df:
+                raise ValueError("Both columns must be selected for jointplot")
+            return self._point_figure(df, column, column2, contour=True)
+
+        raise ValueError(f"Unsupported plot type: {plot_type}")
+
+    def _load_frame(self, dataset, columns):
+        df, err = self._load_dataset_df(dataset, columns)
+        if err:
+            raise LookupError(err)
+        return df
+
+    def _build_plot(self, dataset, plot_type, column, column2, top_n, shared=None):
+        """
+        The encoded figure JSON. Raises ValueError for requests it cannot plot and
+        LookupError when the dataset can't be read. Within a batch, the frame and
+        other intermediates come from shared.
+        """
+        # Precomputed aggregates answer the common plots without touching the rows
+        fig = self._figure_from_aggregates(dataset, plot_type, column, column2, top_n)
+        if fig is None and plot_type == "missing":
+            fig = missing_figure(_shared(shared, "missing", lambda: self._missing_counts(dataset)))
+        elif fig is None:
+            columns = self._plot_columns(dataset, plot_type, column, column2)
+            if columns == []:
+                # None of the requested columns exist; the figure code says which
+                df = pd.DataFrame()
+            elif shared is not None:
+                # One frame with every column the batch reads
+                df = shared.get("frame", lambda: self._load_frame(dataset, shared.columns))
+            else:
+                df = self._load_frame(dataset, columns)
+            version = aggregates_version(dataset["processed_file_path"])
+            fig = self._figure_from_frame(df, plot_type, column, column2, top_n, shared, version)
+
+        title = f"{plot_type.replace('_', ' ').title()} Plot"
+        sampling = (fig.layout.meta or {}).get("sampling")
+        if sampling and sampling["mode"] == "sample":
+            title += f"<br><sup>Sample of {sampling['points']:,} of {sampling['rows']:,} rows</sup>"
+        elif sampling and sampling["mode"] == "density":
+            title += f"<br><sup>Density of {sampling['rows']:,} rows</sup>"
+        fig.update_layout(title=title)
+        return encode_figure(fig)
+
+    @staticmethod
+    def _plot_etag(version, plot_type, column, column2, top_n):
+        return plot_etag(version, plot_type=plot_type, column=column, column2=column2, top_n=top_n,
+                         point_budget=PLOT_POINT_BUDGET, scatter_mode=PLOT_SCATTER_MODE)
 
     def generate_plot(self):
-        data = request.get_json()
+        """
+        POST a JSON body, or GET with the same fields as query parameters. The
+        figure is fully determined by the dataset version and the parameters, so
+        responses carry a strong ETag, encoded figures are cached, and a GET
+        whose If-None-Match matches is answered 304 without building anything.
+        Bodies are brotli- or gzip-compressed when the client accepts it.
+        """
+        data = request.get_json() if request.method == "POST" else request.args
         session_user = session.get("user")
         user_id = session_user.get("_id") if session_user else None
 
@@ -52,101 +424,149 @@ class EDAController:
 
         if not dataset_id or not plot_type:
             return jsonify({"error": "Missing dataset_id or plot_type"}), 400
+        if plot_type not in PLOT_TYPES:
+            return jsonify({"error": f"Unsupported plot type: {plot_type}"}), 400
+        try:
+            top_n = int(top_n)
+        except (TypeError, ValueError):
+            return jsonify({"error": "top_n must be an integer"}), 400
 
-        df, err = self._get_dataset_df(dataset_id, user_id)
+        dataset, err = self._find_dataset(dataset_id, user_id)
         if err:
             return jsonify({"error": err}), 404
 
+        etag = self._plot_etag(aggregates_version(dataset["processed_file_path"]), plot_type, column, column2, top_n)
+        # Each content coding is its own representation, with its own ETag and cache entry
+        encoding = negotiate_encoding(request.accept_encodings)
+        variant = f"{etag}-{encoding}" if encoding else etag
+        if request.method == "GET" and (request.if_none_match.contains(etag)
+                                        or request.if_none_match.contains(variant)):
+            response = Response(status=304)
+        else:
+            body = plot_cache.get(variant)
+            if body is None:
+                try:
+                    body = self._build_plot(dataset, plot_type, column, column2, top_n)
+                except LookupError as le:
+                    return jsonify({"error": str(le)}), 404
+                except ValueError as ve:
+                    return jsonify({"error": str(ve)}), 400
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    return jsonify({"error": f"Plot generation failed: {str(e)}"}), 500
+                if encoding:
+                    body = compress(body, encoding)
+                plot_cache.put(variant, body)
+            response = Response(body, mimetype='application/json')
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(variant)
+        # Clients may keep the figure but must revalidate it, since the dataset can change
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def _batch_columns(self, dataset, specs):
+        """Every column the figures of a batch read, in dataset order; None for all of them."""
+        dtypes = self._dataset_dtypes(dataset)
+        if dtypes is None:
+            return None
+        needed = set()
+        for spec in specs:
+            if spec.get("plot_type") not in PLOT_TYPES or spec.get("plot_type") == "missing":
+                continue
+            columns = self._plot_columns(dataset, spec["plot_type"], spec.get("column", ""), spec.get("column2", ""))
+            if columns is None:
+                return None
+            needed.update(columns)
+        return [name for name in dtypes if name in needed]
+
+    def _batch_entry(self, dataset, version, index, spec, shared):
+        """One figure of a batch as a JSON object: the spec, its status and ETag, and the figure or an error."""
+        plot_type, column, column2 = spec.get("plot_type"), spec.get("column", ""), spec.get("column2", "")
+        entry = {"index": index, "plot_type": plot_type, "column": column, "column2": column2}
+
+        def error(message, status):
+            return json.dumps({**entry, "status": status, "error": message}).encode("utf-8")
+
+        if not plot_type:
+            return error("Missing plot_type", 400)
         try:
-            fig = None
-
-            if plot_type == "histogram":
-                if column not in df:
-                    return jsonify({"error": f"Column '{column}' not found"}), 400
-                fig = px.histogram(df, x=column)
-
-            elif plot_type == "boxplot":
-                if column not in df:
-                    return jsonify({"error": f"Column '{column}' not found"}), 400
-                fig = px.box(df, y=column)
-
-            elif plot_type == "heatmap":
-                numeric_df = df.select_dtypes(include="number")
-                if numeric_df.shape[1] < 2:
-                    return jsonify({"error": "Not enough numeric columns for heatmap"}), 400
-                fig = px.imshow(numeric_df.corr())
-
-            elif plot_type == "missing":
-                na_series = df.isnull().sum()
-                na_series = na_series[na_series > 0]
-
-                if na_series.empty:
-                    return jsonify({"error": "No missing values found in dataset"}), 400
-
-                # Sort missing values descending
-                na_series = na_series.sort_values(ascending=True)
-
-                x_vals = [int(v) for v in na_series.values]
-                y_labels = [str(k) for k in na_series.index]
-
-                fig = px.bar(
-                    x=x_vals,
-                    y=y_labels,
-                    orientation='h',
-                    labels={"x": "Missing Count", "y": "Feature"},
-                    title="Missing Values"
-                )
-
-            elif plot_type == "scatter":
-                if column not in df or column2 not in df:
-                    return jsonify({"error": "Both columns must be selected"}), 400
-                fig = px.scatter(df, x=column, y=column2)
-
-            elif plot_type == "correlation_top_n":
-                corr = df.corr(numeric_only=True)
-                if column not in corr.columns:
-                    return jsonify({"error": f"{column} not found in correlation matrix"}), 400
-                top_corr = corr[column].drop(column).abs().sort_values(ascending=False).head(top_n)
-                fig = px.bar(
-                    x=top_corr.values,
-                    y=top_corr.index,
-                    orientation='h',
-                    labels={"x": "Correlation", "y": "Feature"}
-                )
-
-            elif plot_type == "category_distribution":
-                if column not in df:
-                    return jsonify({"error": f"Column '{column}' not found"}), 400
-                fig = px.histogram(df, x=column, color=column)
-
-            elif plot_type == "violin":
-                if column not in df:
-                    return jsonify({"error": f"Column '{column}' not found"}), 400
-                fig = px.violin(df, y=column, box=True, points="all")
-
-            elif plot_type == "pairplot":
-                num_cols = df.select_dtypes(include="number").columns.tolist()
-                if len(num_cols) < 2:
-                    return jsonify({"error": "Not enough numeric columns for pairplot"}), 400
-                fig = px.scatter_matrix(df, dimensions=num_cols[:5])
-
-            elif plot_type == "jointplot":
-                if column not in df or column2 not in df:
-                    return jsonify({"error": "Both columns must be selected for jointplot"}), 400
-                fig = px.density_contour(df, x=column, y=column2)
+            top_n = int(spec.get("top_n", 10))
+        except (TypeError, ValueError):
+            return error("top_n must be an integer", 400)
+
+        etag = self._plot_etag(version, plot_type, column, column2, top_n)
+        body = plot_cache.get(etag)
+        if body is None:
+            try:
+                body = self._build_plot(dataset, plot_type, column, column2, top_n, shared)
+            except LookupError as le:
+                return error(str(le), 404)
+            except ValueError as ve:
+                return error(str(ve), 400)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return error(f"Plot generation failed: {str(e)}", 500)
+            plot_cache.put(etag, body)
+        # The encoded figure is spliced in as is rather than parsed and re-encoded
+        head = json.dumps({**entry, "status": 200, "etag": etag}).encode("utf-8")
+        return head[:-1] + b', "figure": ' + body + b"}"
+
+    def generate_plots(self):
+        """
+        POST {"dataset_id", "plots": [{"plot_type", "column", "column2", "top_n"}, ...],
+        "stream": false}: several figures of one dataset in one request.
+
+        The dataset is loaded once with every column the figures read, and the
+        intermediates they share (numeric columns, correlation matrix, null
+        counts) are computed once; the figures are built in parallel. Returns
+        {"dataset_id", "figures": [...]} in request order, each entry with its
+        own status, or with "stream" one JSON line per figure as each finishes.
+        """
+        data = request.get_json(silent=True) or {}
+        session_user = session.get("user")
+        user_id = session_user.get("_id") if session_user else None
 
-            else:
-                return jsonify({"error": f"Unsupported plot type: {plot_type}"}), 400
+        dataset_id = data.get("dataset_id")
+        specs = data.get("plots")
+        if not dataset_id or not isinstance(specs, list) or not specs:
+            return jsonify({"error": "Missing dataset_id or plots"}), 400
+        if len(specs) > MAX_BATCH_PLOTS:
+            return jsonify({"error": f"At most {MAX_BATCH_PLOTS} plots per request"}), 400
+        if not all(isinstance(spec, dict) for spec in specs):
+            return jsonify({"error": "Each plot must be an object"}), 400
+
+        dataset, err = self._find_dataset(dataset_id, user_id)
+        if err:
+            return jsonify({"error": err}), 404
 
-            fig.update_layout(title=f"{plot_type.replace('_', ' ').title()} Plot")
-            return Response(
-                plotly.utils.PlotlyJSONEncoder().encode(fig.to_plotly_json()),
-                mimetype='application/json'
-            ), 200
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return jsonify({"error": f"Plot generation failed: {str(e)}"}), 500
+        version = aggregates_version(dataset["processed_file_path"])
+        shared = SharedIntermediates(self._batch_columns(dataset, specs))
+        futures = [_plot_executor.submit(self._batch_entry, dataset, version, index, spec, shared)
+                   for index, spec in enumerate(specs)]
+
+        if data.get("stream"):
+            def lines():
+                for future in as_completed(futures):
+                    yield future.result() + b"\n"
+            return Response(lines(), mimetype="application/x-ndjson")
+
+        body = (json.dumps({"dataset_id": dataset_id}).encode("utf-8")[:-1] + b', "figures": ['
+                + b", ".join(future.result() for future in futures) + b"]}")
+        encoding = negotiate_encoding(request.accept_encodings)
+        response = Response(compress(body, encoding) if encoding else body, mimetype="application/json")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def cache_stats(self):
+        """Hit, miss and eviction counters of this worker's DataFrame cache."""
+        return jsonify(frame_cache.stats()), 200
 
     def save_plot(self):
         data = request.get_json()
@@ -1,6 +1,8 @@
 from controllers.dataset_controller import DatasetController
 from core.pipelines.training_pipeline import ml_pipeline
+from core.src.data_sampler import get_sampling_strategy
 from utils.db import Database
+from bson import ObjectId
 
 from zenml.integrations.mlflow.mlflow_utils import get_tracking_uri
 import os
@@ -16,16 +18,26 @@ import uuid
 UPLOAD_FOLDER = os.path.abspath(os.path.join(os.getcwd(), "uploads"))
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+def _optional_int(value, name):
+    """A request parameter as an int (None when absent); raises ValueError otherwise."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
 class PipelineController:
 
     @staticmethod
     def run_pipeline(user_id, dataset_id, params):
         try:
-            # Fetch all datasets
-            all_datasets = DatasetController.list_datasets()
-
-            # Find the specific dataset by ID
-            dataset = next((d for d in all_datasets if d["_id"] == dataset_id), None)
+            # Fetch the dataset's file path and stored column dtypes, so training reads the data exactly as EDA does
+            dataset = Database.get_collection("datasets").find_one(
+                {"_id": ObjectId(dataset_id)}, {"processed_file_path": 1, "schema": 1}
+            ) if ObjectId.is_valid(dataset_id) else None
 
             # Validate the dataset
             if not dataset or 'processed_file_path' not in dataset:
@@ -33,6 +45,17 @@ class PipelineController:
             
             # Use the processed file path
             file_path = dataset['processed_file_path']
+            schema = dataset.get("schema")
+
+            # Sampling settings may arrive as strings; the pipeline's steps only accept ints
+            sample_strategy = params.get("sample_strategy")
+            try:
+                sample_size = _optional_int(params.get("sample_size"), "sample_size")
+                sample_random_state = _optional_int(params.get("sample_random_state", 42), "sample_random_state")
+                if sample_strategy:
+                    get_sampling_strategy(sample_strategy, sample_size, params.get("sample_column"), sample_random_state)
+            except ValueError as ve:
+                return jsonify({"message": str(ve), "status": "error"}), 400
             
             # Set up logging
             logger = logging.getLogger(__name__)
@@ -61,7 +84,12 @@ class PipelineController:
                 target_column=params.get("target_column"),
                 user_id=user_id,
                 dataset_id=dataset_id,
-                run_id=run_id
+                run_id=run_id,
+                sample_strategy=sample_strategy,
+                sample_size=sample_size,
+                sample_column=params.get("sample_column"),
+                sample_random_state=42 if sample_random_state is None else sample_random_state,
+                schema=schema
             )
 
 
@@ -1,8 +1,19 @@
 import os
 import uuid
+import shutil
+import hashlib
+import zipfile
+import threading
 import pandas as pd
-from datetime import datetime
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from utils.db import Database
+from utils.eda_utils import StreamingEDA, profile_dataframe
+from utils.sketches import DatasetSketch
+from utils.eda_store import save_eda_profile, save_sketches
+from utils.plot_aggregates import PLOT_AGGREGATES_ON_UPLOAD, precompute_plot_aggregates
+from core.src.ingest_data import to_arrow_table, infer_schema
 from werkzeug.utils import secure_filename
 
 # Set the upload folder relative to the backend directory
@@ -12,50 +23,106 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # Supported file extensions
 ALLOWED_EXTENSIONS = [".zip", ".csv", ".xlsx", ".xls"]
 
+# Processed datasets are written as Parquet; row groups of this size let readers
+# skip data using per-group min/max statistics.
+PROCESSED_FORMAT = "parquet"
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# Uploads at least this large are ingested chunk by chunk so the worker's memory
+# stays bounded by INGEST_CHUNK_BYTES instead of growing with the file size.
+STREAMING_THRESHOLD_BYTES = int(os.environ.get("STREAMING_INGEST_THRESHOLD_MB", 512)) * 1024 * 1024
+INGEST_CHUNK_BYTES = int(os.environ.get("INGEST_CHUNK_MB", 64)) * 1024 * 1024
+
+# Size of the process pool that parses the members of multi-file ZIP uploads
+ZIP_INGEST_WORKERS = int(os.environ.get("ZIP_INGEST_WORKERS", os.cpu_count() or 1))
+# Processes used to convert the sheets of an Excel workbook concurrently
+EXCEL_SHEET_WORKERS = int(os.environ.get("EXCEL_SHEET_WORKERS", 1))
+
+# Block size used when streaming an upload to disk
+SAVE_BLOCK_SIZE = 1024 * 1024
+
+# Uploads at least this large are processed on the background pool and answered
+# immediately with status "processing"; clients can also ask for it explicitly.
+ASYNC_UPLOAD_THRESHOLD_BYTES = int(float(os.environ.get("ASYNC_UPLOAD_THRESHOLD_MB", 64)) * 1024 * 1024)
+# Threads that ingest, profile and store uploads in the background
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", 2))
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload-worker")
+# Queued and running jobs refresh heartbeat_at this often; a job still "processing"
+# whose heartbeat is older than the stale limit was lost with its process.
+UPLOAD_JOB_HEARTBEAT_SECONDS = int(os.environ.get("UPLOAD_JOB_HEARTBEAT_SECONDS", 30))
+UPLOAD_JOB_STALE_SECONDS = int(os.environ.get("UPLOAD_JOB_STALE_SECONDS", 300))
+
 def is_allowed_file(filename):
     """Check if the uploaded file has a supported extension."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in [ext[1:] for ext in ALLOWED_EXTENSIONS]
 
+def _validated_filename(original_name, custom_name=None):
+    filename = secure_filename(original_name)
+    file_extension = os.path.splitext(filename)[1].lower()
+
+    if custom_name:
+        filename = secure_filename(custom_name) + file_extension
+
+    if not is_allowed_file(filename):
+        raise ValueError("Only ZIP and CSV files are allowed")
+    return filename, file_extension
+
+def _stream_to_disk(stream, path):
+    """Copy a stream to path block by block, returning the SHA-256 of what was written."""
+    digest = hashlib.sha256()
+    with open(path, "wb") as out:
+        for block in iter(lambda: stream.read(SAVE_BLOCK_SIZE), b""):
+            digest.update(block)
+            out.write(block)
+    return digest.hexdigest()
+
 def save_file(file, user_id, custom_name=None):
     try:
         file_id = str(uuid.uuid4())
-        filename = secure_filename(file.filename)
-        file_extension = os.path.splitext(filename)[1].lower()
-
-        if custom_name:
-            filename = secure_filename(custom_name) + file_extension
-
-        if not is_allowed_file(filename):
-            raise ValueError("Only ZIP and CSV files are allowed")
+        filename, file_extension = _validated_filename(file.filename, custom_name)
 
         user_dir = os.path.join(UPLOAD_FOLDER, user_id)
         os.makedirs(user_dir, exist_ok=True)
 
+        # Hash the content while it streams to disk, for upload deduplication
         save_path = os.path.join(user_dir, f"{file_id}_{filename}")
-        file.save(save_path)
+        content_hash = _stream_to_disk(file.stream, save_path)
         print(f"✅ File saved at: {save_path}")
 
-        return file_id, filename, save_path, file_extension
+        return file_id, filename, save_path, file_extension, content_hash
 
     except Exception as e:
         print(f"❌ Failed to save file: {str(e)}")
         raise e
 
-def generate_eda(file_id, user_id, filename, file_path, df):
+def _uncompressed_size(file_path):
+    """Bytes the upload's data takes once read: the members' total size for ZIP archives."""
+    if os.path.splitext(file_path)[1].lower() == ".zip":
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return sum(member.file_size for member in archive.infolist())
+        except zipfile.BadZipFile:
+            pass  # Left for the ingestor to report
+    return os.path.getsize(file_path)
+
+def should_stream(file_path):
+    """Whether an upload is large enough to be ingested in chunks."""
+    return _uncompressed_size(file_path) >= STREAMING_THRESHOLD_BYTES
+
+def generate_eda(file_id, user_id, filename, file_path, df, memory_usage=None):
     try:
         eda = {
             "file_id": file_id,
             "user_id": user_id,
             "filename": filename,
             "file_path": file_path,
-            "shape": df.shape,
-            "columns": list(df.columns),
-            "dtypes": df.dtypes.astype(str).to_dict(),
-            "missing_values": df.isnull().sum().to_dict(),
-            "summary": df.describe(include='all').fillna("").to_dict(),
-            "head": df.head(5).fillna("").to_dict(orient="records"),
+            # shape, columns, dtypes, missing_values, summary and head in one pass
+            **profile_dataframe(df),
             "uploaded_at": datetime.utcnow().isoformat()
         }
+        if memory_usage:
+            # Before/after footprint of the ingest-time dtype optimization
+            eda["memory_usage"] = memory_usage
         print(f"✅ EDA generated successfully for file: {filename}")
         return eda
 
@@ -81,29 +148,434 @@ def store_metadata(file_id, user_id, filename, file_path, custom_name=None):
         print(f"❌ Failed to store file metadata: {str(e)}")
         raise e
 
-def store_dataset(file_id, user_id, eda, df, custom_name=None):
-    try:
-        dataset_id = str(uuid.uuid4())
-        processed_dir = os.path.join(UPLOAD_FOLDER, user_id, "datasets")
-        os.makedirs(processed_dir, exist_ok=True)
+def write_processed_dataset(df, file_path):
+    """Write a DataFrame as Parquet, keeping its dtypes for later reads."""
+    pq.write_table(to_arrow_table(df), file_path, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+def _processed_file_path(dataset_id, user_id, name):
+    processed_dir = os.path.join(UPLOAD_FOLDER, user_id, "datasets")
+    os.makedirs(processed_dir, exist_ok=True)
+    return os.path.join(processed_dir, f"{dataset_id}_{name}.{PROCESSED_FORMAT}")
+
+def _insert_dataset(dataset_id, file_id, user_id, eda, processed_file_path, custom_name=None,
+                    content_hash=None, schema=None, eda_profile_id=None, sketches=None, **extra):
+    if eda_profile_id is None:
+        # Bulky sections and the column sketches go to their own collections;
+        # only a compact EDA stays on the dataset
+        eda_profile_id = dataset_id
+        eda = save_eda_profile(eda_profile_id, eda)
+        if sketches:
+            save_sketches(eda_profile_id, sketches)
+    dataset = {
+        "dataset_id": dataset_id,
+        "file_id": file_id,
+        "user_id": user_id,
+        "custom_name": custom_name or eda["filename"],
+        "processed_file_path": processed_file_path,
+        "storage_format": PROCESSED_FORMAT,
+        "content_hash": content_hash,
+        # Column dtypes, category levels and date formats, so reads skip type inference
+        "schema": schema,
+        "eda": eda,
+        "eda_profile_id": eda_profile_id,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        **extra
+    }
+    Database.get_collection("datasets").insert_one(dataset)
+    print(f"✅ Dataset metadata stored in MongoDB for dataset ID: {dataset_id}")
+    return dataset
 
-        processed_file_path = os.path.join(processed_dir, f"{dataset_id}_{custom_name or eda['filename']}.csv")
-        df.to_csv(processed_file_path, index=False)
+def store_dataset(file_id, user_id, eda, df, custom_name=None, content_hash=None, dataset_id=None):
+    try:
+        dataset_id = dataset_id or str(uuid.uuid4())
+        processed_file_path = _processed_file_path(dataset_id, user_id, custom_name or eda["filename"])
+        write_processed_dataset(df, processed_file_path)
         print(f"✅ Processed data saved at: {processed_file_path}")
 
-        datasets_collection = Database.get_collection("datasets")
-        datasets_collection.insert_one({
-            "dataset_id": dataset_id,
+        sketch = DatasetSketch()
+        sketch.update(df)
+        return _insert_dataset(
+            dataset_id, file_id, user_id, eda, processed_file_path, custom_name, content_hash, infer_schema(df),
+            sketches=sketch.to_dict()
+        )
+
+    except Exception as e:
+        print(f"❌ Failed to store dataset metadata: {str(e)}")
+        raise e
+
+def store_dataset_from_chunks(file_id, user_id, filename, file_path, chunks, custom_name=None, content_hash=None,
+                              dataset_id=None, on_chunk=None):
+    """
+    Write a stream of DataFrame chunks to the processed Parquet file while the
+    EDA statistics are accumulated, holding a single chunk in memory at a time.
+    on_chunk, if given, is called with the number of rows written so far.
+    Returns the stored dataset document.
+    """
+    dataset_id = dataset_id or str(uuid.uuid4())
+    processed_file_path = _processed_file_path(dataset_id, user_id, custom_name or filename)
+    accumulator = StreamingEDA()
+    sketch = DatasetSketch()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = to_arrow_table(chunk, schema=writer.schema if writer else None)
+            if writer is None:
+                # Every chunk shares the first chunk's dtypes, so it stands in for the whole file
+                schema = infer_schema(chunk)
+                writer = pq.ParquetWriter(processed_file_path, table.schema)
+            writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+            accumulator.update(chunk)
+            sketch.update(chunk)
+            if on_chunk:
+                on_chunk(accumulator.rows)
+        if writer is None:
+            raise ValueError("No columns to parse from file")
+        writer.close()
+        writer = None
+        print(f"✅ Processed data streamed to: {processed_file_path}")
+
+        eda = {
+            "file_id": file_id,
+            "user_id": user_id,
+            "filename": filename,
+            "file_path": file_path,
+            **accumulator.result({column: column_sketch.distinct.count()
+                                  for column, column_sketch in sketch.columns.items()}),
+            "uploaded_at": datetime.utcnow().isoformat()
+        }
+        print(f"✅ EDA generated successfully for file: {filename}")
+
+        return _insert_dataset(
+            dataset_id, file_id, user_id, eda, processed_file_path, custom_name, content_hash, schema,
+            sketches=sketch.to_dict()
+        )
+
+    except Exception as e:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(processed_file_path):
+            os.remove(processed_file_path)
+        print(f"❌ Failed to store streamed dataset: {str(e)}")
+        raise e
+
+
+def store_plot_aggregates(dataset):
+    """
+    Precompute the histogram, box, value-count, missing-value and correlation
+    aggregates the EDA plots are served from. Failing here only costs the fast
+    path, so errors are logged rather than raised.
+    """
+    if not PLOT_AGGREGATES_ON_UPLOAD or not dataset["processed_file_path"].endswith(".parquet"):
+        return
+    try:
+        precompute_plot_aggregates(dataset["processed_file_path"], dataset.get("schema"))
+    except Exception as e:
+        print(f"❌ Failed to precompute plot aggregates: {str(e)}")
+
+
+def find_processed_content(content_hash, ingest_options=None):
+    """
+    Look up an earlier upload with identical content (and ingest options) whose
+    processed dataset is still available. Returns its dataset document, or None.
+    """
+    content_index = Database.get_collection("content_index")
+    entry = content_index.find_one({"content_hash": content_hash, "ingest_options": ingest_options or {}})
+    if not entry:
+        return None
+
+    dataset = Database.get_collection("datasets").find_one({"dataset_id": entry["dataset_id"]}, {"sketches": 0})
+    if not dataset or not os.path.exists(dataset.get("processed_file_path") or ""):
+        # The original was deleted; forget it so this upload is processed afresh
+        content_index.delete_one({"_id": entry["_id"]})
+        return None
+    return dataset
+
+def register_processed_content(content_hash, dataset, ingest_options=None):
+    """Record a processed dataset in the content-hash index so identical uploads can reuse it."""
+    content_index = Database.get_collection("content_index")
+    content_index.create_index([("content_hash", 1), ("ingest_options", 1)], unique=True)
+    content_index.update_one(
+        {"content_hash": content_hash, "ingest_options": ingest_options or {}},
+        {"$setOnInsert": {
+            "dataset_id": dataset["dataset_id"],
+            "processed_file_path": dataset["processed_file_path"],
+            "created_at": datetime.utcnow().isoformat()
+        }},
+        upsert=True
+    )
+
+def store_dataset_reference(file_id, user_id, filename, file_path, source_dataset, custom_name=None, dataset_id=None):
+    """
+    Create a lightweight dataset record for a duplicate upload. It shares the
+    processed file, EDA profile and sketches of source_dataset instead of
+    re-ingesting the data, but keeps the uploader's own raw file (file_path):
+    the source may belong to another user.
+    """
+    try:
+        eda = dict(source_dataset["eda"])
+        eda.update({
             "file_id": file_id,
             "user_id": user_id,
-            "custom_name": custom_name or eda["filename"],
-            "processed_file_path": processed_file_path,
-            "eda": eda,
+            "filename": filename,
+            "file_path": file_path,
             "uploaded_at": datetime.utcnow().isoformat()
         })
+        return _insert_dataset(
+            dataset_id or str(uuid.uuid4()), file_id, user_id, eda, source_dataset["processed_file_path"],
+            custom_name, source_dataset.get("content_hash"), source_dataset.get("schema"),
+            source_dataset.get("eda_profile_id"), deduplicated_from=source_dataset["dataset_id"]
+        )
+    except Exception as e:
+        print(f"❌ Failed to store deduplicated dataset: {str(e)}")
+        raise e
+
+
+# --- Resumable chunked uploads -------------------------------------------------
+# A client initiates an upload, sends its parts independently (in any order, each
+# with its own SHA-256), can ask which parts are already stored to resume after a
+# dropped connection, and completes the upload once every part is present.
+
+def _parts_dir(user_id, upload_id):
+    return os.path.join(UPLOAD_FOLDER, user_id, ".parts", upload_id)
 
-        print(f"✅ Dataset metadata stored in MongoDB for dataset ID: {dataset_id}")
+def _part_path(parts_dir, part_number):
+    return os.path.join(parts_dir, f"part-{part_number:05d}")
+
+def initiate_chunked_upload(user_id, filename, total_parts, custom_name=None, member_pattern=None):
+    try:
+        filename, file_extension = _validated_filename(filename, custom_name)
+        total_parts = int(total_parts)
+        if total_parts < 1:
+            raise ValueError("total_parts must be at least 1")
+
+        upload_id = str(uuid.uuid4())
+        os.makedirs(_parts_dir(user_id, upload_id), exist_ok=True)
+        session = {
+            "upload_id": upload_id,
+            "user_id": user_id,
+            "filename": filename,
+            "file_extension": file_extension,
+            "custom_name": custom_name,
+            "member_pattern": member_pattern,
+            "total_parts": total_parts,
+            "parts": {},
+            "status": "uploading",
+            "created_at": datetime.utcnow().isoformat()
+        }
+        Database.get_collection("upload_sessions").insert_one(dict(session))
+        print(f"✅ Chunked upload {upload_id} initiated for file: {filename} ({total_parts} parts)")
+        return session
 
     except Exception as e:
-        print(f"❌ Failed to store dataset metadata: {str(e)}")
+        print(f"❌ Failed to initiate chunked upload: {str(e)}")
         raise e
+
+def get_upload_session(upload_id):
+    """The upload session with the part numbers still missing, or None."""
+    session = Database.get_collection("upload_sessions").find_one({"upload_id": upload_id}, {"_id": 0})
+    if session:
+        received = {int(n) for n in session["parts"]}
+        session["received_parts"] = sorted(received)
+        session["missing_parts"] = [n for n in range(1, session["total_parts"] + 1) if n not in received]
+    return session
+
+def save_upload_part(upload_id, part_number, stream, expected_sha256=None):
+    """
+    Store one part. The part is written to a temporary file and only moved into
+    place once its checksum matches, so a broken transfer never leaves a bad part.
+    Re-sending a part replaces it.
+    """
+    sessions = Database.get_collection("upload_sessions")
+    session = sessions.find_one({"upload_id": upload_id})
+    if not session:
+        raise LookupError(f"Upload {upload_id} not found")
+    if session["status"] != "uploading":
+        raise ValueError(f"Upload {upload_id} is already {session['status']}")
+    if not 1 <= part_number <= session["total_parts"]:
+        raise ValueError(f"Part number must be between 1 and {session['total_parts']}")
+
+    parts_dir = _parts_dir(session["user_id"], upload_id)
+    os.makedirs(parts_dir, exist_ok=True)
+    part_path = _part_path(parts_dir, part_number)
+    tmp_path = f"{part_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        sha256 = _stream_to_disk(stream, tmp_path)
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            raise ValueError(f"Checksum mismatch for part {part_number}: expected {expected_sha256}, got {sha256}")
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, part_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    sessions.update_one(
+        {"upload_id": upload_id},
+        {"$set": {f"parts.{part_number}": {"size": size, "sha256": sha256}}}
+    )
+    return {"part_number": part_number, "size": size, "sha256": sha256}
+
+def assemble_upload_parts(upload_id):
+    """
+    Concatenate all parts into the final upload file once every part is present.
+    Returns the same values as save_file.
+    """
+    sessions = Database.get_collection("upload_sessions")
+    session = get_upload_session(upload_id)
+    if not session:
+        raise LookupError(f"Upload {upload_id} not found")
+    if session["status"] != "uploading":
+        raise ValueError(f"Upload {upload_id} is already {session['status']}")
+    if session["missing_parts"]:
+        raise ValueError(f"Upload {upload_id} is missing parts: {session['missing_parts']}")
+
+    parts_dir = _parts_dir(session["user_id"], upload_id)
+    file_id = str(uuid.uuid4())
+    save_path = os.path.join(UPLOAD_FOLDER, session["user_id"], f"{file_id}_{session['filename']}")
+
+    digest = hashlib.sha256()
+    with open(save_path, "wb") as out:
+        for part_number in range(1, session["total_parts"] + 1):
+            part = session["parts"][str(part_number)]
+            part_path = _part_path(parts_dir, part_number)
+            problem = None
+            if not os.path.exists(part_path):
+                problem = "missing"
+            else:
+                part_digest = hashlib.sha256()
+                with open(part_path, "rb") as f:
+                    for block in iter(lambda: f.read(SAVE_BLOCK_SIZE), b""):
+                        part_digest.update(block)
+                        digest.update(block)
+                        out.write(block)
+                if part_digest.hexdigest() != part["sha256"]:
+                    problem = "corrupted"
+            if problem:
+                # Forget the part so it is listed as missing and the client can resend it
+                out.close()
+                os.remove(save_path)
+                sessions.update_one({"upload_id": upload_id}, {"$unset": {f"parts.{part_number}": ""}})
+                raise ValueError(f"Part {part_number} is {problem} on disk; upload it again")
+
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    sessions.update_one(
+        {"upload_id": upload_id},
+        {"$set": {"status": "assembled", "file_id": file_id, "file_path": save_path}}
+    )
+    print(f"✅ Chunked upload {upload_id} assembled at: {save_path}")
+    return file_id, session["filename"], save_path, session["file_extension"], digest.hexdigest()
+
+def mark_upload_session(upload_id, status, error=None):
+    update = {"status": status, "completed_at": datetime.utcnow().isoformat()}
+    if error:
+        update["error"] = error
+    Database.get_collection("upload_sessions").update_one({"upload_id": upload_id}, {"$set": update})
+
+
+# --- Background upload processing ---------------------------------------------
+# Large uploads are saved, answered with a dataset id and status "processing",
+# and then ingested, profiled and stored on _upload_executor. Each one has a job
+# document in "upload_jobs" recording its stage and progress, so any worker
+# process can answer status requests.
+
+def should_process_async(file_path, requested=None):
+    """Whether an upload should be processed in the background (requested=None decides by size)."""
+    if requested is not None:
+        return requested
+    return os.path.getsize(file_path) >= ASYNC_UPLOAD_THRESHOLD_BYTES
+
+def create_upload_job(dataset_id, file_id, user_id, filename, custom_name=None):
+    now = datetime.utcnow().isoformat()
+    job = {
+        "dataset_id": dataset_id,
+        "file_id": file_id,
+        "user_id": user_id,
+        "filename": filename,
+        "custom_name": custom_name or filename,
+        "status": "processing",
+        "stage": "queued",
+        "progress": 0.0,
+        "created_at": now,
+        "updated_at": now,
+        "heartbeat_at": now
+    }
+    Database.get_collection("upload_jobs").insert_one(dict(job))
+    return job
+
+def update_upload_job(dataset_id, **fields):
+    fields["updated_at"] = datetime.utcnow().isoformat()
+    Database.get_collection("upload_jobs").update_one({"dataset_id": dataset_id}, {"$set": fields})
+
+def get_upload_job(dataset_id):
+    job = Database.get_collection("upload_jobs").find_one({"dataset_id": dataset_id}, {"_id": 0})
+    if job and _is_stale(job):
+        fail_stale_upload_jobs()
+        job = Database.get_collection("upload_jobs").find_one({"dataset_id": dataset_id}, {"_id": 0})
+    return job
+
+def _stale_before():
+    return (datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_STALE_SECONDS)).isoformat()
+
+def _is_stale(job):
+    if job.get("status") != "processing":
+        return False
+    # Jobs created before heartbeats were recorded only have updated_at
+    return (job.get("heartbeat_at") or job.get("updated_at") or "") < _stale_before()
+
+def fail_stale_upload_jobs():
+    """
+    Mark jobs still "processing" whose heartbeat stopped as failed. Background
+    jobs live in the process that queued them, so they are lost on a restart.
+    Returns the number of jobs marked failed.
+    """
+    stale_before = _stale_before()
+    now = datetime.utcnow().isoformat()
+    result = Database.get_collection("upload_jobs").update_many(
+        {
+            "status": "processing",
+            "$or": [
+                {"heartbeat_at": {"$lt": stale_before}},
+                {"heartbeat_at": {"$exists": False}, "updated_at": {"$lt": stale_before}}
+            ]
+        },
+        {"$set": {
+            "status": "failed",
+            "error": "Processing was interrupted before it finished; upload the file again",
+            "updated_at": now
+        }}
+    )
+    if result.modified_count:
+        print(f"❌ Marked {result.modified_count} interrupted upload job(s) as failed")
+    return result.modified_count
+
+def submit_upload_job(dataset_id, process, *args, **kwargs):
+    """
+    Run process(*args, report=..., **kwargs) on the background pool. process calls
+    report(stage, progress, **fields) as it advances; its return value is stored
+    as the job's result once it completes. Until then the job's heartbeat_at is
+    refreshed every UPLOAD_JOB_HEARTBEAT_SECONDS, queued or running.
+    """
+    finished = threading.Event()
+
+    def heartbeat():
+        while not finished.wait(UPLOAD_JOB_HEARTBEAT_SECONDS):
+            Database.get_collection("upload_jobs").update_one(
+                {"dataset_id": dataset_id, "status": "processing"},
+                {"$set": {"heartbeat_at": datetime.utcnow().isoformat()}}
+            )
+
+    def report(stage, progress, **fields):
+        update_upload_job(dataset_id, stage=stage, progress=round(progress, 3), **fields)
+
+    def run():
+        update_upload_job(dataset_id, started_at=datetime.utcnow().isoformat())
+        try:
+            result = process(*args, report=report, **kwargs)
+            update_upload_job(dataset_id, status="completed", stage="completed", progress=1.0, result=result)
+        except Exception as e:
+            print(f"❌ Background processing failed for dataset {dataset_id}: {str(e)}")
+            update_upload_job(dataset_id, status="failed", error=str(e))
+        finally:
+            finished.set()
+
+    threading.Thread(target=heartbeat, name=f"upload-heartbeat-{dataset_id}", daemon=True).start()
+    return _upload_executor.submit(run)
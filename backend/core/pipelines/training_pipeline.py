@@ -8,6 +8,7 @@ from steps.handle_missing_values_step import handle_missing_values_step
 from steps.model_building_step import model_building_step
 from steps.model_evaluator_step import model_evaluator_step
 from steps.outlier_detection_step import outlier_detection_step
+from src.data_sampler import get_sampling_strategy
 from utils.db import Database
 from zenml import Model, pipeline
 
@@ -23,6 +24,12 @@ def get_user_runs_directory(file_path):
     os.makedirs(runs_directory, exist_ok=True)
     return f"file://{os.path.abspath(runs_directory)}"
 
+def sampling_params(strategy, sample_size, column, random_state):
+    """The sampling settings recorded on the run, or None when the full dataset is used."""
+    if not strategy:
+        return None
+    return get_sampling_strategy(strategy, sample_size, column, random_state).params()
+
 @pipeline(
     model=Model(
         name="AutoML Model"
@@ -40,7 +47,12 @@ def ml_pipeline(
     target_column: str,
     user_id: str,
     dataset_id: str,
-    run_id: str = None
+    run_id: str = None,
+    sample_strategy: str = None,
+    sample_size: int = None,
+    sample_column: str = None,
+    sample_random_state: int = 42,
+    schema: dict = None
 ):
     start_time = datetime.utcnow()
 
@@ -57,7 +69,8 @@ def ml_pipeline(
             "outlier_strategy": outlier_strategy,
             "outlier_method": outlier_method,
             "outlier_threshold": outlier_threshold,
-            "target_column": target_column
+            "target_column": target_column,
+            "sampling": sampling_params(sample_strategy, sample_size, sample_column, sample_random_state)
         },
         "start_time": start_time,
         "status": "running"
@@ -71,7 +84,15 @@ def ml_pipeline(
         logger.info(f"Pipeline {experiment_name} started for user {user_id}.")
 
         # Step 1: Data Ingestion
-        raw_data = data_ingestion_step(file_path=file_path)
+        raw_data = data_ingestion_step(
+            file_path=file_path,
+            sample_strategy=sample_strategy,
+            sample_size=sample_size,
+            sample_column=sample_column,
+            sample_random_state=sample_random_state,
+            schema=schema,
+            dataset_id=dataset_id
+        )
         logger.info("Data ingestion completed successfully.")
 
         # Step 2: Handle Missing Values
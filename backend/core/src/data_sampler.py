@@ -0,0 +1,254 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Setup logging configuration
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Helper columns carried alongside sampled rows
+_KEY = "__sample_key__"
+_ROW = "__sample_row__"
+_STRATUM = "__sample_stratum__"
+# Stratum label for rows whose stratify column is missing (None and NaN alike)
+_MISSING_STRATUM = "<missing>"
+
+
+# Abstract Base Class for Sampling Strategy
+class SamplingStrategy(ABC):
+    """
+    Samples rows from a stream of DataFrame chunks in a single pass. Only the rows
+    that can still end up in the sample are kept between chunks, so memory is
+    bounded by the sample size rather than the file size.
+    """
+
+    def __init__(self, sample_size: int, random_state: int = 42):
+        """
+        Parameters:
+        sample_size (int): Number of rows to keep.
+        random_state (int): Seed for the random row keys, so a run can be reproduced.
+        """
+        if not sample_size or int(sample_size) < 1:
+            raise ValueError("sample_size must be a positive integer")
+        self.sample_size = int(sample_size)
+        self.random_state = random_state
+
+    @abstractmethod
+    def sample(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Abstract method to sample rows from a sequence of chunks.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The data, chunk by chunk.
+
+        Returns:
+        pd.DataFrame: The sampled rows, in their original order.
+        """
+        pass
+
+    def params(self) -> dict:
+        """The parameters needed to reproduce this sample."""
+        return {"strategy": self.name, "sample_size": self.sample_size, "random_state": self.random_state}
+
+    def _keyed_chunks(self, chunks: Iterable[pd.DataFrame]):
+        """Tags every row with its position in the file and a uniform random key."""
+        rng = np.random.default_rng(self.random_state)
+        offset = 0
+        for chunk in chunks:
+            chunk = chunk.reset_index(drop=True)
+            chunk[_ROW] = np.arange(offset, offset + len(chunk))
+            chunk[_KEY] = rng.random(len(chunk))
+            offset += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _finish(kept: pd.DataFrame) -> pd.DataFrame:
+        helpers = [c for c in (_KEY, _ROW, _STRATUM) if c in kept.columns]
+        return kept.sort_values(_ROW).drop(columns=helpers).reset_index(drop=True)
+
+
+# Concrete Strategy for the leading rows of the file
+class FirstNSampling(SamplingStrategy):
+    name = "first_n"
+
+    def sample(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Keeps the first sample_size rows and stops reading as soon as they are in hand.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The data, chunk by chunk.
+
+        Returns:
+        pd.DataFrame: The first sample_size rows.
+        """
+        logging.info(f"Taking the first {self.sample_size} rows.")
+        kept, rows = [], 0
+        for chunk in chunks:
+            kept.append(chunk.iloc[:self.sample_size - rows])
+            rows += len(kept[-1])
+            if rows >= self.sample_size:
+                break
+        if not kept:
+            raise ValueError("No rows to sample from")
+        return pd.concat(kept, ignore_index=True)
+
+    def params(self) -> dict:
+        return {"strategy": self.name, "sample_size": self.sample_size}
+
+
+# Concrete Strategy for a uniform random sample
+class ReservoirSampling(SamplingStrategy):
+    name = "reservoir"
+
+    def sample(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Draws a uniform random sample without replacement. Every row gets a random
+        key and the rows with the sample_size smallest keys are kept, which is
+        equivalent to reservoir sampling but vectorised per chunk.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The data, chunk by chunk.
+
+        Returns:
+        pd.DataFrame: sample_size rows (or every row if there are fewer).
+        """
+        logging.info(f"Reservoir sampling {self.sample_size} rows with random_state={self.random_state}.")
+        kept = None
+        for chunk in self._keyed_chunks(chunks):
+            kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+            if len(kept) > self.sample_size:
+                kept = kept.nsmallest(self.sample_size, _KEY)
+        if kept is None:
+            raise ValueError("No rows to sample from")
+        return self._finish(kept)
+
+
+# Concrete Strategy for a sample that keeps the class balance of a column
+class StratifiedSampling(SamplingStrategy):
+    name = "stratified"
+
+    def __init__(self, sample_size: int, column: str, random_state: int = 42):
+        """
+        Parameters:
+        sample_size (int): Number of rows to keep.
+        column (str): Column whose values define the strata (missing values form their own stratum).
+        random_state (int): Seed for the random row keys, so a run can be reproduced.
+        """
+        super().__init__(sample_size, random_state)
+        if not column:
+            raise ValueError("Stratified sampling requires a column")
+        self.column = column
+
+    def params(self) -> dict:
+        return {**super().params(), "column": self.column}
+
+    def sample(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Draws a random sample in which every stratum is represented in proportion
+        to its size in the full data (largest-remainder allocation, at least one
+        row per stratum when sample_size allows).
+
+        Stratum sizes are only known at the end, so each stratum keeps its
+        sample_size smallest-key rows while streaming; memory is bounded by
+        sample_size times the number of strata.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The data, chunk by chunk.
+
+        Returns:
+        pd.DataFrame: The stratified sample.
+        """
+        logging.info(f"Stratified sampling {self.sample_size} rows by '{self.column}' "
+                     f"with random_state={self.random_state}.")
+        kept, counts = None, pd.Series(dtype="int64")
+        for chunk in self._keyed_chunks(chunks):
+            if self.column not in chunk.columns:
+                raise ValueError(f"Stratify column '{self.column}' not found in the data")
+            strata = chunk[self.column].astype(object)
+            chunk[_STRATUM] = strata.where(strata.notnull(), _MISSING_STRATUM)
+            counts = counts.add(chunk[_STRATUM].value_counts(), fill_value=0)
+            kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+            kept = kept[self._key_rank(kept) <= self.sample_size]
+        if kept is None:
+            raise ValueError("No rows to sample from")
+
+        quota = kept[_STRATUM].map(self._allocate(counts))
+        kept = kept[self._key_rank(kept) <= quota]
+        return self._finish(kept)
+
+    @staticmethod
+    def _key_rank(df: pd.DataFrame) -> pd.Series:
+        """1-based rank of each row's random key within its stratum."""
+        return df.groupby(_STRATUM, sort=False)[_KEY].rank(method="first")
+
+    def _allocate(self, counts: pd.Series) -> pd.Series:
+        """Splits sample_size across strata proportionally to their row counts."""
+        total = counts.sum()
+        if total <= self.sample_size:
+            return counts
+        exact = counts * self.sample_size / total
+        allocation = np.floor(exact)
+        if len(counts) <= self.sample_size:
+            allocation = allocation.clip(lower=1)
+        remainder = int(self.sample_size - allocation.sum())
+        if remainder > 0:
+            allocation[(exact - allocation).nlargest(remainder).index] += 1
+        elif remainder < 0:
+            # Raising small strata to one row overshot; take it back from the largest
+            excess = -remainder
+            for label in allocation.sort_values(ascending=False, kind="stable").index:
+                take = min(excess, int(allocation[label]) - 1)
+                allocation[label] -= take
+                excess -= take
+                if excess == 0:
+                    break
+        return allocation.clip(upper=counts)
+
+
+# Context Class for Sampling
+class DataSampler:
+    def __init__(self, strategy: SamplingStrategy):
+        """
+        Initializes the DataSampler with a specific sampling strategy.
+
+        Parameters:
+        strategy (SamplingStrategy): The strategy to be used for sampling.
+        """
+        self._strategy = strategy
+
+    def set_strategy(self, strategy: SamplingStrategy):
+        """
+        Sets a new strategy for the DataSampler.
+
+        Parameters:
+        strategy (SamplingStrategy): The new strategy to be used for sampling.
+        """
+        logging.info("Switching sampling strategy.")
+        self._strategy = strategy
+
+    def sample(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Executes the sampling using the current strategy.
+
+        Parameters:
+        chunks (Iterable[pd.DataFrame]): The data, chunk by chunk.
+
+        Returns:
+        pd.DataFrame: The sampled rows.
+        """
+        logging.info("Executing sampling strategy.")
+        return self._strategy.sample(chunks)
+
+
+def get_sampling_strategy(strategy: str, sample_size: int, column: str = None,
+                          random_state: int = 42) -> SamplingStrategy:
+    """Builds the sampling strategy named by strategy ('first_n', 'reservoir' or 'stratified')."""
+    if strategy == "first_n":
+        return FirstNSampling(sample_size)
+    elif strategy == "reservoir":
+        return ReservoirSampling(sample_size, random_state)
+    elif strategy == "stratified":
+        return StratifiedSampling(sample_size, column, random_state)
+    raise ValueError(f"Unsupported sampling strategy: {strategy}")
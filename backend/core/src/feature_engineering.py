@@ -53,8 +53,9 @@ class LogTransformation(FeatureEngineeringStrategy):
         logging.info(f"Applying log transformation to features: {self.features}")
         df_transformed = df.copy()
         for feature in self.features:
+            # Cast first: log1p of a downcast int8/int16 column would return float16
             df_transformed[feature] = np.log1p(
-                df[feature]
+                df[feature].astype("float64")
             )  # log1p handles log(0) by calculating log(1+x)
         logging.info("Log transformation completed.")
         return df_transformed
@@ -1,7 +1,62 @@
+import io
 import os
+import json
+import multiprocessing
+import shutil
+import fnmatch
+import hashlib
+import tempfile
 import zipfile
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+# Public from pandas 2.2; older versions probe DATETIME_FORMATS instead
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    guess_datetime_format = None
+
+# Chunk size used by ingest_chunks when neither a row nor a byte budget is given
+DEFAULT_CHUNK_ROWS = 100_000
+# Rows parsed up front to infer the chunk schema and the bytes-per-row estimate
+SCHEMA_SAMPLE_ROWS = 10_000
+# Values checked against a guessed format before a text column is recorded as dates
+DATETIME_SAMPLE_SIZE = 1_000
+# Date formats tried, in order, when pandas cannot guess one
+DATETIME_FORMATS = (
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M", "%Y/%m/%d", "%m/%d/%Y", "%d/%m/%Y", "%m-%d-%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%m/%d/%Y %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%d/%m/%Y %H:%M", "%d %b %Y", "%d %B %Y",
+    "%b %d, %Y", "%B %d, %Y",
+)
+# Where ExcelDataIngestor keeps workbooks converted to Parquet
+EXCEL_CACHE_DIR = os.environ.get("EXCEL_CACHE_DIR", os.path.join(os.getcwd(), "uploads", "excel_cache"))
+# CSV parse engine: "c" is the pandas default; "pyarrow" decodes on multiple threads
+# but treats padded numbers, quoting and some NA tokens differently, so it is opt-in
+CSV_PARSE_ENGINE = os.environ.get("CSV_PARSE_ENGINE", "c")
+# Column dtypes for parsed CSVs: "numpy" (default), "numpy_nullable" or "pyarrow" (Arrow-backed)
+CSV_DTYPE_BACKEND = os.environ.get("CSV_DTYPE_BACKEND", "numpy")
+# Strings pandas' C parser reads as missing by default
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+# pyarrow CSV conversion matching pandas' C parser: same missing-value markers and booleans
+ARROW_CSV_OPTIONS = {
+    "null_values": CSV_NA_VALUES,
+    "strings_can_be_null": True,
+    "true_values": ["True", "TRUE", "true"],
+    "false_values": ["False", "FALSE", "false"],
+}
+# Sheet and ZIP member parsing pools are started from upload worker threads;
+# forking a threaded process can copy held locks into the children, so spawn them
+_SPAWN = multiprocessing.get_context("spawn")
 
 # Define an abstract class for Data Ingestor
 class DataIngestor(ABC):
@@ -10,68 +65,733 @@ class DataIngestor(ABC):
         """Abstract method to ingest data from a given file."""
         pass
 
+    def ingest_chunks(self, file_path: str, chunk_rows: int = None, chunk_bytes: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Yields the data as a sequence of DataFrame chunks.
+
+        Formats that can be streamed override this so that only one chunk is held
+        in memory at a time. The default loads the whole file as a single chunk.
+
+        Parameters:
+        file_path (str): Path to the file.
+        chunk_rows (int): Maximum number of rows per chunk.
+        chunk_bytes (int): Approximate in-memory size budget per chunk, used when chunk_rows is not set.
+        """
+        yield self.ingest(file_path)
+
+
+def to_arrow_table(df: pd.DataFrame, schema: pa.Schema = None) -> pa.Table:
+    """Convert a DataFrame to an Arrow table, optionally conforming it to a schema."""
+    try:
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Object columns holding mixed Python types (e.g. from Excel) can't be
+        # mapped to a single Arrow type, so store those columns as strings.
+        df = df.copy()
+        for column in df.select_dtypes(include="object").columns:
+            df[column] = df[column].where(df[column].isnull(), df[column].astype(str))
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _rows_for_byte_budget(sample: pd.DataFrame, chunk_rows: int, chunk_bytes: int) -> int:
+    """Translate a row or byte budget into a chunk size using a sample's memory footprint."""
+    if chunk_rows:
+        return chunk_rows
+    if not chunk_bytes or sample.empty:
+        return DEFAULT_CHUNK_ROWS
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    return max(1, int(chunk_bytes // max(bytes_per_row, 1)))
+
+
+def _stable_chunk_dtypes(sample: pd.DataFrame) -> dict:
+    """
+    Pick dtypes from a sample that every later chunk can be parsed with, so all
+    chunks share one schema. Integer and bool columns use the nullable pandas
+    dtypes because a later chunk may contain missing values; columns that are
+    entirely missing in the sample stay as object.
+    """
+    dtypes = {}
+    for column, dtype in sample.dtypes.items():
+        if sample[column].isnull().all():
+            dtypes[column] = "object"
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = "Int64"
+        else:
+            dtypes[column] = dtype
+    return dtypes
+
 # ✅ Excel Ingestor
 class ExcelDataIngestor(DataIngestor):
-    def ingest(self, file_path: str) -> pd.DataFrame:
+    """
+    Reads Excel workbooks through a conversion cache. openpyxl parsing is orders of
+    magnitude slower than Parquet, so the first ingest of a workbook converts every
+    sheet to Parquet under cache_dir, keyed by the SHA-256 of the workbook's bytes.
+    Later ingests of the same content read the converted sheet instead.
+    """
+
+    def __init__(self, cache_dir: str = None, max_workers: int = None, sheet_name=0):
+        """
+        Parameters:
+        cache_dir (str): Where converted sheets are kept (default: EXCEL_CACHE_DIR).
+        max_workers (int): When greater than 1, sheets are converted in parallel processes.
+        sheet_name (str or int): Sheet returned by ingest(), by name or position.
+        """
+        self.cache_dir = cache_dir or EXCEL_CACHE_DIR
+        self.max_workers = max_workers
+        self.sheet_name = sheet_name
+
+    def ingest(self, file_path: str, columns: list = None) -> pd.DataFrame:
         if not file_path.endswith((".xlsx", ".xls")):
             raise ValueError("The provided file is not an Excel file.")
-        df = pd.read_excel(file_path)
+        df = ParquetDataIngestor().ingest(self._sheet_path(file_path), columns=columns)
         print(f"✅ Ingested Excel file: {file_path}")
         return df
 
+    def ingest_chunks(self, file_path: str, chunk_rows: int = None, chunk_bytes: int = None) -> Iterator[pd.DataFrame]:
+        """Converts the workbook once, then streams the selected sheet from its Parquet copy."""
+        if not file_path.endswith((".xlsx", ".xls")):
+            raise ValueError("The provided file is not an Excel file.")
+        yield from ParquetDataIngestor().ingest_chunks(self._sheet_path(file_path), chunk_rows, chunk_bytes)
+
+    def _sheet_path(self, file_path: str) -> str:
+        sheet_paths = self.convert(file_path)
+        if isinstance(self.sheet_name, int):
+            if not 0 <= self.sheet_name < len(sheet_paths):
+                raise ValueError(f"Sheet {self.sheet_name} not found")
+            return list(sheet_paths.values())[self.sheet_name]
+        if self.sheet_name in sheet_paths:
+            return sheet_paths[self.sheet_name]
+        raise ValueError(f"Worksheet named '{self.sheet_name}' not found")
+
+    def convert(self, file_path: str) -> dict:
+        """
+        Converts every sheet of the workbook to Parquet, unless that content was already converted.
+
+        Returns:
+        dict: Sheet name -> Parquet path, in workbook order.
+        """
+        workbook_dir = os.path.join(self.cache_dir, _file_sha256(file_path))
+        manifest_path = os.path.join(workbook_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            print(f"✅ Reusing converted Excel sheets from cache: {workbook_dir}")
+            return {sheet: os.path.join(workbook_dir, name) for sheet, name in manifest["sheets"]}
+
+        # Convert into a private directory and rename it into place, so concurrent
+        # conversions of the same workbook never expose a half-written cache entry.
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=".converting-", dir=self.cache_dir)
+        try:
+            sheet_names = pd.ExcelFile(file_path).sheet_names
+            file_names = [f"{i}.parquet" for i in range(len(sheet_names))]
+            out_paths = [os.path.join(staging_dir, name) for name in file_names]
+
+            if self.max_workers and self.max_workers > 1 and len(sheet_names) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(sheet_names)), mp_context=_SPAWN) as pool:
+                    list(pool.map(_convert_sheet, [file_path] * len(sheet_names), sheet_names, out_paths))
+            else:
+                for sheet, out_path in zip(sheet_names, out_paths):
+                    _convert_sheet(file_path, sheet, out_path)
+
+            with open(os.path.join(staging_dir, "manifest.json"), "w") as f:
+                json.dump({"source": os.path.basename(file_path), "sheets": list(zip(sheet_names, file_names))}, f)
+            try:
+                os.rename(staging_dir, workbook_dir)
+            except OSError:
+                shutil.rmtree(staging_dir, ignore_errors=True)  # another worker finished first
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        print(f"✅ Converted {len(sheet_names)} Excel sheet(s) to Parquet: {workbook_dir}")
+        return {sheet: os.path.join(workbook_dir, name) for sheet, name in zip(sheet_names, file_names)}
+
+
+def _file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _convert_sheet(file_path: str, sheet_name: str, out_path: str) -> str:
+    """Process-pool task: parse one sheet and write it as Parquet."""
+    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    pq.write_table(to_arrow_table(df), out_path)
+    return out_path
+
+
+def _arrow_types_mapper(dtype_backend: str):
+    """Maps Arrow column types to pandas dtypes for the requested dtype backend."""
+    if dtype_backend == "pyarrow":
+        return pd.ArrowDtype
+    if dtype_backend == "numpy_nullable":
+        return {
+            pa.int64(): pd.Int64Dtype(), pa.float64(): pd.Float64Dtype(),
+            pa.bool_(): pd.BooleanDtype(), pa.string(): pd.StringDtype(),
+        }.get
+    return None
+
+
+def _read_csv_arrow(source, columns: list = None, dtype_backend: str = "numpy",
+                    column_types: dict = None) -> pd.DataFrame:
+    """
+    Parses a CSV with pyarrow's multithreaded reader, configured to give the same
+    columns, dtypes and missing values as pandas' C parser. column_types, when
+    known from a stored schema, skips type inference for those columns.
+    """
+    def convert_options(column_types=None):
+        return pv.ConvertOptions(include_columns=columns or [], column_types=column_types, **ARROW_CSV_OPTIONS)
+
+    overrides = column_types
+    if not overrides:
+        # The schema inferred from the first block tells which columns need overriding:
+        # pandas leaves dates as text and reads all-empty columns as float
+        start = source.tell() if hasattr(source, "seek") else None
+        with pv.open_csv(source, convert_options=convert_options()) as reader:
+            inferred = reader.schema
+        overrides = {f.name: pa.string() for f in inferred if pa.types.is_temporal(f.type)}
+        overrides.update({f.name: pa.float64() for f in inferred if pa.types.is_null(f.type)})
+        if start is not None:
+            source.seek(start)
+
+    table = pv.read_csv(source, convert_options=convert_options(overrides))
+    return table.to_pandas(types_mapper=_arrow_types_mapper(dtype_backend))
+
+
+def read_csv(source, columns: list = None, engine: str = None, dtype_backend: str = None,
+             schema: dict = None) -> pd.DataFrame:
+    """
+    Reads a CSV with the configured parse engine and dtype backend.
+
+    The pyarrow engine decodes blocks of the file on several threads. It rejects
+    some inputs the C parser accepts (ragged rows, newlines inside quoted values,
+    a column whose type changes after the first block); those are parsed again
+    with the C engine, so malformed files surface the same errors as before.
+
+    Parameters:
+    source: Path or seekable file object.
+    columns (list): Only these columns are parsed (None parses all).
+    engine (str): "pyarrow" or "c" (defaults to CSV_PARSE_ENGINE).
+    dtype_backend (str): "numpy", "numpy_nullable" or "pyarrow" (defaults to CSV_DTYPE_BACKEND).
+    schema (dict): Schema stored by infer_schema; its dtypes and datetime formats are
+        passed to the parser instead of being inferred again.
+
+    Returns:
+    pd.DataFrame: The parsed data.
+    """
+    engine = engine or CSV_PARSE_ENGINE
+    dtype_backend = dtype_backend or CSV_DTYPE_BACKEND
+
+    if engine == "pyarrow":
+        start = source.tell() if hasattr(source, "seek") else None
+        try:
+            df = _read_csv_arrow(source, columns, dtype_backend, _arrow_column_types(schema))
+            return apply_schema(df, schema)
+        except (pa.ArrowException, ValueError) as e:
+            print(f"❌ pyarrow CSV engine failed, retrying with the C engine: {str(e)}")
+            if start is not None:
+                source.seek(start)
+
+    options = {} if dtype_backend == "numpy" else {"dtype_backend": dtype_backend}
+    if schema:
+        options["dtype"], options["parse_dates"], options["date_format"] = _pandas_read_options(schema, columns)
+    return apply_schema(pd.read_csv(source, usecols=columns, **options), schema)
+
+
 # ✅ CSV Ingestor
 class CSVDataIngestor(DataIngestor):
-    def ingest(self, file_path: str) -> pd.DataFrame:
+    def __init__(self, engine: str = None, dtype_backend: str = None, schema: dict = None):
+        """
+        Parameters:
+        engine (str): CSV parse engine, "pyarrow" or "c" (defaults to CSV_PARSE_ENGINE).
+        dtype_backend (str): "numpy", "numpy_nullable" or "pyarrow" (defaults to CSV_DTYPE_BACKEND).
+        schema (dict): Stored schema of the file (see infer_schema), used instead of type inference.
+        """
+        self.engine = engine
+        self.dtype_backend = dtype_backend
+        self.schema = schema
+
+    def ingest(self, file_path: str, columns: list = None) -> pd.DataFrame:
         if not file_path.endswith(".csv"):
             raise ValueError("The provided file is not a CSV file.")
-        df = pd.read_csv(file_path)
+        df = read_csv(file_path, columns, self.engine, self.dtype_backend, self.schema)
         print(f"✅ Ingested CSV file: {file_path}")
         return df
 
+    def ingest_chunks(self, file_path: str, chunk_rows: int = None, chunk_bytes: int = None,
+                      columns: list = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams the CSV in chunks with a fixed schema inferred from the leading rows.
+        Always uses the C engine, since the pyarrow engine cannot read in chunks.
+        """
+        if not file_path.endswith(".csv"):
+            raise ValueError("The provided file is not a CSV file.")
+        for chunk in _iter_csv_chunks(lambda: file_path, file_path, chunk_rows, chunk_bytes, columns):
+            yield apply_schema(chunk, self.schema)
+
+
+def _iter_csv_chunks(open_source, label: str, chunk_rows: int = None, chunk_bytes: int = None,
+                     columns: list = None) -> Iterator[pd.DataFrame]:
+    """
+    Shared CSV chunking loop. open_source returns a fresh path or file object each
+    time it is called, since the source is read twice: once for the schema sample
+    and once for the chunks.
+    """
+    sample = pd.read_csv(open_source(), usecols=columns, nrows=SCHEMA_SAMPLE_ROWS)
+    rows_per_chunk = _rows_for_byte_budget(sample, chunk_rows, chunk_bytes)
+    dtypes = _stable_chunk_dtypes(sample)
+    del sample
+
+    n_chunks = 0
+    try:
+        with pd.read_csv(open_source(), usecols=columns, dtype=dtypes, chunksize=rows_per_chunk) as reader:
+            for chunk in reader:
+                n_chunks += 1
+                yield chunk
+    except (ValueError, TypeError) as e:
+        raise ValueError(
+            f"Chunk {n_chunks + 1} of {label} does not match the column types inferred "
+            f"from its first {SCHEMA_SAMPLE_ROWS} rows: {str(e)}"
+        ) from e
+    print(f"✅ Streamed CSV file in {n_chunks} chunk(s) of up to {rows_per_chunk} rows: {label}")
+
+# ✅ Parquet Ingestor (processed datasets are stored in this columnar format)
+class ParquetDataIngestor(DataIngestor):
+    def __init__(self, schema: dict = None):
+        """
+        Parameters:
+        schema (dict): Stored schema of the file (see infer_schema). Parquet keeps
+            column types itself; the schema adds category levels and datetime formats.
+        """
+        self.schema = schema
+
+    def ingest(self, file_path: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        """
+        Reads a Parquet file, optionally projecting columns and filtering rows.
+
+        Parameters:
+        file_path (str): Path to the .parquet file.
+        columns (list): Only these columns are read from disk (None reads all).
+        filters (list): Predicates in pyarrow DNF form, e.g. [("SalePrice", ">", 100000)].
+            Row groups whose min/max statistics cannot match are skipped without being read.
+
+        Returns:
+        pd.DataFrame: The loaded data with the dtypes it was written with.
+        """
+        if not file_path.endswith(".parquet"):
+            raise ValueError("The provided file is not a Parquet file.")
+        table = pq.read_table(file_path, columns=columns, filters=filters)
+        df = apply_schema(table.to_pandas(), self.schema)
+        print(f"✅ Ingested Parquet file: {file_path}")
+        return df
+
+    def ingest_chunks(self, file_path: str, chunk_rows: int = None, chunk_bytes: int = None,
+                      columns: list = None) -> Iterator[pd.DataFrame]:
+        """Streams record batches from the Parquet file, one chunk in memory at a time."""
+        if not file_path.endswith(".parquet"):
+            raise ValueError("The provided file is not a Parquet file.")
+
+        parquet_file = pq.ParquetFile(file_path)
+        metadata = parquet_file.metadata
+        if not chunk_rows and chunk_bytes and metadata.num_rows:
+            uncompressed = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+            chunk_rows = max(1, int(chunk_bytes // max(uncompressed / metadata.num_rows, 1)))
+
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows or DEFAULT_CHUNK_ROWS, columns=columns):
+            yield apply_schema(batch.to_pandas(), self.schema)
+
 # ✅ ZIP Ingestor (handles multiple CSV/Excel files)
 class ZipDataIngestor(DataIngestor):
-    def ingest(self, file_path: str) -> pd.DataFrame:
+    SUPPORTED_MEMBERS = (".csv", ".xlsx", ".xls")
+    # Below this much uncompressed data, starting worker processes costs more than it saves
+    PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, member_pattern: str = None, max_workers: int = None):
+        """
+        Parameters:
+        member_pattern (str): Optional glob (e.g. "yellow_tripdata_2023-*.csv"). Only archive
+            members whose path or file name matches it are ingested.
+        max_workers (int): When greater than 1, archives with several members and at least
+            PARALLEL_MIN_BYTES of uncompressed data are parsed on a process pool of this size.
+        """
+        self.member_pattern = member_pattern
+        self.max_workers = max_workers
+
+    def list_members(self, zip_ref: zipfile.ZipFile) -> list:
+        """The CSV/Excel members of this archive that should be ingested, in archive order."""
+        members = []
+        for info in zip_ref.infolist():
+            name = info.filename
+            base_name = os.path.basename(name)
+            if info.is_dir() or name.startswith("__MACOSX/") or base_name.startswith("._"):
+                continue
+            if not name.lower().endswith(self.SUPPORTED_MEMBERS):
+                continue
+            if self.member_pattern and not (
+                fnmatch.fnmatch(name, self.member_pattern) or fnmatch.fnmatch(base_name, self.member_pattern)
+            ):
+                continue
+            members.append(info)
+        return members
+
+    def _open_members(self, file_path: str):
         if not file_path.endswith(".zip"):
             raise ValueError("The provided file is not a .zip file.")
+        zip_ref = zipfile.ZipFile(file_path, "r")
+        members = self.list_members(zip_ref)
+        if len(members) == 0:
+            zip_ref.close()
+            raise FileNotFoundError("No valid CSV or Excel files found in the zip archive.")
+        return zip_ref, members
 
-        extracted_dir = "backend/extracted_data"
-        os.makedirs(extracted_dir, exist_ok=True)
-        with zipfile.ZipFile(file_path, "r") as zip_ref:
-            zip_ref.extractall(extracted_dir)
+    @staticmethod
+    def _read_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> pd.DataFrame:
+        """Parse one member straight from the archive stream, without extracting it to disk."""
+        with zip_ref.open(info) as member:
+            if info.filename.lower().endswith(".csv"):
+                return read_csv(member)
+            # Excel readers need random access, so buffer the member in memory
+            return pd.read_excel(io.BytesIO(member.read()))
 
-        # Filter out CSV and Excel files
-        extracted_files = os.listdir(extracted_dir)
-        valid_files = [f for f in extracted_files if f.endswith((".csv", ".xlsx", ".xls"))]
+    def _use_pool(self, members: list) -> bool:
+        return (
+            bool(self.max_workers) and self.max_workers > 1 and len(members) > 1
+            and sum(info.file_size for info in members) >= self.PARALLEL_MIN_BYTES
+        )
 
-        if len(valid_files) == 0:
-            raise FileNotFoundError("No valid CSV or Excel files found in the zip archive.")
+    def ingest(self, file_path: str) -> pd.DataFrame:
+        zip_ref, members = self._open_members(file_path)
+        if self._use_pool(members):
+            zip_ref.close()
+            return self._ingest_parallel(file_path, members)
 
         dfs = []
-        for file in valid_files:
-            full_path = os.path.join(extracted_dir, file)
-            ext = os.path.splitext(file)[1].lower()
-
-            ingestor = DataIngestorFactory.get_data_ingestor(ext)
-            df = ingestor.ingest(full_path)
-            df["__source_file__"] = file  # Track which file each row came from (optional)
-            dfs.append(df)
+        with zip_ref:
+            for info in members:
+                df = self._read_member(zip_ref, info)
+                df["__source_file__"] = info.filename  # Track which file each row came from (optional)
+                dfs.append(df)
 
         # Merge all DataFrames into one
         combined_df = pd.concat(dfs, ignore_index=True)
         print(f"✅ Ingested {len(dfs)} file(s) from ZIP")
         return combined_df
 
+    def _parse_members_in_pool(self, file_path: str, members: list, output_dir: str = None) -> list:
+        names = [info.filename for info in members]
+        workers = min(self.max_workers, len(names))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_SPAWN) as pool:
+            return list(pool.map(_parse_member, [file_path] * len(names), names, [output_dir] * len(names)))
+
+    def _ingest_parallel(self, file_path: str, members: list) -> pd.DataFrame:
+        """
+        Parses members on a process pool as Arrow tables, reconciles their schemas
+        and converts to pandas once, so the combined frame is allocated a single time.
+        """
+        tables = self._parse_members_in_pool(file_path, members)
+        schema = unify_schemas([table.schema for table in tables])
+        combined = pa.concat_tables([conform_table(table, schema) for table in tables])
+        del tables
+        combined_df = combined.to_pandas()
+        print(f"✅ Ingested {combined.num_rows} rows from ZIP members in parallel")
+        return combined_df
+
+    def ingest_partitioned(self, file_path: str, output_dir: str) -> list:
+        """
+        Writes each member to its own Parquet partition in output_dir instead of
+        combining them, parsing on the process pool when max_workers allows it.
+        Partitions are rewritten where needed so they all share one schema.
+
+        Returns:
+        list: Paths of the partition files, in archive order.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        zip_ref, members = self._open_members(file_path)
+        zip_ref.close()
+        if self._use_pool(members):
+            paths = self._parse_members_in_pool(file_path, members, output_dir)
+        else:
+            paths = [_parse_member(file_path, info.filename, output_dir) for info in members]
+
+        schema = unify_schemas([pq.read_schema(path) for path in paths])
+        for path in paths:
+            if not pq.read_schema(path).equals(schema, check_metadata=False):
+                pq.write_table(conform_table(pq.read_table(path), schema), path)
+        print(f"✅ Wrote {len(paths)} partition(s) from ZIP to {output_dir}")
+        return paths
+
+    def ingest_chunks(self, file_path: str, chunk_rows: int = None, chunk_bytes: int = None) -> Iterator[pd.DataFrame]:
+        """Streams every member in turn; CSV members are chunked, Excel members come as one chunk."""
+        zip_ref, members = self._open_members(file_path)
+        with zip_ref:
+            for info in members:
+                if info.filename.lower().endswith(".csv"):
+                    chunks = _iter_csv_chunks(lambda: zip_ref.open(info), f"{file_path}:{info.filename}",
+                                              chunk_rows, chunk_bytes)
+                else:
+                    chunks = [self._read_member(zip_ref, info)]
+                for chunk in chunks:
+                    chunk["__source_file__"] = info.filename
+                    yield chunk
+        print(f"✅ Streamed {len(members)} file(s) from ZIP")
+
+def _parse_member(file_path: str, member_name: str, output_dir: str = None):
+    """
+    Process-pool task: parse one ZIP member into an Arrow table. With output_dir
+    the table is written there as Parquet and its path is returned instead.
+    """
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        df = ZipDataIngestor._read_member(zip_ref, zip_ref.getinfo(member_name))
+    df["__source_file__"] = member_name
+    table = to_arrow_table(df)
+    del df
+
+    if output_dir is None:
+        return table
+    stem = os.path.splitext(member_name)[0].replace("/", "_")
+    path = os.path.join(output_dir, f"{stem}.parquet")
+    pq.write_table(table, path)
+    return path
+
+
+def _unify_types(types: list) -> pa.DataType:
+    types = [t for t in types if not pa.types.is_null(t)]
+    if not types:
+        return pa.null()
+    if all(t == types[0] for t in types):
+        return types[0]
+    if all(pa.types.is_integer(t) for t in types):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    if all(pa.types.is_timestamp(t) for t in types):
+        return pa.timestamp("ns")
+    return pa.string()
+
+
+def unify_schemas(schemas: list) -> pa.Schema:
+    """
+    Reconcile member schemas: columns are the union in first-seen order, and a
+    column whose type differs between members is widened (int -> float) or,
+    failing that, stored as string.
+    """
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+    return pa.schema([(name, _unify_types(column_types)) for name, column_types in types.items()])
+
+
+def conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Cast a table to the unified schema, adding missing columns as nulls."""
+    columns = []
+    for field in schema:
+        if field.name in table.column_names:
+            column = table.column(field.name)
+            columns.append(column if column.type == field.type else column.cast(field.type))
+        else:
+            columns.append(pa.nulls(table.num_rows, type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def optimize_dtypes(df: pd.DataFrame, category_max_ratio: float = 0.5) -> tuple:
+    """
+    Shrinks a freshly ingested DataFrame to the smallest dtypes that hold its values exactly.
+
+    - integer columns are downcast to the narrowest signed integer type that fits their range
+    - float columns become float32 only if every value survives the round trip unchanged
+    - object columns where distinct values make up at most category_max_ratio of the
+      non-null rows are dictionary-encoded as category
+
+    Returns:
+    tuple: (optimized DataFrame, report with the memory footprint before and after)
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    converted = {}
+    optimized = {}
+
+    for column in df.columns:
+        values = df[column]
+        dtype = values.dtype
+        new_values = values
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            pass
+        elif pd.api.types.is_integer_dtype(dtype):
+            new_values = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(dtype):
+            as_float32 = values.astype("float32")
+            if np.array_equal(as_float32.to_numpy(dtype="float64"), values.to_numpy(), equal_nan=True):
+                new_values = as_float32
+        elif pd.api.types.is_object_dtype(dtype):
+            non_null = values.count()
+            if non_null and values.nunique(dropna=True) <= category_max_ratio * non_null:
+                try:
+                    new_values = values.astype("category")
+                except TypeError:
+                    pass  # unhashable values (lists, dicts) stay as object
+
+        if new_values.dtype != dtype:
+            optimized[column] = new_values
+            converted[column] = f"{dtype} -> {new_values.dtype}"
+
+    if optimized:
+        # Shallow copy: unchanged columns are shared, converted ones are replaced
+        df = df.copy(deep=False)
+        for column, new_values in optimized.items():
+            df[column] = new_values
+
+    after = int(df.memory_usage(deep=True).sum())
+    report = {
+        "before_bytes": before,
+        "after_bytes": after,
+        "saved_bytes": before - after,
+        "reduction_pct": round(100 * (before - after) / before, 2) if before else 0.0,
+        "converted": converted,
+    }
+    print(f"✅ Optimized dtypes: {before} -> {after} bytes ({report['reduction_pct']}% smaller)")
+    return df, report
+
+
+def _datetime_format(values: pd.Series):
+    """
+    The strptime format of a text column that holds dates, or None. The format is
+    guessed from the first value and must parse an evenly spaced sample of the rest.
+    """
+    values = values.dropna()
+    if values.empty or pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return None
+    if guess_datetime_format is not None:
+        guessed = guess_datetime_format(values.iloc[0])
+        candidates = [guessed] if guessed else []
+    else:
+        candidates = DATETIME_FORMATS
+    sample = values.iloc[::max(1, len(values) // DATETIME_SAMPLE_SIZE)]
+    for date_format in candidates:
+        # Require a year and a month or day, so codes like "2010" or "12" stay text
+        if (not any(d in date_format for d in ("%Y", "%y"))
+                or not any(d in date_format for d in ("%m", "%d", "%b", "%B"))):
+            continue
+        if pd.to_datetime(sample.iloc[:1], format=date_format, errors="coerce").isnull().all():
+            continue
+        if pd.to_datetime(sample, format=date_format, errors="coerce").notnull().all():
+            return date_format
+    return None
+
+
+def infer_schema(df: pd.DataFrame) -> dict:
+    """
+    Describe a DataFrame's columns so later reads can skip type inference.
+
+    Returns:
+    dict: {"columns": [...], "dtypes": {column: dtype}, "categories": {column: [levels]},
+        "datetime_formats": {column: strptime format}} where datetime_formats covers
+        text columns holding dates.
+    """
+    schema = {"columns": list(df.columns), "dtypes": {}, "categories": {}, "datetime_formats": {}}
+    for column in df.columns:
+        dtype = df[column].dtype
+        schema["dtypes"][column] = str(dtype)
+        if isinstance(dtype, pd.CategoricalDtype):
+            # optimize_dtypes turns repetitive date strings into categories too
+            date_format = _datetime_format(pd.Series(dtype.categories))
+            if date_format:
+                schema["datetime_formats"][column] = date_format
+            else:
+                schema["categories"][column] = [
+                    level.item() if isinstance(level, np.generic) else level for level in dtype.categories
+                ]
+        elif dtype == object:
+            date_format = _datetime_format(df[column])
+            if date_format:
+                schema["datetime_formats"][column] = date_format
+    return schema
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = None) -> pd.DataFrame:
+    """
+    Give the columns of df the dtypes recorded in schema: category levels, parsed
+    datetimes and exact numeric widths. Columns the schema doesn't know are left as
+    they are, as are values that can't be cast.
+    """
+    if not schema:
+        return df
+    df = df.copy(deep=False)
+    for column in df.columns:
+        dtype = schema["dtypes"].get(column)
+        try:
+            if column in schema.get("datetime_formats", {}):
+                if not pd.api.types.is_datetime64_any_dtype(df[column]):
+                    df[column] = pd.to_datetime(
+                        df[column], format=schema["datetime_formats"][column], errors="coerce")
+            elif column in schema.get("categories", {}):
+                levels = schema["categories"][column]
+                if not (isinstance(df[column].dtype, pd.CategoricalDtype)
+                        and df[column].cat.categories.tolist() == levels):
+                    df[column] = pd.Categorical(df[column], categories=levels)
+            elif dtype and str(df[column].dtype) != dtype:
+                df[column] = df[column].astype(dtype)
+        except (TypeError, ValueError) as e:
+            print(f"❌ Could not apply stored dtype to column '{column}': {str(e)}")
+    return df
+
+
+def _pandas_read_options(schema: dict, columns: list = None) -> tuple:
+    """The dtype, parse_dates and date_format arguments for pd.read_csv from a stored schema."""
+    dtypes, parse_dates, date_formats = {}, [], {}
+    for column, dtype in schema["dtypes"].items():
+        if columns and column not in columns:
+            continue
+        if column in schema.get("datetime_formats", {}):
+            parse_dates.append(column)
+            date_formats[column] = schema["datetime_formats"][column]
+        elif column in schema.get("categories", {}):
+            dtypes[column] = pd.CategoricalDtype(schema["categories"][column])
+        elif dtype.startswith("datetime64"):
+            parse_dates.append(column)
+        else:
+            dtypes[column] = dtype
+    return dtypes, parse_dates or None, date_formats or None
+
+
+def _arrow_column_types(schema: dict) -> dict:
+    """Arrow column types for pyarrow's CSV reader from a stored schema (None without one)."""
+    if not schema:
+        return None
+    column_types = {}
+    for column, dtype in schema["dtypes"].items():
+        if dtype == "object" or column in schema.get("datetime_formats", {}):
+            # Text, including dates, which apply_schema parses with the stored format
+            column_types[column] = pa.string()
+        else:
+            try:
+                numpy_dtype = np.dtype(dtype)
+            except TypeError:
+                # Extension dtypes (category, Int64, ...) are left to inference and apply_schema
+                continue
+            if numpy_dtype.kind in "biuf":
+                column_types[column] = pa.from_numpy_dtype(numpy_dtype)
+    return column_types
+
+
 # ✅ Ingestor Factory
 class DataIngestorFactory:
     @staticmethod
-    def get_data_ingestor(file_extension: str) -> DataIngestor:
+    def get_data_ingestor(file_extension: str, **options) -> DataIngestor:
+        """Returns the ingestor for an extension; options are passed to its constructor."""
         file_extension = file_extension.lower()
         if file_extension == ".zip":
-            return ZipDataIngestor()
+            return ZipDataIngestor(**options)
         elif file_extension == ".csv":
-            return CSVDataIngestor()
+            return CSVDataIngestor(**options)
         elif file_extension in [".xlsx", ".xls"]:
-            return ExcelDataIngestor()
+            return ExcelDataIngestor(**options)
+        elif file_extension == ".parquet":
+            return ParquetDataIngestor(**options)
         else:
             raise ValueError(f"No ingestor available for file extension: {file_extension}")
 
@@ -1,18 +1,56 @@
 import pandas as pd
-from src.ingest_data import DataIngestorFactory
+from typing import Optional
+from src.ingest_data import DataIngestorFactory, to_arrow_table
+from utils.arrow_cache import dataset_cache
+from src.data_sampler import DataSampler, get_sampling_strategy
 from zenml import step
 import os
 
 
 @step
-def data_ingestion_step(file_path: str) -> pd.DataFrame:
-    """Ingest data using the appropriate DataIngestor."""
+def data_ingestion_step(
+    file_path: str,
+    chunk_rows: Optional[int] = None,
+    sample_strategy: Optional[str] = None,
+    sample_size: Optional[int] = None,
+    sample_column: Optional[str] = None,
+    sample_random_state: int = 42,
+    schema: Optional[dict] = None,
+    dataset_id: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Ingest data using the appropriate DataIngestor.
+
+    When chunk_rows is set the file is streamed in chunks of that many rows and
+    assembled once, instead of going through a single whole-file parse.
+
+    When sample_strategy is set ('first_n', 'reservoir' or 'stratified' by
+    sample_column), only sample_size rows are kept, drawn in a single streaming
+    pass so the full file is never loaded.
+
+    schema is the dataset's stored schema; it gives the columns their recorded
+    dtypes instead of inferring them again.
+
+    With a dataset_id, full reads go through the shared Arrow cache, which is keyed
+    by the processed file, so a file already materialized by an earlier run (of
+    this dataset or of a duplicate upload sharing its file) is memory-mapped
+    instead of parsed again.
+    """
     # Determine the file extension dynamically
     file_extension = os.path.splitext(file_path)[1]
 
     # Get the appropriate DataIngestor
-    data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension)
+    options = {"schema": schema} if schema else {}
+    data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension, **options)
 
     # Ingest the data and load it into a DataFrame
-    df = data_ingestor.ingest(file_path)
+    if sample_strategy:
+        strategy = get_sampling_strategy(sample_strategy, sample_size, sample_column, sample_random_state)
+        df = DataSampler(strategy).sample(data_ingestor.ingest_chunks(file_path, chunk_rows=chunk_rows))
+    elif chunk_rows:
+        df = pd.concat(data_ingestor.ingest_chunks(file_path, chunk_rows=chunk_rows), ignore_index=True)
+    elif dataset_id:
+        df = dataset_cache.get_dataframe(file_path, lambda: to_arrow_table(data_ingestor.ingest(file_path)))
+    else:
+        df = data_ingestor.ingest(file_path)
     return df
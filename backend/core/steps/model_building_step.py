@@ -94,10 +94,14 @@ def model_building_step(
 
     # Define preprocessing steps
     categorical_cols = X_train.select_dtypes(include=["object", "category"]).columns
-    numerical_cols = X_train.select_dtypes(exclude=["object", "category"]).columns
+    numerical_cols = X_train.select_dtypes(include=["number", "bool"]).columns
+    # Datetime columns (from the stored schema) have no numeric or one-hot encoding here
+    skipped_cols = X_train.columns.difference(categorical_cols.union(numerical_cols))
 
     logger.info(f"Categorical columns: {categorical_cols.tolist()}")
     logger.info(f"Numerical columns: {numerical_cols.tolist()}")
+    if len(skipped_cols):
+        logger.info(f"Skipped columns: {skipped_cols.tolist()}")
 
     numerical_transformer = SimpleImputer(strategy="mean")
     categorical_transformer = Pipeline(steps=[
@@ -28,7 +28,8 @@ def outlier_detection_step(
         logging.error(f"Column '{column_name}' does not exist in the DataFrame.")
         raise ValueError(f"Column '{column_name}' does not exist in the DataFrame.")
 
-    df_numeric = df.select_dtypes(include=[int, float])
+    # "number" also matches the narrower int/float dtypes chosen at ingest
+    df_numeric = df.select_dtypes(include="number")
 
     # Select strategy
     if strategy == "zscore":
@@ -9,6 +9,7 @@ def preprocessing_options():
         "missing_value_strategies": ["mean", "median", "mode"],
         "feature_engineering_strategies": ["log", "normalize", "standardize"],
         "outlier_detection_methods": ["zscore", "iqr"],
-        "data_split_strategies": ["train_test_split", "k_fold"]
+        "data_split_strategies": ["train_test_split", "k_fold"],
+        "sampling_strategies": ["first_n", "reservoir", "stratified"]
     }
     return jsonify(options), 200
@@ -24,6 +24,35 @@ def get_dataset_details(dataset_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# ✅ EDA for a dataset; ?section=summary,dtypes&column=A&column=B fetches only part of it
+@dataset_bp.route("/dataset/<dataset_id>/eda", methods=["GET"])
+def get_dataset_eda(dataset_id):
+    try:
+        sections = [s for value in request.args.getlist("section") for s in value.split(",") if s]
+        columns = request.args.getlist("column")
+        dataset = DatasetController.get_eda(dataset_id, sections or None, columns or None)
+        if not dataset:
+            return jsonify({"error": "Dataset not found"}), 404
+        return jsonify(dataset), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ✅ Approximate statistics and outlier bounds from the dataset's sketches
+@dataset_bp.route("/datasets/<dataset_id>/sketches", methods=["GET"])
+def get_dataset_sketches(dataset_id):
+    try:
+        factor = float(request.args.get("iqr_factor", 1.5))
+        result = DatasetController.get_sketch_summary(dataset_id, factor)
+        if result is None:
+            return jsonify({"error": "Dataset not found"}), 404
+        return jsonify(result), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # ✅ Delete a dataset
 @dataset_bp.route("/datasets/<dataset_id>", methods=["DELETE"])
 def delete_dataset(dataset_id):
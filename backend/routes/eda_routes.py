@@ -9,7 +9,10 @@ eda_bp = Blueprint("eda_bp", __name__)
 CORS(eda_bp, supports_credentials=True)
 
 # Register EDA-related endpoints
-eda_bp.add_url_rule("/eda_visual", view_func=eda_controller.generate_plot, methods=["POST"])
+eda_bp.add_url_rule("/eda_visual", view_func=eda_controller.generate_plot, methods=["GET", "POST"])
+eda_bp.add_url_rule("/eda_visual/batch", view_func=eda_controller.generate_plots, methods=["POST"])
+
+eda_bp.add_url_rule("/eda_cache/stats", view_func=eda_controller.cache_stats, methods=["GET"])
 
 
 eda_bp.add_url_rule(
@@ -1,10 +1,145 @@
 from flask import Blueprint, request, jsonify
-from controllers.upload_controller import save_file, generate_eda, store_metadata, store_dataset
-from core.src.ingest_data import DataIngestorFactory
+from controllers.upload_controller import (
+    save_file, generate_eda, store_metadata, store_dataset,
+    should_stream, store_dataset_from_chunks, INGEST_CHUNK_BYTES, ZIP_INGEST_WORKERS,
+    EXCEL_SHEET_WORKERS, find_processed_content, register_processed_content, store_dataset_reference,
+    initiate_chunked_upload, get_upload_session, save_upload_part, assemble_upload_parts, mark_upload_session,
+    should_process_async, create_upload_job, submit_upload_job, get_upload_job, store_plot_aggregates
+)
+from core.src.ingest_data import DataIngestorFactory, optimize_dtypes
 import os
+import uuid
 
 upload_bp = Blueprint("upload", __name__)
 
+
+def _async_requested(value):
+    """Parses the optional 'async' flag; None leaves the choice to the upload size."""
+    if value is None or value == "":
+        return None
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def process_saved_upload(file_id, user_id, filename, save_path, file_extension, content_hash,
+                         custom_name=None, member_pattern=None, dataset_id=None, report=None):
+    """
+    Ingest, profile and store a file that has been fully written to disk.
+    report(stage, progress, **fields), if given, is called as processing advances.
+    """
+    report = report or (lambda stage, progress, **fields: None)
+    # Options that change what gets ingested are part of the deduplication key
+    content_options = {}
+    if file_extension == ".zip" and member_pattern:
+        content_options["member_pattern"] = member_pattern
+
+    # Identical content was processed before: reuse its processed dataset and EDA
+    existing = find_processed_content(content_hash, content_options)
+    if existing:
+        dataset = store_dataset_reference(file_id, user_id, filename, save_path, existing, custom_name, dataset_id)
+        store_metadata(file_id, user_id, filename, save_path, custom_name)
+        print(f"✅ Duplicate upload reused dataset {existing['dataset_id']} for file: {filename}")
+        return {
+            "message": "File uploaded and analyzed successfully",
+            "file_id": file_id,
+            "dataset_id": dataset["dataset_id"],
+            "user_id": user_id,
+            "custom_name": custom_name or filename,
+            "file_path": save_path,
+            "deduplicated": True
+        }
+
+    # ZIP archives: parse members on a process pool, optionally restricted by a glob.
+    # Excel workbooks: convert sheets concurrently on first ingest.
+    ingest_options = dict(content_options)
+    if file_extension == ".zip":
+        ingest_options["max_workers"] = ZIP_INGEST_WORKERS
+    elif file_extension in [".xlsx", ".xls"]:
+        ingest_options["max_workers"] = EXCEL_SHEET_WORKERS
+
+    data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension, **ingest_options)
+
+    if should_stream(save_path):
+        # Large upload: ingest, profile and store chunk by chunk
+        report("ingesting", 0.1)
+        chunks = data_ingestor.ingest_chunks(save_path, chunk_bytes=INGEST_CHUNK_BYTES)
+        dataset = store_dataset_from_chunks(
+            file_id, user_id, filename, save_path, chunks, custom_name, content_hash, dataset_id,
+            on_chunk=lambda rows: report("ingesting", 0.5, rows_processed=rows)
+        )
+        report("storing", 0.9)
+        store_metadata(file_id, user_id, filename, save_path, custom_name)
+    else:
+        # Ingest the data
+        report("ingesting", 0.1)
+        df = data_ingestor.ingest(save_path)
+        print(f"✅ Data ingested successfully for file: {filename}")
+
+        # Compact dtypes before profiling and storing
+        df, memory_usage = optimize_dtypes(df)
+
+        # Generate EDA
+        report("profiling", 0.4, rows_processed=len(df))
+        eda = generate_eda(file_id, user_id, filename, save_path, df, memory_usage)
+
+        # Store metadata and dataset
+        report("storing", 0.7)
+        store_metadata(file_id, user_id, filename, save_path, custom_name)
+        dataset = store_dataset(file_id, user_id, eda, df, custom_name, content_hash, dataset_id)
+
+    register_processed_content(content_hash, dataset, content_options)
+
+    # Precompute plot aggregates so common EDA plots skip the raw rows
+    report("aggregating", 0.9)
+    store_plot_aggregates(dataset)
+
+    print(f"✅ File upload completed successfully for file: {filename}")
+    return {
+        "message": "File uploaded and analyzed successfully",
+        "file_id": file_id,
+        "dataset_id": dataset["dataset_id"],
+        "user_id": user_id,
+        "custom_name": custom_name or filename,
+        "file_path": save_path,
+        "deduplicated": False
+    }
+
+
+def queue_upload(file_id, user_id, filename, save_path, file_extension, content_hash,
+                 custom_name=None, member_pattern=None, on_done=None):
+    """
+    Hand a saved upload to the background pool and return the "processing"
+    response straight away. on_done(error), if given, runs after processing.
+    """
+    dataset_id = str(uuid.uuid4())
+    create_upload_job(dataset_id, file_id, user_id, filename, custom_name)
+
+    def process(report):
+        try:
+            response = process_saved_upload(
+                file_id, user_id, filename, save_path, file_extension, content_hash,
+                custom_name, member_pattern, dataset_id, report
+            )
+        except Exception as e:
+            if on_done:
+                on_done(str(e))
+            raise
+        if on_done:
+            on_done(None)
+        return response
+
+    submit_upload_job(dataset_id, process)
+    print(f"✅ Upload queued for background processing: {filename} (dataset {dataset_id})")
+    return {
+        "message": "File uploaded; processing in the background",
+        "file_id": file_id,
+        "dataset_id": dataset_id,
+        "user_id": user_id,
+        "custom_name": custom_name or filename,
+        "status": "processing",
+        "status_url": f"/upload_status/{dataset_id}"
+    }
+
+
 @upload_bp.route('/upload_file', methods=['POST'])
 def upload_file():
     try:
@@ -12,42 +147,128 @@ def upload_file():
         file = request.files.get('file')
         if not file:
             return jsonify({"error": "No file provided"}), 400
-        
+
         # Get or generate user ID
         user_id = request.form.get('user_id', 'default_user')
-        
+
         # Get the custom file name (optional)
         custom_name = request.form.get('custom_name', None)
 
         # Save the file
-        file_id, filename, save_path, file_extension = save_file(file, user_id, custom_name)
+        file_id, filename, save_path, file_extension, content_hash = save_file(file, user_id, custom_name)
 
-        # Ingest the data
-        data_ingestor = DataIngestorFactory.get_data_ingestor(file_extension)
-        df = data_ingestor.ingest(save_path)
-        print(f"✅ Data ingested successfully for file: {filename}")
+        args = (file_id, user_id, filename, save_path, file_extension, content_hash,
+                custom_name, request.form.get('member_pattern'))
 
-        # Generate EDA
-        eda = generate_eda(file_id, user_id, filename, save_path, df)
+        # Large (or explicitly async) uploads are processed in the background
+        if should_process_async(save_path, _async_requested(request.form.get('async'))):
+            return jsonify(queue_upload(*args)), 202
 
-        # Store metadata and dataset
-        store_metadata(file_id, user_id, filename, save_path, custom_name)
-        store_dataset(file_id, user_id, eda, df, custom_name)
+        response = process_saved_upload(*args)
+        return jsonify(response), 200
+
+    except ValueError as ve:
+        print(f"❌ Validation error: {str(ve)}")
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        print(f"❌ General error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+# ✅ Resumable chunked upload: initiate -> PUT parts -> complete
+@upload_bp.route('/uploads/initiate', methods=['POST'])
+def initiate_upload():
+    try:
+        data = request.get_json() or {}
+        if not data.get("filename") or not data.get("total_parts"):
+            return jsonify({"error": "filename and total_parts are required"}), 400
+
+        session = initiate_chunked_upload(
+            user_id=data.get("user_id", "default_user"),
+            filename=data["filename"],
+            total_parts=data["total_parts"],
+            custom_name=data.get("custom_name"),
+            member_pattern=data.get("member_pattern")
+        )
+        return jsonify({"upload_id": session["upload_id"], "total_parts": session["total_parts"]}), 201
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@upload_bp.route('/uploads/<upload_id>/parts/<int:part_number>', methods=['PUT'])
+def upload_part(upload_id, part_number):
+    """Part bytes are the raw request body; X-Part-SHA256 carries the part's checksum."""
+    try:
+        part = save_upload_part(upload_id, part_number, request.stream, request.headers.get("X-Part-SHA256"))
+        return jsonify(part), 200
+
+    except LookupError as le:
+        return jsonify({"error": str(le)}), 404
+
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@upload_bp.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Lists received and missing parts so an interrupted client can resume."""
+    session = get_upload_session(upload_id)
+    if not session:
+        return jsonify({"error": f"Upload {upload_id} not found"}), 404
+    return jsonify(session), 200
 
-        # Return response
-        print(f"✅ File upload completed successfully for file: {filename}")
-        return jsonify({
-            "message": "File uploaded and analyzed successfully",
-            "file_id": file_id,
-            "user_id": user_id,
-            "custom_name": custom_name or filename,
-            "file_path": save_path
-        }), 200
+
+@upload_bp.route('/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    try:
+        session = get_upload_session(upload_id)
+        file_id, filename, save_path, file_extension, content_hash = assemble_upload_parts(upload_id)
+    except LookupError as le:
+        return jsonify({"error": str(le)}), 404
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except OSError as oe:
+        mark_upload_session(upload_id, "failed", str(oe))
+        print(f"❌ Failed to assemble upload {upload_id}: {str(oe)}")
+        return jsonify({"error": str(oe)}), 500
+
+    args = (file_id, session["user_id"], filename, save_path, file_extension, content_hash,
+            session.get("custom_name"), session.get("member_pattern"))
+
+    try:
+        if should_process_async(save_path, _async_requested(request.args.get('async'))):
+            response = queue_upload(
+                *args, on_done=lambda error: mark_upload_session(upload_id, "failed" if error else "processed", error)
+            )
+            return jsonify({**response, "upload_id": upload_id}), 202
+
+        response = process_saved_upload(*args)
+        mark_upload_session(upload_id, "processed")
+        return jsonify({**response, "upload_id": upload_id}), 200
 
     except ValueError as ve:
+        mark_upload_session(upload_id, "failed", str(ve))
         print(f"❌ Validation error: {str(ve)}")
         return jsonify({"error": str(ve)}), 400
 
     except Exception as e:
+        mark_upload_session(upload_id, "failed", str(e))
         print(f"❌ General error: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@upload_bp.route('/upload_status/<dataset_id>', methods=['GET'])
+def processing_status(dataset_id):
+    """Reports the stage and progress of an upload being processed in the background."""
+    job = get_upload_job(dataset_id)
+    if not job:
+        return jsonify({"error": f"No upload job for dataset {dataset_id}"}), 404
+    return jsonify(job), 200
@@ -0,0 +1,91 @@
+# backend/tests/test_arrow_cache.py
+# python -m unittest tests.test_arrow_cache
+
+import os
+import time
+import unittest
+import tempfile
+import pandas as pd
+import pyarrow as pa
+from utils.arrow_cache import ArrowDatasetCache
+
+
+class TestArrowDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ArrowDatasetCache(cache_dir=os.path.join(self.temp_dir.name, "cache"), max_bytes=1024 ** 3)
+        self.data = pd.DataFrame({
+            "Lot Area": [8450, 9600, 11250],
+            "SalePrice": [208500.0, 181500.0, 223500.0],
+            "MS Zoning": pd.Categorical(["RL", "RL", "RM"]),
+        })
+        self.source_path = self.write_source("source.parquet")
+        self.loads = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_source(self, name):
+        path = os.path.join(self.temp_dir.name, name)
+        self.data.to_parquet(path)
+        return path
+
+    def load(self):
+        self.loads += 1
+        return pa.Table.from_pandas(self.data, preserve_index=False)
+
+    def test_materializes_once_and_maps(self):
+        first = self.cache.get_dataframe(self.source_path, self.load)
+        second = self.cache.get_dataframe(self.source_path, self.load, columns=["SalePrice"])
+
+        self.assertEqual(self.loads, 1)
+        pd.testing.assert_frame_equal(first, self.data)
+        self.assertEqual(list(second.columns), ["SalePrice"])
+
+    def test_zero_copy_columns_are_read_only(self):
+        df = self.cache.get_dataframe(self.source_path, self.load, zero_copy=True)
+        self.assertFalse(df["Lot Area"].to_numpy().flags.writeable)
+
+    def test_new_source_version_rematerializes(self):
+        self.cache.get_table(self.source_path, self.load)
+        time.sleep(0.01)
+        self.data = self.data.assign(SalePrice=0.0)
+        self.write_source("source.parquet")
+
+        table = self.cache.get_table(self.source_path, self.load)
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(table.column("SalePrice").to_pylist(), [0.0, 0.0, 0.0])
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_lru_eviction_respects_budget(self):
+        sources = {name: self.write_source(f"{name}.parquet") for name in ["ds1", "ds2", "ds3"]}
+        for name in ["ds1", "ds2"]:
+            self.cache.get_table(sources[name], self.load)
+            time.sleep(0.01)
+        entry_size = self.cache.entries()[0][1]
+
+        # Touch ds1 so ds2 becomes the least recently used entry
+        self.cache.get_table(sources["ds1"], self.load)
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.get_table(sources["ds3"], self.load)
+
+        self.assertTrue(self.cache.contains(sources["ds1"]))
+        self.assertFalse(self.cache.contains(sources["ds2"]))
+        self.assertTrue(self.cache.contains(sources["ds3"]))
+
+    def test_datasets_sharing_a_file_share_the_entry(self):
+        self.cache.get_table(self.source_path, self.load)
+        self.cache.get_table(os.path.join(self.temp_dir.name, ".", "source.parquet"), self.load)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_invalidate(self):
+        self.cache.get_table(self.source_path, self.load)
+        self.cache.invalidate(self.source_path)
+        self.assertEqual(self.cache.entries(), [])
+        self.assertFalse(self.cache.contains(self.source_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
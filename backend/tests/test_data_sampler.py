@@ -0,0 +1,87 @@
+# backend/tests/test_data_sampler.py
+# python -m unittest tests.test_data_sampler
+
+import unittest
+import pandas as pd
+from core.src.data_sampler import DataSampler, get_sampling_strategy
+
+
+class TestDataSampler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # 1,000 rows with an imbalanced class column and some missing labels
+        cls.data = pd.DataFrame({
+            "id": range(1000),
+            "label": (["a"] * 700 + ["b"] * 250 + [None] * 50),
+        })
+
+    def chunks(self, size=128):
+        return (self.data.iloc[i:i + size] for i in range(0, len(self.data), size))
+
+    def sample(self, strategy, sample_size, column=None, random_state=42):
+        return DataSampler(get_sampling_strategy(strategy, sample_size, column, random_state)).sample(self.chunks())
+
+    def test_first_n_stops_early(self):
+        consumed = []
+
+        def tracked():
+            for chunk in self.chunks():
+                consumed.append(len(chunk))
+                yield chunk
+
+        df = DataSampler(get_sampling_strategy("first_n", 200)).sample(tracked())
+        self.assertEqual(df["id"].tolist(), list(range(200)))
+        self.assertEqual(len(consumed), 2)
+
+    def test_reservoir_is_uniform_and_reproducible(self):
+        first = self.sample("reservoir", 100)
+        second = self.sample("reservoir", 100)
+        pd.testing.assert_frame_equal(first, second)
+
+        self.assertEqual(len(first), 100)
+        self.assertTrue(first["id"].is_unique)
+        self.assertTrue(first["id"].is_monotonic_increasing)
+        self.assertFalse(first.equals(self.sample("reservoir", 100, random_state=7)))
+
+    def test_reservoir_smaller_than_sample_size(self):
+        self.assertEqual(len(self.sample("reservoir", 5000)), len(self.data))
+
+    def test_stratified_keeps_proportions(self):
+        df = self.sample("stratified", 100, "label")
+        counts = df["label"].value_counts(dropna=False)
+
+        self.assertEqual(len(df), 100)
+        self.assertEqual(counts["a"], 70)
+        self.assertEqual(counts["b"], 25)
+        self.assertEqual(df["label"].isnull().sum(), 5)
+        self.assertNotIn("__sample_stratum__", df.columns)
+
+    def test_stratified_with_many_small_strata(self):
+        data = pd.DataFrame({"id": range(1000), "label": ["a"] * 991 + [f"rare{i}" for i in range(9)]})
+        df = DataSampler(get_sampling_strategy("stratified", 10, "label", 42)).sample([data])
+        counts = df["label"].value_counts()
+
+        self.assertEqual(len(df), 10)
+        self.assertEqual(counts["a"], 1)
+        self.assertEqual(len(counts), 10)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            get_sampling_strategy("systematic", 10)
+        with self.assertRaises(ValueError):
+            get_sampling_strategy("reservoir", 0)
+        with self.assertRaises(ValueError):
+            get_sampling_strategy("stratified", 10)
+        with self.assertRaises(ValueError):
+            self.sample("stratified", 10, "missing_column")
+
+    def test_params_record_the_sample(self):
+        strategy = get_sampling_strategy("stratified", 100, "label", random_state=3)
+        self.assertEqual(strategy.params(), {
+            "strategy": "stratified", "sample_size": 100, "random_state": 3, "column": "label"
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
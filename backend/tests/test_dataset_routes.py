@@ -0,0 +1,104 @@
+# backend/tests/test_dataset_routes.py
+# python -m unittest tests.test_dataset_routes
+
+import unittest
+import mongomock
+import pandas as pd
+from flask import Flask
+from utils.db import Database
+from utils.eda_store import save_eda_profile, save_sketches
+from utils.sketches import DatasetSketch
+from routes.dataset_routes import dataset_bp
+
+
+class TestDatasetEDARoutes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Use mongomock for testing
+        cls.mock_client = mongomock.MongoClient()
+        cls.db = cls.mock_client["automl_test"]
+        Database._client = cls.mock_client
+        Database._db = cls.db
+
+        app = Flask(__name__)
+        app.register_blueprint(dataset_bp)
+        cls.client = app.test_client()
+
+        columns = ["Lot Area", "SalePrice", "MS Zoning"]
+        cls.eda = {
+            "file_id": "file1",
+            "filename": "sample.csv",
+            "file_path": "uploads/sample.csv",
+            "shape": [2, 3],
+            "columns": columns,
+            "dtypes": {"Lot Area": "int64", "SalePrice": "int64", "MS Zoning": "object"},
+            "missing_values": {"Lot Area": 0, "SalePrice": 1, "MS Zoning": 0},
+            "summary": {column: {"count": 2} for column in columns},
+            "head": [{"Lot Area": 8450, "SalePrice": 208500, "MS Zoning": "RL"},
+                     {"Lot Area": 9600, "SalePrice": "", "MS Zoning": "RM"}],
+        }
+        compact = save_eda_profile("profile1", cls.eda)
+        cls.dataset_id = str(cls.db["datasets"].insert_one({
+            "dataset_id": "ds1", "custom_name": "sample", "eda": compact, "eda_profile_id": "profile1"
+        }).inserted_id)
+        cls.sketch = DatasetSketch()
+        cls.sketch.update(pd.DataFrame(cls.eda["head"]).replace("", None))
+        save_sketches("profile1", cls.sketch.to_dict())
+        # A deduplicated upload shares the original's profile and sketches
+        cls.duplicate_id = str(cls.db["datasets"].insert_one({
+            "dataset_id": "ds2", "custom_name": "copy", "eda": compact, "eda_profile_id": "profile1"
+        }).inserted_id)
+        # A dataset stored before EDA profiles were split out
+        cls.legacy_id = str(cls.db["datasets"].insert_one({
+            "dataset_id": "ds0", "custom_name": "legacy", "eda": dict(cls.eda)
+        }).inserted_id)
+
+    def test_dataset_document_keeps_compact_eda(self):
+        stored = self.db["datasets"].find_one({"dataset_id": "ds1"})
+        self.assertNotIn("summary", stored["eda"])
+        self.assertEqual(stored["eda"]["total_missing"], 1)
+        self.assertEqual(stored["eda"]["shape"], [2, 3])
+
+    def test_full_eda(self):
+        response = self.client.get(f"/dataset/{self.dataset_id}/eda")
+        self.assertEqual(response.status_code, 200)
+        eda = response.get_json()["eda"]
+        for section in ["columns", "dtypes", "missing_values", "summary", "head"]:
+            self.assertEqual(eda[section], self.eda[section])
+
+    def test_dataset_details_keep_compact_eda(self):
+        response = self.client.get(f"/datasets/{self.dataset_id}")
+        self.assertEqual(response.status_code, 200)
+        eda = response.get_json()["dataset"]["eda"]
+        for section in ["dtypes", "missing_values", "summary", "head"]:
+            self.assertNotIn(section, eda)
+        self.assertEqual(eda["total_missing"], 1)
+
+    def test_section_and_column(self):
+        response = self.client.get(f"/dataset/{self.dataset_id}/eda?section=summary,head&column=MS Zoning")
+        eda = response.get_json()["eda"]
+        self.assertEqual(eda["summary"], {"MS Zoning": {"count": 2}})
+        self.assertEqual(eda["head"], [{"MS Zoning": "RL"}, {"MS Zoning": "RM"}])
+        self.assertNotIn("dtypes", eda)
+
+    def test_legacy_inline_eda(self):
+        eda = self.client.get(f"/dataset/{self.legacy_id}/eda?section=dtypes").get_json()["eda"]
+        self.assertEqual(eda["dtypes"], self.eda["dtypes"])
+        self.assertNotIn("summary", eda)
+
+    def test_sketches_stored_out_of_line(self):
+        self.assertNotIn("sketches", self.db["datasets"].find_one({"dataset_id": "ds1"}))
+        for dataset_id in [self.dataset_id, self.duplicate_id]:
+            response = self.client.get(f"/datasets/{dataset_id}/sketches")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["summary"]["Lot Area"]["max"], 9600)
+        self.assertEqual(self.client.get(f"/datasets/{self.legacy_id}/sketches").status_code, 400)
+
+    def test_unknown_section(self):
+        response = self.client.get(f"/dataset/{self.dataset_id}/eda?section=plots")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
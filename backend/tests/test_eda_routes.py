@@ -1,4 +1,6 @@
 import os
+import gzip
+import json
 import unittest
 import mongomock
 from flask import Flask
@@ -172,6 +174,67 @@ class TestEDARoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.save_plot(response, "jointplot.png")
 
+    def test_conditional_get(self):
+        query = f"/eda_visual?dataset_id={self.dataset_id}&plot_type=histogram&column=SalePrice"
+        response = self.client.get(query)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(query, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+        # Different parameters describe a different figure
+        response = self.client.get(query.replace("SalePrice", "Lot Area"), headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_compressed_response(self):
+        query = f"/eda_visual?dataset_id={self.dataset_id}&plot_type=boxplot&column=SalePrice"
+        plain = self.client.get(query)
+        response = self.client.get(query, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.data)), plain.get_json())
+        self.assertNotEqual(response.headers["ETag"], plain.headers["ETag"])
+
+        response = self.client.get(query, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_unsupported_plot_type(self):
+        # Rejected before the dataset is looked up or read
+        response = self.client.get("/eda_visual?dataset_id=unknown&plot_type=treemap")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Unsupported plot type: treemap")
+
+    def test_batch(self):
+        plots = [
+            {"plot_type": "histogram", "column": "SalePrice"},
+            {"plot_type": "heatmap"},
+            {"plot_type": "correlation_top_n", "column": "SalePrice", "top_n": 1},
+            {"plot_type": "scatter", "column": "Lot Area", "column2": "Unknown"},
+        ]
+        response = self.client.post("/eda_visual/batch", json={"dataset_id": self.dataset_id, "plots": plots})
+        self.assertEqual(response.status_code, 200)
+        figures = response.get_json()["figures"]
+        self.assertEqual([figure["status"] for figure in figures], [200, 200, 200, 400])
+
+        # Each figure is the one /eda_visual returns, and shares its ETag
+        single = self.client.get(f"/eda_visual?dataset_id={self.dataset_id}&plot_type=heatmap")
+        self.assertEqual(figures[1]["figure"], single.get_json())
+        self.assertEqual(f'"{figures[1]["etag"]}"', single.headers["ETag"])
+
+        response = self.client.post("/eda_visual/batch", json={
+            "dataset_id": self.dataset_id, "plots": plots, "stream": True
+        })
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(sorted(line["index"] for line in lines), [0, 1, 2, 3])
+
+        response = self.client.post("/eda_visual/batch", json={"dataset_id": self.dataset_id, "plots": []})
+        self.assertEqual(response.status_code, 400)
+
 
 if __name__ == "__main__":
     unittest.main()
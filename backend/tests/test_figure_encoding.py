@@ -0,0 +1,55 @@
+# backend/tests/test_figure_encoding.py
+# python -m unittest tests.test_figure_encoding
+
+import gzip
+import json
+import unittest
+import numpy as np
+import plotly.graph_objects as go
+from werkzeug.http import parse_accept_header
+from utils.figure_encoding import encode_figure, typed_arrays, typed_array_spec, negotiate_encoding, compress
+from tests.test_plot_aggregates import decode_array
+
+
+class TestFigureEncoding(unittest.TestCase):
+
+    def test_numeric_arrays_become_typed_arrays(self):
+        x = np.linspace(0, 1, 1000)
+        fig = go.Figure(go.Heatmap(x=x, y=list(range(300)), z=[[1, 2], [3, 4]], text=["a"] * 300))
+        trace = json.loads(encode_figure(fig))["data"][0]
+
+        np.testing.assert_array_equal(decode_array(trace["x"]), x)
+        np.testing.assert_array_equal(decode_array(trace["y"]), np.arange(300))
+        # Short and non-numeric arrays stay plain JSON
+        self.assertEqual(trace["z"], [[1, 2], [3, 4]])
+        self.assertEqual(trace["text"], ["a"] * 300)
+
+        z = typed_arrays({"z": [[i, i + 1] for i in range(200)]})["z"]
+        self.assertEqual(decode_array(z).shape, (200, 2))
+
+    def test_typed_array_dtypes(self):
+        spec = typed_array_spec(np.arange(1000, dtype="int64"))
+        self.assertEqual(spec["dtype"], "i2")
+        np.testing.assert_array_equal(decode_array(spec), np.arange(1000))
+        # Beyond int32 plotly.js has no integer type, so the array is left as it is
+        self.assertIsInstance(typed_array_spec(np.array([0, 2 ** 40])), np.ndarray)
+        self.assertIsInstance(typed_array_spec(np.ones(3, dtype=bool)), np.ndarray)
+
+        spec = typed_array_spec(np.arange(6, dtype=">f8").reshape(2, 3))
+        self.assertEqual((spec["dtype"], spec["shape"]), ("f8", "2,3"))
+        np.testing.assert_array_equal(decode_array(spec), np.arange(6).reshape(2, 3))
+
+    def test_nan_in_lists_becomes_null(self):
+        fig = go.Figure(go.Scatter(x=[1.0, float("nan"), 3.0], y=[1, 2, 3]))
+        self.assertEqual(json.loads(encode_figure(fig))["data"][0]["x"], [1.0, None, 3.0])
+
+    def test_content_negotiation(self):
+        self.assertEqual(negotiate_encoding(parse_accept_header("gzip, deflate")), "gzip")
+        self.assertIsNone(negotiate_encoding(parse_accept_header("identity")))
+        self.assertIsNone(negotiate_encoding(parse_accept_header("gzip;q=0")))
+        body = encode_figure(go.Figure(go.Bar(y=list(range(1000)))))
+        self.assertEqual(gzip.decompress(compress(body, "gzip")), body)
+
+
+if __name__ == "__main__":
+    unittest.main()
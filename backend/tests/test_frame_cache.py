@@ -0,0 +1,105 @@
+# backend/tests/test_frame_cache.py
+# python -m unittest tests.test_frame_cache
+
+import os
+import time
+import threading
+import unittest
+import tempfile
+import pandas as pd
+from utils.frame_cache import FrameCache
+
+
+class TestFrameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({"Lot Area": range(1000), "SalePrice": [1.5] * 1000})
+        self.paths = []
+        for name in ["a.csv", "b.csv", "c.csv"]:
+            path = os.path.join(self.temp_dir.name, name)
+            self.data.to_csv(path, index=False)
+            self.paths.append(path)
+        self.frame_bytes = int(self.data.memory_usage(deep=True).sum())
+        self.loads = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load(self, delay=0):
+        def loader():
+            self.loads += 1
+            time.sleep(delay)
+            return self.data.copy()
+        return loader
+
+    def test_hits_and_misses(self):
+        cache = FrameCache(max_bytes=10 * self.frame_bytes)
+        first = cache.get(self.paths[0], self.load())
+        second = cache.get(self.paths[0], self.load())
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+        # A projection is a separate entry
+        cache.get(self.paths[0], self.load(), columns=["SalePrice"])
+        self.assertEqual(self.loads, 2)
+
+    def test_concurrent_requests_share_one_load(self):
+        cache = FrameCache(max_bytes=10 * self.frame_bytes)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get(self.paths[0], self.load(0.2))))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(frame is results[0] for frame in results))
+        self.assertEqual(cache.stats()["shared_loads"], 4)
+
+    def test_lru_eviction_respects_budget(self):
+        cache = FrameCache(max_bytes=2 * self.frame_bytes)
+        cache.get(self.paths[0], self.load())
+        cache.get(self.paths[1], self.load())
+        cache.get(self.paths[0], self.load())
+        cache.get(self.paths[2], self.load())
+
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+        # paths[1] was the least recently used
+        cache.get(self.paths[0], self.load())
+        self.assertEqual(self.loads, 3)
+        cache.get(self.paths[1], self.load())
+        self.assertEqual(self.loads, 4)
+
+    def test_changed_file_and_invalidation(self):
+        cache = FrameCache(max_bytes=10 * self.frame_bytes)
+        cache.get(self.paths[0], self.load())
+        self.assertEqual(cache.invalidate(self.paths[0]), 1)
+        cache.get(self.paths[0], self.load())
+        self.assertEqual(self.loads, 2)
+
+        self.data.head(10).to_csv(self.paths[0], index=False)
+        cache.get(self.paths[0], self.load())
+        self.assertEqual(self.loads, 3)
+
+    def test_failed_load_is_not_cached(self):
+        cache = FrameCache(max_bytes=10 * self.frame_bytes)
+
+        def failing():
+            raise ValueError("corrupt file")
+
+        with self.assertRaises(ValueError):
+            cache.get(self.paths[0], failing)
+        cache.get(self.paths[0], self.load())
+        self.assertEqual(self.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
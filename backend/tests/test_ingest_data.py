@@ -0,0 +1,290 @@
+# backend/tests/test_ingest_data.py
+# python -m unittest tests.test_ingest_data
+
+import os
+import unittest
+import tempfile
+import zipfile
+from unittest import mock
+import pandas as pd
+from core.src.ingest_data import (
+    DataIngestorFactory, ParquetDataIngestor, CSVDataIngestor, ZipDataIngestor, ExcelDataIngestor,
+    optimize_dtypes, infer_schema
+)
+from controllers.upload_controller import write_processed_dataset, generate_eda, PARQUET_ROW_GROUP_SIZE
+from utils.eda_utils import StreamingEDA, profile_dataframe
+
+
+class TestDataIngestion(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.sample_data = pd.DataFrame({
+            "Lot Area": [8450, 9600, 11250, 9550, 14260],
+            "SalePrice": [208500.0, 181500.0, 223500.0, 140000.0, 250000.0],
+            "MS Zoning": ["RL", "RL", "RM", None, "RL"]
+        })
+        cls.csv_path = os.path.join(cls.temp_dir.name, "sample.csv")
+        cls.sample_data.to_csv(cls.csv_path, index=False)
+
+        cls.zip_path = os.path.join(cls.temp_dir.name, "monthly.zip")
+        with zipfile.ZipFile(cls.zip_path, "w") as zipf:
+            zipf.writestr("2023/jan.csv", cls.sample_data.to_csv(index=False))
+            zipf.writestr("2023/feb.csv", cls.sample_data.to_csv(index=False))
+            zipf.writestr("notes.txt", "not a dataset")
+            zipf.writestr("__MACOSX/2023/._jan.csv", "resource fork")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_parquet_round_trip_preserves_dtypes(self):
+        parquet_path = os.path.join(self.temp_dir.name, "roundtrip.parquet")
+        write_processed_dataset(self.sample_data, parquet_path)
+
+        df = DataIngestorFactory.get_data_ingestor(".parquet").ingest(parquet_path)
+        pd.testing.assert_frame_equal(df, self.sample_data)
+
+    def test_parquet_column_projection(self):
+        parquet_path = os.path.join(self.temp_dir.name, "projection.parquet")
+        write_processed_dataset(self.sample_data, parquet_path)
+
+        df = ParquetDataIngestor().ingest(parquet_path, columns=["SalePrice"])
+        self.assertEqual(list(df.columns), ["SalePrice"])
+        self.assertEqual(len(df), len(self.sample_data))
+
+    def test_parquet_filters_skip_rows(self):
+        parquet_path = os.path.join(self.temp_dir.name, "filters.parquet")
+        large = pd.DataFrame({"id": range(PARQUET_ROW_GROUP_SIZE * 2)})
+        write_processed_dataset(large, parquet_path)
+
+        df = ParquetDataIngestor().ingest(parquet_path, filters=[("id", ">=", PARQUET_ROW_GROUP_SIZE)])
+        self.assertEqual(len(df), PARQUET_ROW_GROUP_SIZE)
+        self.assertEqual(df["id"].min(), PARQUET_ROW_GROUP_SIZE)
+
+    def test_mixed_object_column_is_stored(self):
+        parquet_path = os.path.join(self.temp_dir.name, "mixed.parquet")
+        mixed = pd.DataFrame({"value": [1, "two", 3.0, None]})
+        write_processed_dataset(mixed, parquet_path)
+
+        df = ParquetDataIngestor().ingest(parquet_path)
+        self.assertEqual(df["value"].tolist()[:3], ["1", "two", "3.0"])
+        self.assertTrue(pd.isnull(df["value"].iloc[3]))
+
+    def test_csv_column_projection(self):
+        df = DataIngestorFactory.get_data_ingestor(".csv").ingest(self.csv_path, columns=["Lot Area"])
+        self.assertEqual(list(df.columns), ["Lot Area"])
+
+    def test_csv_engines_agree(self):
+        fast = CSVDataIngestor(engine="pyarrow").ingest(self.csv_path)
+        default = CSVDataIngestor(engine="c").ingest(self.csv_path)
+        pd.testing.assert_frame_equal(fast, default)
+
+        arrow_backed = CSVDataIngestor(dtype_backend="pyarrow").ingest(self.csv_path)
+        self.assertEqual(str(arrow_backed["Lot Area"].dtype), "int64[pyarrow]")
+
+    def test_csv_engine_falls_back_to_c(self):
+        csv_path = os.path.join(self.temp_dir.name, "quoted.csv")
+        with open(csv_path, "w") as f:
+            f.write('id,note\n1,"multi\nline"\n2,plain\n')
+
+        # The pyarrow engine rejects newlines inside quoted values by default
+        df = CSVDataIngestor(engine="pyarrow").ingest(csv_path)
+        self.assertEqual(df["note"].tolist(), ["multi\nline", "plain"])
+
+    def test_csv_chunks_respect_row_budget(self):
+        chunks = list(CSVDataIngestor().ingest_chunks(self.csv_path, chunk_rows=2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        combined = pd.concat(chunks, ignore_index=True)
+        self.assertEqual(combined["Lot Area"].tolist(), self.sample_data["Lot Area"].tolist())
+
+    def test_csv_chunks_respect_byte_budget(self):
+        csv_path = os.path.join(self.temp_dir.name, "budget.csv")
+        pd.DataFrame({"a": range(50_000), "b": ["x" * 10] * 50_000}).to_csv(csv_path, index=False)
+
+        chunks = CSVDataIngestor().ingest_chunks(csv_path, chunk_bytes=256 * 1024)
+        sizes = [len(c) for c in chunks]
+        self.assertGreater(len(sizes), 1)
+        self.assertEqual(sum(sizes), 50_000)
+
+    def test_csv_chunks_keep_one_schema(self):
+        csv_path = os.path.join(self.temp_dir.name, "late_nulls.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,flag\n1,true\n2,false\n3,\n")
+
+        chunks = list(CSVDataIngestor().ingest_chunks(csv_path, chunk_rows=2))
+        self.assertEqual(str(chunks[0]["id"].dtype), str(chunks[1]["id"].dtype))
+        self.assertEqual(str(chunks[0]["flag"].dtype), str(chunks[1]["flag"].dtype))
+
+    def test_streaming_eda_matches_generate_eda(self):
+        eda = generate_eda("file", "user", "sample.csv", self.csv_path, self.sample_data)
+
+        accumulator = StreamingEDA()
+        for chunk in CSVDataIngestor().ingest_chunks(self.csv_path, chunk_rows=2):
+            accumulator.update(chunk)
+        streamed = accumulator.result()
+
+        self.assertEqual(tuple(streamed["shape"]), tuple(eda["shape"]))
+        self.assertEqual(streamed["missing_values"], eda["missing_values"])
+        for stat in ["count", "mean", "std", "min", "max"]:
+            self.assertAlmostEqual(streamed["summary"]["SalePrice"][stat], eda["summary"]["SalePrice"][stat])
+        for stat in ["count", "unique", "top", "freq"]:
+            self.assertEqual(streamed["summary"]["MS Zoning"][stat], eda["summary"]["MS Zoning"][stat])
+
+    def test_profile_matches_describe(self):
+        df = self.sample_data.assign(
+            Sold=pd.to_datetime(["2010-05-01", "2010-06-15", None, "2009-12-31", "2010-01-02"]),
+            Paved=[True, False, True, True, True],
+        )
+        profile = profile_dataframe(df, max_workers=2)
+        expected = df.describe(include="all").fillna("").to_dict()
+
+        self.assertEqual(profile["missing_values"], df.isnull().sum().to_dict())
+        self.assertEqual(list(profile["summary"]["SalePrice"]), list(expected["SalePrice"]))
+        for column in df.columns:
+            for stat, value in expected[column].items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(profile["summary"][column][stat], value)
+                else:
+                    self.assertEqual(profile["summary"][column][stat], value)
+
+    def test_zip_reads_only_archive_members(self):
+        df = DataIngestorFactory.get_data_ingestor(".zip").ingest(self.zip_path)
+        self.assertEqual(len(df), 2 * len(self.sample_data))
+        self.assertEqual(sorted(df["__source_file__"].unique()), ["2023/feb.csv", "2023/jan.csv"])
+
+    def test_zip_member_pattern(self):
+        df = ZipDataIngestor(member_pattern="jan*.csv").ingest(self.zip_path)
+        self.assertEqual(df["__source_file__"].unique().tolist(), ["2023/jan.csv"])
+
+        with self.assertRaises(FileNotFoundError):
+            ZipDataIngestor(member_pattern="*.xlsx").ingest(self.zip_path)
+
+    def test_zip_chunks(self):
+        chunks = list(ZipDataIngestor().ingest_chunks(self.zip_path, chunk_rows=3))
+        self.assertEqual([len(c) for c in chunks], [3, 2, 3, 2])
+        self.assertEqual(chunks[-1]["__source_file__"].iloc[0], "2023/feb.csv")
+
+    def test_zip_parallel_reconciles_schemas(self):
+        zip_path = os.path.join(self.temp_dir.name, "drift.zip")
+        with zipfile.ZipFile(zip_path, "w") as zipf:
+            zipf.writestr("a.csv", "id,fare\n1,10\n2,12\n")
+            zipf.writestr("b.csv", "id,fare,tip\n3,9.5,1.0\n")
+
+        ingestor = ZipDataIngestor(max_workers=2)
+        ingestor.PARALLEL_MIN_BYTES = 0
+        df = ingestor.ingest(zip_path)
+
+        self.assertEqual(list(df.columns), ["id", "fare", "__source_file__", "tip"])
+        self.assertEqual(df["fare"].tolist(), [10.0, 12.0, 9.5])
+        self.assertEqual(str(df["fare"].dtype), "float64")
+        self.assertTrue(df["tip"].iloc[:2].isnull().all())
+
+    def test_zip_partitioned_output(self):
+        output_dir = os.path.join(self.temp_dir.name, "partitions")
+        paths = ZipDataIngestor().ingest_partitioned(self.zip_path, output_dir)
+
+        self.assertEqual([os.path.basename(p) for p in paths], ["2023_jan.parquet", "2023_feb.parquet"])
+        self.assertEqual(len(ParquetDataIngestor().ingest(paths[0])), len(self.sample_data))
+
+    def test_optimize_dtypes(self):
+        df = pd.DataFrame({
+            "small_int": [1, 2, 3, 4] * 50,
+            "big_int": [2 ** 40, 1, 2, 3] * 50,
+            "exact_float": [0.5, 1.25, None, 2.0] * 50,
+            "precise_float": [0.1, 0.2, 0.3, 0.4] * 50,
+            "zoning": ["RL", "RM", "RL", None] * 50,
+            "unique_text": [f"id-{i}" for i in range(200)],
+        })
+        optimized, report = optimize_dtypes(df)
+
+        self.assertEqual(str(optimized["small_int"].dtype), "int8")
+        self.assertEqual(str(optimized["big_int"].dtype), "int64")
+        self.assertEqual(str(optimized["exact_float"].dtype), "float32")
+        self.assertEqual(str(optimized["precise_float"].dtype), "float64")
+        self.assertEqual(str(optimized["zoning"].dtype), "category")
+        self.assertEqual(str(optimized["unique_text"].dtype), "object")
+        self.assertEqual(optimized["small_int"].tolist(), df["small_int"].tolist())
+        self.assertLess(report["after_bytes"], report["before_bytes"])
+        self.assertEqual(report["converted"]["small_int"], "int64 -> int8")
+        # The caller's frame is left untouched
+        self.assertEqual(str(df["small_int"].dtype), "int64")
+
+    def test_stored_schema_replaces_inference(self):
+        df = self.sample_data.assign(**{"Sold": ["2010-05-01", "2010-06-15", None, "2009-12-31", "2010-01-02"]})
+        df, _ = optimize_dtypes(df.astype({"MS Zoning": "category"}))
+        schema = infer_schema(df)
+
+        self.assertEqual(schema["datetime_formats"], {"Sold": "%Y-%m-%d"})
+        self.assertEqual(schema["categories"], {"MS Zoning": ["RL", "RM"]})
+        self.assertEqual(schema["dtypes"]["Lot Area"], "int16")
+
+        csv_path = os.path.join(self.temp_dir.name, "typed.csv")
+        parquet_path = os.path.join(self.temp_dir.name, "typed.parquet")
+        df.to_csv(csv_path, index=False)
+        write_processed_dataset(df, parquet_path)
+
+        for loaded in [
+            CSVDataIngestor(engine="pyarrow", schema=schema).ingest(csv_path),
+            CSVDataIngestor(engine="c", schema=schema).ingest(csv_path),
+            ParquetDataIngestor(schema=schema).ingest(parquet_path),
+        ]:
+            self.assertEqual(str(loaded["Lot Area"].dtype), "int16")
+            self.assertEqual(loaded["MS Zoning"].cat.categories.tolist(), ["RL", "RM"])
+            self.assertEqual(str(loaded["Sold"].dtype), "datetime64[ns]")
+            self.assertTrue(pd.isnull(loaded["Sold"].iloc[2]))
+
+        # Category levels survive even when a projection or chunk lacks some of them
+        chunks = list(ParquetDataIngestor(schema=schema).ingest_chunks(parquet_path, chunk_rows=2))
+        self.assertEqual(chunks[1]["MS Zoning"].cat.categories.tolist(), ["RL", "RM"])
+
+    def test_datetime_formats_inferred(self):
+        df = pd.DataFrame({
+            "day_first": ["13/01/2020", "31/12/2020", None],
+            "timestamp": ["2020-01-13 08:30:00", "2020-12-31 23:59:59", "2021-02-01 00:00:00"],
+            "year": ["2010", "2011", "2012"],
+            "code": ["A1", "B2", "C3"],
+        })
+        self.assertEqual(infer_schema(df)["datetime_formats"], {
+            "day_first": "%d/%m/%Y", "timestamp": "%Y-%m-%d %H:%M:%S"
+        })
+
+    def _write_workbook(self, name):
+        workbook_path = os.path.join(self.temp_dir.name, name)
+        with pd.ExcelWriter(workbook_path) as writer:
+            self.sample_data.to_excel(writer, sheet_name="houses", index=False)
+            pd.DataFrame({"month": ["jan", "feb"], "sales": [3, 4]}).to_excel(writer, sheet_name="sales", index=False)
+        return workbook_path
+
+    def test_excel_conversion_is_cached(self):
+        workbook_path = self._write_workbook("cached.xlsx")
+        cache_dir = os.path.join(self.temp_dir.name, "excel_cache")
+
+        first = ExcelDataIngestor(cache_dir=cache_dir).ingest(workbook_path)
+        pd.testing.assert_frame_equal(first, self.sample_data, check_dtype=False)
+
+        # The second ingest must come from the converted sheets, not openpyxl
+        with mock.patch("pandas.read_excel", side_effect=AssertionError("workbook re-parsed")):
+            second = ExcelDataIngestor(cache_dir=cache_dir, sheet_name="sales").ingest(workbook_path)
+        self.assertEqual(second["sales"].tolist(), [3, 4])
+
+    def test_excel_sheets_convert_concurrently(self):
+        workbook_path = self._write_workbook("parallel.xlsx")
+        cache_dir = os.path.join(self.temp_dir.name, "excel_cache_parallel")
+
+        sheet_paths = ExcelDataIngestor(cache_dir=cache_dir, max_workers=2).convert(workbook_path)
+        self.assertEqual(list(sheet_paths), ["houses", "sales"])
+        self.assertEqual(len(ParquetDataIngestor().ingest(sheet_paths["houses"])), len(self.sample_data))
+
+    def test_excel_sheet_index_out_of_range(self):
+        workbook_path = self._write_workbook("index.xlsx")
+        cache_dir = os.path.join(self.temp_dir.name, "excel_cache_index")
+
+        self.assertEqual(ExcelDataIngestor(cache_dir=cache_dir, sheet_name=1).ingest(workbook_path)["sales"].tolist(), [3, 4])
+        with self.assertRaisesRegex(ValueError, "Sheet 2 not found"):
+            ExcelDataIngestor(cache_dir=cache_dir, sheet_name=2).ingest(workbook_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,293 @@
+# backend/tests/test_plot_aggregates.py
+# python -m unittest tests.test_plot_aggregates
+
+import os
+import base64
+import unittest
+from unittest import mock
+import tempfile
+import mongomock
+import numpy as np
+import pandas as pd
+from flask import Flask
+from utils.db import Database
+from core.src.ingest_data import infer_schema
+from utils.plot_aggregates import (
+    build_plot_aggregates, precompute_plot_aggregates, load_plot_aggregates, box_stats, kde, sample_rows,
+    column_correlation, aggregates_version, histogram, CorrelationAccumulator, MAX_HISTOGRAM_BINS
+)
+
+
+def decode_array(value):
+    """A figure array as numpy, whether sent as a list or as a typed array (bdata)."""
+    if isinstance(value, dict):
+        array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=value["dtype"])
+        return array.reshape([int(n) for n in value["shape"].split(",")]) if "shape" in value else array
+    return np.asarray(value)
+
+
+class TestPlotAggregates(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_client = mongomock.MongoClient()
+        Database._client = cls.mock_client
+        Database._db = cls.mock_client["automl_test"]
+
+        rng = np.random.default_rng(0)
+        n = 5000
+        cls.data = pd.DataFrame({
+            "Lot Area": rng.integers(1000, 20000, n),
+            "SalePrice": rng.lognormal(12, 0.4, n),
+            "MS Zoning": pd.Categorical(rng.choice(["RL", "RM", "FV"], n)),
+            "Central Air": rng.random(n) < 0.9,
+        })
+        cls.data["Gr Liv Area"] = cls.data["SalePrice"] / 100 + rng.normal(0, 50, n)
+        cls.data.loc[::7, "SalePrice"] = np.nan
+        cls.data.loc[::11, "Gr Liv Area"] = np.nan
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.temp_dir.name, "dataset.parquet")
+        cls.data.to_parquet(cls.path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_correlation_matches_pandas(self):
+        accumulator = CorrelationAccumulator(["Lot Area", "SalePrice", "Central Air", "Gr Liv Area"])
+        for start in range(0, len(self.data), 1024):
+            accumulator.update(self.data.iloc[start:start + 1024])
+        expected = self.data.corr(numeric_only=True)
+        pd.testing.assert_frame_equal(accumulator.result(), expected.loc[accumulator.columns, accumulator.columns])
+
+    def test_column_correlation_matches_pandas(self):
+        columns = ["Lot Area", "SalePrice", "Central Air", "Gr Liv Area"]
+        row = column_correlation(self.data, "SalePrice", columns)
+        expected = self.data.corr(numeric_only=True)["SalePrice"]
+        pd.testing.assert_series_equal(row, expected.loc[columns], check_exact=False, rtol=1e-12)
+
+    def test_histogram_matches_numpy_auto_bins(self):
+        values = self.data["SalePrice"].dropna().to_numpy()
+        result = histogram(values)
+        counts, edges = np.histogram(values, bins="auto")
+
+        np.testing.assert_array_equal(result["counts"], counts)
+        np.testing.assert_allclose(result["edges"], edges)
+
+    def test_histogram_with_extreme_outlier(self):
+        # "auto" alone would ask for about 1e10 bins here
+        values = np.append(np.random.default_rng(0).random(1_000_000), 1e9)
+        result = histogram(values)
+
+        self.assertEqual(len(result["counts"]), MAX_HISTOGRAM_BINS)
+        self.assertEqual(sum(result["counts"]), values.size)
+        self.assertEqual(result["edges"][-1], 1e9)
+
+    def test_box_stats_match_numpy(self):
+        values = self.data["SalePrice"].dropna().to_numpy()
+        box = box_stats(values)
+        q1, q3 = np.percentile(values, [25, 75])
+        upper = q3 + 1.5 * (q3 - q1)
+
+        self.assertAlmostEqual(box["q1"], q1)
+        self.assertEqual(box["upperfence"], values[values <= upper].max())
+        self.assertEqual(box["outlier_count"], int(((values > upper) | (values < q1 - 1.5 * (q3 - q1))).sum()))
+
+    def test_kde_matches_direct_estimate(self):
+        values = self.data["SalePrice"].dropna().to_numpy()
+        curve = kde(values)
+        x, bandwidth = np.array(curve["x"]), curve["bandwidth"]
+        direct = np.exp(-0.5 * ((x[:, None] - values[None, :]) / bandwidth) ** 2).sum(axis=1)
+        direct /= values.size * bandwidth * np.sqrt(2 * np.pi)
+
+        np.testing.assert_allclose(curve["density"], direct, atol=1e-3 * direct.max())
+        self.assertAlmostEqual(np.trapz(curve["density"], x), 1.0, places=2)
+
+    def test_stratified_sample_keeps_extremes(self):
+        columns = ["Lot Area", "SalePrice"]
+        rows = sample_rows(self.data, columns, 500)
+
+        self.assertLessEqual(len(rows), 500 + 2 * len(columns))
+        np.testing.assert_array_equal(rows, sample_rows(self.data, columns, 500))
+        sample = self.data.iloc[rows]
+        for column in columns:
+            self.assertEqual(sample[column].max(), self.data[column].max())
+            self.assertEqual(sample[column].min(), self.data[column].min())
+        self.assertEqual(len(sample_rows(self.data, columns, len(self.data))), len(self.data))
+
+    def test_build_aggregates(self):
+        aggregates = build_plot_aggregates(self.path)
+        price = aggregates["columns"]["SalePrice"]
+
+        self.assertEqual(sum(price["histogram"]["counts"]), self.data["SalePrice"].count())
+        self.assertEqual(dict(aggregates["missing"]), self.data.isnull().sum().to_dict())
+        self.assertEqual(aggregates["columns"]["MS Zoning"]["value_counts"]["unique"], 3)
+        self.assertEqual(aggregates["correlation"]["bool_columns"], ["Central Air"])
+
+    def test_build_aggregates_applies_schema(self):
+        # Zoning stored as codes; the schema says they are category levels
+        data = self.data.assign(**{"MS Zoning": self.data["MS Zoning"].cat.codes.astype("int64")})
+        path = os.path.join(self.temp_dir.name, "coded.parquet")
+        data.to_parquet(path, index=False)
+        schema = infer_schema(data.assign(**{"MS Zoning": pd.Categorical(data["MS Zoning"])}))
+
+        self.assertIn("MS Zoning", build_plot_aggregates(path)["correlation"]["columns"])
+        aggregates = build_plot_aggregates(path, schema)
+        self.assertNotIn("MS Zoning", aggregates["correlation"]["columns"])
+        self.assertEqual(aggregates["columns"]["MS Zoning"]["value_counts"]["unique"], 3)
+
+    def test_correlation_stored_in_row_blocks(self):
+        with mock.patch("utils.plot_aggregates.CORRELATION_BLOCK_CELLS", 8):
+            version = precompute_plot_aggregates(self.path)
+        blocks = Database.get_collection("plot_aggregates").count_documents(
+            {"version": version, "kind": "correlation_rows"})
+        self.assertEqual(blocks, 2)
+
+        stored = load_plot_aggregates(version, "correlation")
+        expected = build_plot_aggregates(self.path)["correlation"]
+        self.assertEqual(stored["columns"], expected["columns"])
+        np.testing.assert_allclose(stored["matrix"], expected["matrix"])
+        Database.get_collection("plot_aggregates").delete_many({"version": version})
+
+    def test_plots_served_from_aggregates(self):
+        from routes.eda_routes import eda_bp, eda_controller
+        version = precompute_plot_aggregates(self.path)
+        self.assertIsNotNone(load_plot_aggregates(version, "column", "SalePrice"))
+        dataset_id = eda_controller.datasets_collection.insert_one({
+            "dataset_id": "agg", "processed_file_path": self.path
+        }).inserted_id
+
+        app = Flask(__name__)
+        app.register_blueprint(eda_bp)
+        with app.test_client() as client:
+            response = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "boxplot", "column": "SalePrice"
+            })
+            self.assertEqual(response.status_code, 200)
+            box = response.get_json()["data"][0]
+            self.assertEqual(box["type"], "box")
+            self.assertNotIn("y", box)
+
+            response = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "correlation_top_n", "column": "SalePrice", "top_n": 1
+            })
+            self.assertEqual(response.get_json()["data"][0]["y"], ["Gr Liv Area"])
+
+    def test_plots_load_only_their_columns(self):
+        from routes.eda_routes import eda_controller
+        dataset = {"_id": "projected", "processed_file_path": self.path}
+
+        self.assertEqual(eda_controller._plot_columns(dataset, "violin", "SalePrice", ""), ["SalePrice"])
+        self.assertEqual(eda_controller._plot_columns(dataset, "scatter", "Lot Area", "Unknown"), ["Lot Area"])
+        self.assertEqual(eda_controller._plot_columns(dataset, "pairplot", "", ""),
+                         ["Lot Area", "SalePrice", "Gr Liv Area"])
+        self.assertEqual(eda_controller._plot_columns(dataset, "heatmap", "", ""),
+                         ["Lot Area", "SalePrice", "Central Air", "Gr Liv Area"])
+        pd.testing.assert_series_equal(eda_controller._missing_counts(dataset), self.data.isnull().sum())
+
+        df, err = eda_controller._load_dataset_df(dataset, ["SalePrice"])
+        self.assertIsNone(err)
+        self.assertEqual(df.columns.tolist(), ["SalePrice"])
+
+    def test_raw_plots_are_summarized(self):
+        from routes.eda_routes import eda_bp, eda_controller
+        path = os.path.join(self.temp_dir.name, "dataset.csv")
+        self.data.to_csv(path, index=False)
+        dataset_id = eda_controller.datasets_collection.insert_one({
+            "dataset_id": "raw", "processed_file_path": path
+        }).inserted_id
+
+        app = Flask(__name__)
+        app.register_blueprint(eda_bp)
+        with app.test_client() as client:
+            response = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "violin", "column": "SalePrice"
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([trace["type"] for trace in response.get_json()["data"]], ["scatter", "box", "scatter"])
+            self.assertLess(len(response.data), 100_000)
+
+            response = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "histogram", "column": "Lot Area"
+            })
+            bars = response.get_json()["data"][0]
+            self.assertEqual(sum(bars["y"]), len(self.data))
+
+            response = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "violin", "column": "MS Zoning"
+            })
+            self.assertEqual(response.status_code, 400)
+
+            with mock.patch("controllers.eda_controller.PLOT_POINT_BUDGET", 1000):
+                response = client.post("/eda_visual", json={
+                    "dataset_id": str(dataset_id), "plot_type": "scatter", "column": "Lot Area", "column2": "SalePrice"
+                })
+                sampling = response.get_json()["layout"]["meta"]["sampling"]
+                self.assertEqual(sampling["mode"], "sample")
+                self.assertEqual(sampling["rows"], self.data["SalePrice"].count())
+                self.assertAlmostEqual(sampling["sampling_ratio"], sampling["points"] / sampling["rows"], places=5)
+
+                response = client.post("/eda_visual", json={
+                    "dataset_id": str(dataset_id), "plot_type": "jointplot", "column": "Lot Area", "column2": "SalePrice"
+                })
+                trace = response.get_json()["data"][0]
+                self.assertEqual(trace["type"], "contour")
+                self.assertEqual(decode_array(trace["z"]).sum(), self.data["SalePrice"].count())
+
+    def test_raw_plots_with_extreme_outlier(self):
+        from routes.eda_routes import eda_bp, eda_controller
+        path = os.path.join(self.temp_dir.name, "outlier.csv")
+        values = np.append(np.random.default_rng(0).random(200_000), 1e9)
+        pd.DataFrame({"value": values}).to_csv(path, index=False)
+        dataset_id = eda_controller.datasets_collection.insert_one({
+            "dataset_id": "outlier", "processed_file_path": path
+        }).inserted_id
+
+        app = Flask(__name__)
+        app.register_blueprint(eda_bp)
+        with app.test_client() as client:
+            for plot_type in ["histogram", "violin"]:
+                response = client.post("/eda_visual", json={
+                    "dataset_id": str(dataset_id), "plot_type": plot_type, "column": "value"
+                })
+                self.assertEqual(response.status_code, 200)
+            bars = client.post("/eda_visual", json={
+                "dataset_id": str(dataset_id), "plot_type": "histogram", "column": "value"
+            }).get_json()["data"][0]
+            self.assertEqual(len(decode_array(bars["y"])), MAX_HISTOGRAM_BINS)
+
+    def test_correlations_cached_per_version(self):
+        from routes.eda_routes import eda_bp, eda_controller
+        from utils.plot_cache import correlation_cache
+        path = os.path.join(self.temp_dir.name, "correlation.csv")
+        self.data.to_csv(path, index=False)
+        version = aggregates_version(path)
+        dataset_id = str(eda_controller.datasets_collection.insert_one({
+            "dataset_id": "corr", "processed_file_path": path
+        }).inserted_id)
+
+        app = Flask(__name__)
+        app.register_blueprint(eda_bp)
+        with app.test_client() as client:
+            response = client.post("/eda_visual", json={
+                "dataset_id": dataset_id, "plot_type": "correlation_top_n", "column": "SalePrice", "top_n": 1
+            })
+            self.assertEqual(response.get_json()["data"][0]["y"], ["Gr Liv Area"])
+            # Only the column's row was computed
+            self.assertIsNotNone(correlation_cache.get(version, "SalePrice"))
+            self.assertIsNone(correlation_cache.get(version))
+
+            client.post("/eda_visual", json={"dataset_id": dataset_id, "plot_type": "heatmap"})
+            self.assertIsNotNone(correlation_cache.get(version))
+
+            # Served from the cached matrix without reading the dataset
+            with mock.patch.object(eda_controller, "_load_dataset_df", side_effect=AssertionError):
+                response = client.post("/eda_visual", json={
+                    "dataset_id": dataset_id, "plot_type": "correlation_top_n", "column": "Gr Liv Area", "top_n": 1
+                })
+            self.assertEqual(response.get_json()["data"][0]["y"], ["SalePrice"])
+
+
+if __name__ == "__main__":
+    unittest.main()
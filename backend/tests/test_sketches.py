@@ -0,0 +1,76 @@
+# backend/tests/test_sketches.py
+# python -m unittest tests.test_sketches
+
+import json
+import unittest
+import numpy as np
+import pandas as pd
+from utils.sketches import DatasetSketch
+
+
+class TestDatasetSketch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n = 200_000
+        cls.data = pd.DataFrame({
+            "SalePrice": rng.lognormal(12, 0.4, n),
+            "Lot Area": rng.integers(0, 20_000, n).astype("int32"),
+            "Neighborhood": pd.Categorical(rng.choice(["NAmes", "CollgCr", "OldTown", "Edwards"], n,
+                                                      p=[0.5, 0.3, 0.15, 0.05])),
+        })
+        cls.data.loc[::20, "SalePrice"] = np.nan
+
+    def sketch(self, df, chunk_rows=25_000):
+        sketch = DatasetSketch()
+        for start in range(0, len(df), chunk_rows):
+            sketch.update(df.iloc[start:start + chunk_rows])
+        return sketch
+
+    def test_estimates_are_close(self):
+        summary = self.sketch(self.data).summary()
+        prices = self.data["SalePrice"]
+
+        self.assertEqual(summary["SalePrice"]["count"], prices.count())
+        self.assertAlmostEqual(summary["SalePrice"]["mean"], prices.mean(), places=4)
+        self.assertEqual(summary["SalePrice"]["max"], prices.max())
+        for stat, q in [("25%", 0.25), ("50%", 0.5), ("75%", 0.75)]:
+            # Rank error, not value error, is what the sketch bounds
+            rank = (prices < summary["SalePrice"][stat]).mean() / prices.notnull().mean()
+            self.assertAlmostEqual(rank, q, delta=0.02)
+
+        self.assertAlmostEqual(summary["Lot Area"]["unique"], self.data["Lot Area"].nunique(),
+                               delta=0.05 * self.data["Lot Area"].nunique())
+        self.assertEqual(summary["Neighborhood"]["unique"], 4)
+        self.assertEqual(summary["Neighborhood"]["top"], "NAmes")
+
+    def test_merge_matches_single_pass(self):
+        half = len(self.data) // 2
+        merged = self.sketch(self.data.iloc[:half]).merge(self.sketch(self.data.iloc[half:]))
+        single = self.sketch(self.data).summary()
+
+        for column, summary in merged.summary().items():
+            self.assertEqual(summary["count"], single[column]["count"])
+            self.assertEqual(summary["unique"], single[column]["unique"])
+        self.assertEqual(merged.summary()["Neighborhood"]["frequent"], single["Neighborhood"]["frequent"])
+        self.assertAlmostEqual(merged.summary()["SalePrice"]["50%"], single["SalePrice"]["50%"],
+                               delta=0.02 * single["SalePrice"]["50%"])
+
+    def test_serialization_round_trip(self):
+        sketch = self.sketch(self.data)
+        restored = DatasetSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        self.assertEqual(restored.summary(), sketch.summary())
+        self.assertEqual(restored.outlier_bounds(), sketch.outlier_bounds())
+
+    def test_outlier_bounds_match_iqr_fences(self):
+        bounds = self.sketch(self.data).outlier_bounds()
+        q1, q3 = self.data["Lot Area"].quantile([0.25, 0.75])
+
+        self.assertNotIn("Neighborhood", bounds)
+        self.assertAlmostEqual(bounds["Lot Area"]["lower"], q1 - 1.5 * (q3 - q1), delta=0.05 * (q3 - q1))
+        self.assertAlmostEqual(bounds["Lot Area"]["upper"], q3 + 1.5 * (q3 - q1), delta=0.05 * (q3 - q1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 # python -m unittest tests.test_upload
 
 import os
+import time
 import unittest
 import shutil
 import pandas as pd
@@ -10,6 +11,8 @@ import tempfile
 import zipfile
 from app import app
 from utils.db import Database
+from unittest import mock
+from controllers.upload_controller import should_stream, _parts_dir, _part_path, create_upload_job, update_upload_job
 from werkzeug.datastructures import FileStorage
 
 
@@ -38,12 +41,27 @@ class TestUploadFunctions(unittest.TestCase):
 
         print(f"✅ Test setup completed. Sample file created at {cls.test_file_path}")
 
+    @staticmethod
+    def clear_datasets():
+        """Remove test_user's datasets with their content-hash entries, EDA profiles and sketches, so uploads are not deduplicated across tests or runs."""
+        db = Database.get_database()
+        datasets = list(db["datasets"].find({"user_id": "test_user"}, {"dataset_id": 1, "eda_profile_id": 1}))
+        profile_ids = [dataset.get("eda_profile_id") for dataset in datasets]
+        db["content_index"].delete_many({"dataset_id": {"$in": [dataset["dataset_id"] for dataset in datasets]}})
+        db["eda_profiles"].delete_many({"profile_id": {"$in": profile_ids}})
+        db["dataset_sketches"].delete_many({"profile_id": {"$in": profile_ids}})
+        db["datasets"].delete_many({"user_id": "test_user"})
+
+    def setUp(self):
+        self.clear_datasets()
+
     @classmethod
     def tearDownClass(cls):
         # Clean up MongoDB test data
         db = Database.get_database()
         db["files"].delete_many({"user_id": "test_user"})
         db["eda_results"].delete_many({"user_id": "test_user"})
+        cls.clear_datasets()
         print(f"✅ MongoDB test data cleaned up for user test_user")
 
         # Close the MongoDB client
@@ -126,6 +144,17 @@ class TestUploadFunctions(unittest.TestCase):
             self.assertIn("Multiple CSV files found", response.get_data(as_text=True))
             print(f"✅ Multiple CSV files in ZIP test passed for {zip_file_path}")
 
+    def test_zip_streams_by_uncompressed_size(self):
+        # A highly compressible archive is small on disk but large once read
+        zip_file_path = os.path.join(self.test_user_dir, "compressible.zip")
+        with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr("data.csv", "a,b\n" + "1,2\n" * 250_000)
+
+        with mock.patch("controllers.upload_controller.STREAMING_THRESHOLD_BYTES", 500_000):
+            self.assertLess(os.path.getsize(zip_file_path), 500_000)
+            self.assertTrue(should_stream(zip_file_path))
+            self.assertFalse(should_stream(self.test_file_path))
+
     def test_large_file_upload(self):
         # Simulate a large CSV file (1 million rows)
         large_file_path = os.path.join(self.test_user_dir, "large_file.csv")
@@ -151,6 +180,106 @@ class TestUploadFunctions(unittest.TestCase):
             self.assertEqual(response_data["message"], "File uploaded and analyzed successfully")
             print(f"✅ Successful file upload test passed for {self.test_file_path}")
 
+    def test_duplicate_upload_is_deduplicated(self):
+        with app.test_client() as client:
+            first = client.post("/upload_file", data={
+                "file": self.simulate_file_upload(self.test_file_path), "user_id": "test_user"
+            })
+            second = client.post("/upload_file", data={
+                "file": self.simulate_file_upload(self.test_file_path), "user_id": "test_user"
+            })
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(second.status_code, 200)
+
+            first_data, second_data = first.get_json(), second.get_json()
+            self.assertTrue(second_data["deduplicated"])
+            self.assertNotEqual(first_data["dataset_id"], second_data["dataset_id"])
+
+            datasets = Database.get_collection("datasets")
+            original = datasets.find_one({"dataset_id": first_data["dataset_id"]})
+            duplicate = datasets.find_one({"dataset_id": second_data["dataset_id"]})
+            self.assertEqual(duplicate["processed_file_path"], original["processed_file_path"])
+            self.assertEqual(duplicate["deduplicated_from"], original["dataset_id"])
+            # Only the processed data is shared; each upload keeps its own raw file
+            self.assertNotEqual(second_data["file_path"], first_data["file_path"])
+            self.assertEqual(duplicate["eda"]["file_path"], second_data["file_path"])
+            self.assertTrue(os.path.exists(second_data["file_path"]))
+            print(f"✅ Duplicate upload reused dataset {original['dataset_id']}")
+
+    def test_chunked_upload_resumes_missing_parts(self):
+        with open(self.test_file_path, "rb") as f:
+            content = f.read()
+        parts = [content[:20], content[20:]]
+
+        with app.test_client() as client:
+            response = client.post("/uploads/initiate", json={
+                "filename": "chunked.csv", "total_parts": 2, "user_id": "test_user"
+            })
+            self.assertEqual(response.status_code, 201)
+            upload_id = response.get_json()["upload_id"]
+
+            # Only the first part arrives before the "interruption"
+            client.put(f"/uploads/{upload_id}/parts/1", data=parts[0])
+            self.assertEqual(client.post(f"/uploads/{upload_id}/complete").status_code, 400)
+            self.assertEqual(client.get(f"/uploads/{upload_id}").get_json()["missing_parts"], [2])
+
+            client.put(f"/uploads/{upload_id}/parts/2", data=parts[1])
+            response = client.post(f"/uploads/{upload_id}/complete")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["message"], "File uploaded and analyzed successfully")
+            print(f"✅ Chunked upload test passed for {upload_id}")
+
+    def test_chunked_upload_with_part_lost_on_disk(self):
+        with open(self.test_file_path, "rb") as f:
+            content = f.read()
+
+        with app.test_client() as client:
+            upload_id = client.post("/uploads/initiate", json={
+                "filename": "lost_part.csv", "total_parts": 2, "user_id": "test_user"
+            }).get_json()["upload_id"]
+            client.put(f"/uploads/{upload_id}/parts/1", data=content[:20])
+            client.put(f"/uploads/{upload_id}/parts/2", data=content[20:])
+            os.remove(_part_path(_parts_dir("test_user", upload_id), 2))
+
+            # The lost part is reported as missing and can be sent again
+            self.assertEqual(client.post(f"/uploads/{upload_id}/complete").status_code, 400)
+            self.assertEqual(client.get(f"/uploads/{upload_id}").get_json()["missing_parts"], [2])
+            client.put(f"/uploads/{upload_id}/parts/2", data=content[20:])
+            self.assertEqual(client.post(f"/uploads/{upload_id}/complete").status_code, 200)
+            print(f"✅ Lost part test passed for {upload_id}")
+
+    def test_async_upload_reports_status(self):
+        with app.test_client() as client:
+            with open(self.test_file_path, "rb") as f:
+                response = client.post("/upload_file", data={
+                    "file": (f, "async.csv"), "user_id": "test_user", "async": "true"
+                }, content_type="multipart/form-data")
+            self.assertEqual(response.status_code, 202)
+            body = response.get_json()
+            self.assertEqual(body["status"], "processing")
+
+            # Poll until the background worker finishes
+            for _ in range(100):
+                job = client.get(body["status_url"]).get_json()
+                if job["status"] != "processing":
+                    break
+                time.sleep(0.1)
+            self.assertEqual(job["status"], "completed")
+            self.assertEqual(job["result"]["dataset_id"], body["dataset_id"])
+            self.assertEqual(client.get("/upload_status/unknown").status_code, 404)
+            print(f"✅ Async upload test passed for dataset {body['dataset_id']}")
+
+    def test_lost_upload_job_reported_failed(self):
+        # A job whose process died stops refreshing its heartbeat
+        create_upload_job("lost-job", "file", "test_user", "lost.csv")
+        update_upload_job("lost-job", heartbeat_at="2000-01-01T00:00:00")
+
+        with app.test_client() as client:
+            job = client.get("/upload_status/lost-job").get_json()
+            self.assertEqual(job["status"], "failed")
+            self.assertIn("interrupted", job["error"])
+            print("✅ Lost upload job test passed")
+
 
 if __name__ == "__main__":
     unittest.main()
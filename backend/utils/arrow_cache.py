@@ -0,0 +1,166 @@
+import os
+import glob
+import shutil
+import hashlib
+import tempfile
+import pyarrow as pa
+
+# Where materialized datasets are kept; shared by every worker process on the host
+ARROW_CACHE_DIR = os.environ.get("ARROW_CACHE_DIR", os.path.join(os.getcwd(), "uploads", "arrow_cache"))
+# Disk budget for the cache; least recently used datasets are evicted beyond it (0 disables caching)
+ARROW_CACHE_MAX_BYTES = int(float(os.environ.get("ARROW_CACHE_MAX_MB", 2048)) * 1024 * 1024)
+
+
+class ArrowDatasetCache:
+    """
+    Disk cache of datasets as uncompressed Arrow IPC (Feather v2) files.
+
+    A dataset is materialized once and then memory-mapped by every process that
+    reads it, so worker processes share the operating system's page cache instead
+    of each holding a private parsed copy. Entries are keyed by the source file's
+    path and a version derived from its size and modification time, so datasets
+    that share a processed file (deduplicated uploads) share one entry, and
+    replacing the source invalidates it. When the cache grows past max_bytes, the
+    least recently used entries are deleted; processes that still have one mapped
+    keep reading it safely.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Parameters:
+        cache_dir (str): Cache directory (default: ARROW_CACHE_DIR).
+        max_bytes (int): Disk budget in bytes (default: ARROW_CACHE_MAX_BYTES).
+        """
+        self.cache_dir = cache_dir or ARROW_CACHE_DIR
+        self.max_bytes = ARROW_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    @staticmethod
+    def version(source_path: str) -> str:
+        """Identifies the content of source_path by its path, size and modification time."""
+        stat = os.stat(source_path)
+        key = f"{os.path.abspath(source_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def _entry_dir(self, source_path: str) -> str:
+        key = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key)
+
+    def _entry_path(self, source_path: str) -> str:
+        return os.path.join(self._entry_dir(source_path), f"{self.version(source_path)}.arrow")
+
+    def contains(self, source_path: str) -> bool:
+        """Whether the current version of the source file is already materialized."""
+        return self.max_bytes > 0 and os.path.exists(self._entry_path(source_path))
+
+    def get_table(self, source_path: str, load, columns: list = None) -> pa.Table:
+        """
+        Returns the dataset as a memory-mapped Arrow table.
+
+        Parameters:
+        source_path (str): File the dataset is loaded from; its path and version key the entry.
+        load (callable): Returns the full dataset as a pa.Table on a cache miss.
+        columns (list): Only these columns are returned (None returns all).
+
+        Returns:
+        pa.Table: The dataset, backed by the mapped file rather than process memory.
+        """
+        if self.max_bytes <= 0:
+            table = load()
+            return table.select(columns) if columns else table
+
+        path = self._entry_path(source_path)
+        for _ in range(2):
+            if not os.path.exists(path):
+                self._materialize(source_path, path, load)
+            try:
+                table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+                break
+            except FileNotFoundError:
+                # Evicted by another process between the check and the open
+                continue
+        else:
+            raise RuntimeError(f"Cached dataset {source_path} was evicted while being read")
+
+        self._touch(path)
+        return table.select(columns) if columns else table
+
+    def get_dataframe(self, source_path: str, load, columns: list = None, zero_copy: bool = False):
+        """
+        Returns the dataset as a DataFrame read from the cache.
+
+        With zero_copy, numeric columns without missing values are read-only views
+        of the mapped file rather than copies; use it only for read-only work.
+        """
+        table = self.get_table(source_path, load, columns)
+        if zero_copy:
+            return table.to_pandas(split_blocks=True)
+        return table.to_pandas()
+
+    def _materialize(self, source_path: str, path: str, load) -> None:
+        table = load()
+        entry_dir = os.path.dirname(path)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        # Write privately and rename into place, so readers never map a partial file
+        fd, tmp_path = tempfile.mkstemp(prefix=".writing-", suffix=".arrow", dir=entry_dir)
+        try:
+            with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"✅ Dataset {source_path} materialized in Arrow cache: {path}")
+
+        # Older versions of this dataset can no longer be requested
+        for stale in glob.glob(os.path.join(entry_dir, "*.arrow")):
+            if stale != path:
+                os.remove(stale)
+        self.evict(keep=path)
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        # The modification time doubles as the last-access time for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def entries(self) -> list:
+        """Cached files as (path, size, last access), least recently used first."""
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, "*", "*.arrow")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self, keep: str = None) -> list:
+        """Deletes least recently used entries until the cache fits its budget. Returns the removed paths."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.append(path)
+        if removed:
+            print(f"✅ Evicted {len(removed)} dataset(s) from Arrow cache")
+        return removed
+
+    def invalidate(self, source_path: str) -> None:
+        """Drops every cached version of a source file."""
+        shutil.rmtree(self._entry_dir(source_path), ignore_errors=True)
+
+
+# Process-wide cache instance used by the EDA controller and the ingestion step
+dataset_cache = ArrowDatasetCache()
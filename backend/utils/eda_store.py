@@ -0,0 +1,147 @@
+import os
+import json
+import zlib
+import pyarrow as pa
+from bson.binary import Binary
+from utils.db import Database
+
+# EDA sections keyed by column; they are stored in blocks so one column can be read on its own
+COLUMN_SECTIONS = ["dtypes", "missing_values", "summary"]
+# EDA sections moved out of the dataset document into the eda_profiles collection
+PROFILE_SECTIONS = ["columns", "head", "memory_usage"] + COLUMN_SECTIONS
+# Columns per stored block of a column section
+EDA_COLUMN_BLOCK = int(os.environ.get("EDA_COLUMN_BLOCK", 256))
+# zstd through pyarrow, which the app already depends on; zlib if this pyarrow build lacks it
+EDA_CODEC = "zstd" if pa.Codec.is_available("zstd") else "zlib"
+EDA_COMPRESSION_LEVEL = 3
+# Column sketches per stored block in the dataset_sketches collection
+SKETCH_COLUMN_BLOCK = int(os.environ.get("SKETCH_COLUMN_BLOCK", 64))
+
+
+def pack_json(value) -> dict:
+    """JSON-encode and compress a value into {codec, size, data} fields for a MongoDB document."""
+    raw = json.dumps(value, default=str).encode("utf-8")
+    if EDA_CODEC == "zstd":
+        data = pa.Codec("zstd", compression_level=EDA_COMPRESSION_LEVEL).compress(raw, asbytes=True)
+    else:
+        data = zlib.compress(raw, EDA_COMPRESSION_LEVEL)
+    return {"codec": EDA_CODEC, "size": len(raw), "data": Binary(data)}
+
+
+def unpack_json(block: dict):
+    """The value stored by pack_json in block."""
+    if block["codec"] == "zstd":
+        raw = pa.Codec("zstd").decompress(bytes(block["data"]), decompressed_size=block["size"], asbytes=True)
+    else:
+        raw = zlib.decompress(bytes(block["data"]))
+    return json.loads(raw)
+
+
+def compact_eda(eda: dict) -> dict:
+    """The EDA fields kept inline on the dataset document."""
+    compact = {key: value for key, value in eda.items() if key not in PROFILE_SECTIONS}
+    if "missing_values" in eda:
+        compact["total_missing"] = int(sum(eda["missing_values"].values()))
+    if "memory_usage" in eda:
+        # Footprint totals stay inline; the per-column conversions live in the profile
+        compact["memory_usage"] = {key: value for key, value in eda["memory_usage"].items() if key != "converted"}
+    return compact
+
+
+def save_eda_profile(profile_id: str, eda: dict) -> dict:
+    """
+    Store the bulky EDA sections compressed in the eda_profiles collection, one
+    document per section (per block of EDA_COLUMN_BLOCK columns for column
+    sections), and return the compact EDA to embed in the dataset document.
+    """
+    profiles = Database.get_collection("eda_profiles")
+    profiles.create_index([("profile_id", 1), ("section", 1), ("columns", 1)])
+
+    blocks = []
+    for section in PROFILE_SECTIONS:
+        if section not in eda:
+            continue
+        if section in COLUMN_SECTIONS:
+            names = list(eda[section])
+            for start in range(0, len(names), EDA_COLUMN_BLOCK):
+                columns = names[start:start + EDA_COLUMN_BLOCK]
+                blocks.append((section, columns, {column: eda[section][column] for column in columns}))
+        else:
+            blocks.append((section, [], eda[section]))
+
+    documents = []
+    for block, (section, columns, value) in enumerate(blocks):
+        documents.append({"profile_id": profile_id, "section": section, "block": block, "columns": columns,
+                          **pack_json(value)})
+    if documents:
+        profiles.insert_many(documents)
+    print(f"✅ EDA profile stored in {len(documents)} compressed block(s) for: {profile_id}")
+    return compact_eda(eda)
+
+
+def load_eda_profile(profile_id: str, sections: list = None, columns: list = None) -> dict:
+    """
+    Read EDA sections back, decompressing only the blocks needed.
+
+    Parameters:
+    profile_id (str): Profile to read (the dataset's eda_profile_id).
+    sections (list): Sections to return (default: all of PROFILE_SECTIONS).
+    columns (list): Restrict column sections (and head rows) to these columns.
+
+    Returns:
+    dict: {section: value} for every requested section that was stored.
+    """
+    sections = sections or PROFILE_SECTIONS
+    query = {"profile_id": profile_id, "section": {"$in": sections}}
+    if columns:
+        # Row-oriented sections have no column list and are always read whole
+        query["$or"] = [{"columns": {"$in": columns}}, {"columns": []}]
+
+    result = {}
+    for block in Database.get_collection("eda_profiles").find(query, {"_id": 0}).sort("block", 1):
+        value = unpack_json(block)
+        if block["section"] in COLUMN_SECTIONS:
+            if columns:
+                value = {column: value[column] for column in columns if column in value}
+            result.setdefault(block["section"], {}).update(value)
+        else:
+            result[block["section"]] = value
+
+    if columns:
+        if "columns" in result:
+            result["columns"] = [column for column in result["columns"] if column in columns]
+        if "head" in result:
+            result["head"] = [{column: row[column] for column in columns if column in row} for row in result["head"]]
+    return result
+
+
+def delete_eda_profile(profile_id: str) -> None:
+    Database.get_collection("eda_profiles").delete_many({"profile_id": profile_id})
+
+
+def save_sketches(profile_id: str, sketches: dict) -> None:
+    """
+    Store a DatasetSketch.to_dict() compressed in the dataset_sketches collection,
+    SKETCH_COLUMN_BLOCK columns per document, under the dataset's eda_profile_id
+    so deduplicated uploads read the same copy.
+    """
+    collection = Database.get_collection("dataset_sketches")
+    collection.create_index([("profile_id", 1), ("block", 1)])
+
+    columns = sketches["columns"]
+    documents = [{"profile_id": profile_id, "block": block, **pack_json(columns[start:start + SKETCH_COLUMN_BLOCK])}
+                 for block, start in enumerate(range(0, len(columns), SKETCH_COLUMN_BLOCK))]
+    if documents:
+        collection.insert_many(documents)
+    print(f"✅ Column sketches stored in {len(documents)} compressed block(s) for: {profile_id}")
+
+
+def load_sketches(profile_id: str):
+    """The sketches stored by save_sketches, or None if there are none."""
+    blocks = Database.get_collection("dataset_sketches").find({"profile_id": profile_id}, {"_id": 0}).sort("block", 1)
+    columns = [column for block in blocks for column in unpack_json(block)]
+    return {"columns": columns} if columns else None
+
+
+def delete_sketches(profile_id: str) -> None:
+    Database.get_collection("dataset_sketches").delete_many({"profile_id": profile_id})
@@ -0,0 +1,272 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Values kept per numeric column to estimate percentiles when streaming
+PERCENTILE_SAMPLE_SIZE = 100_000
+# Distinct values tracked per non-numeric column before the rarest are pruned
+MAX_TRACKED_VALUES = 100_000
+HEAD_ROWS = 5
+
+# Frames with fewer cells than this are profiled on the calling thread
+PROFILE_PARALLEL_MIN_CELLS = 1_000_000
+PROFILE_WORKERS = int(os.environ.get("EDA_PROFILE_WORKERS", min(8, os.cpu_count() or 1)))
+
+NUMERIC_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+DATETIME_STATS = ["count", "mean", "min", "25%", "50%", "75%", "max"]
+OBJECT_STATS = ["count", "unique", "top", "freq"]
+ALL_STATS = ["count", "unique", "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def is_numeric_dtype(dtype) -> bool:
+    """Whether a column is summarized as numbers; describe() reports bools like categories."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def python_value(value):
+    """Convert numpy scalars so the result can be stored in MongoDB."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def records_for_json(df: pd.DataFrame) -> list:
+    """Rows as records with missing values replaced by empty strings."""
+    frame = df.astype(object)
+    frame = frame.where(frame.notnull(), "")
+    return [{k: python_value(v) for k, v in row.items()} for row in frame.to_dict(orient="records")]
+
+
+def _summary_rows(column_stats: list) -> list:
+    """
+    The row order DataFrame.describe(include="all") gives a summary: stat names in
+    first-seen order, taking the columns' stat lists from shortest to longest.
+    """
+    rows = []
+    for stats in sorted(column_stats, key=len):
+        rows.extend(stat for stat in stats if stat not in rows)
+    return rows
+
+
+def _profile_column(series: pd.Series) -> tuple:
+    """
+    All statistics for one column from a single extraction of its values:
+    (missing count, stat names, {stat: value}), matching Series.describe().
+    """
+    n = len(series)
+    dtype = series.dtype
+
+    if is_numeric_dtype(dtype):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values)]
+        count = values.size
+        stats = {"count": float(count)}
+        if count:
+            q25, q50, q75 = np.percentile(values, [25, 50, 75])
+            stats.update({
+                "mean": values.mean(), "std": values.std(ddof=1) if count > 1 else np.nan,
+                "min": values.min(), "25%": q25, "50%": q50, "75%": q75, "max": values.max(),
+            })
+        return n - count, NUMERIC_STATS, stats
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = series.dropna()
+        stats = {"count": len(values)}
+        if len(values):
+            q25, q50, q75 = values.quantile([0.25, 0.5, 0.75])
+            stats.update({"mean": values.mean(), "min": values.min(), "25%": q25, "50%": q50,
+                          "75%": q75, "max": values.max()})
+        return n - len(values), DATETIME_STATS, stats
+
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        described = series.describe()
+        return n - int(described["count"]), list(described.index), described.to_dict()
+
+    # Objects, categories, strings and bools: one hash pass gives every statistic
+    counts = series.value_counts()
+    if isinstance(dtype, pd.CategoricalDtype):
+        counts = counts[counts != 0]
+    count = int(counts.sum())
+    stats = {"count": count, "unique": len(counts)}
+    if len(counts):
+        stats["top"], stats["freq"] = counts.index[0], int(counts.iloc[0])
+    return n - count, OBJECT_STATS, stats
+
+
+def profile_dataframe(df: pd.DataFrame, max_workers: int = None) -> dict:
+    """
+    Profile a DataFrame in one pass per column, with columns processed in parallel.
+
+    Produces the same statistics as isnull().sum(), describe(include="all") and
+    head() combined, but each column's values are extracted once and used for
+    every statistic, percentiles use a partial sort rather than a full one, and
+    large frames are split across a thread pool (numpy releases the GIL).
+
+    Parameters:
+    df (pd.DataFrame): The data to profile.
+    max_workers (int): Threads for column profiling (default: PROFILE_WORKERS).
+
+    Returns:
+    dict: shape, columns, dtypes, missing_values, summary and head, as stored in the EDA document.
+    """
+    if df.shape[1] == 0:
+        raise ValueError("Cannot describe a DataFrame without columns")
+
+    columns = list(df.columns)
+    series = [df.iloc[:, i] for i in range(len(columns))]
+    max_workers = max_workers or PROFILE_WORKERS
+    if max_workers > 1 and len(columns) > 1 and df.size >= PROFILE_PARALLEL_MIN_CELLS:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            profiles = list(pool.map(_profile_column, series))
+    else:
+        profiles = [_profile_column(s) for s in series]
+
+    rows = _summary_rows([stats for _, stats, _ in profiles])
+    summary = {}
+    for column, (_, _, values) in zip(columns, profiles):
+        summary[column] = {}
+        for stat in rows:
+            value = values.get(stat, "")
+            summary[column][stat] = "" if pd.isnull(value) else python_value(value)
+
+    return {
+        "shape": df.shape,
+        "columns": columns,
+        "dtypes": df.dtypes.astype(str).to_dict(),
+        "missing_values": {column: int(missing) for column, (missing, _, _) in zip(columns, profiles)},
+        "summary": summary,
+        "head": records_for_json(df.head(HEAD_ROWS)),
+    }
+
+
+class StreamingEDA:
+    """
+    Accumulates the statistics generate_eda reports while a dataset is read chunk
+    by chunk, so memory stays bounded by the chunk size rather than the file size.
+
+    Counts, missing values, mean, std, min and max are exact (mean/std are merged
+    with Chan's parallel algorithm). Percentiles come from a uniform sample of
+    PERCENTILE_SAMPLE_SIZE values per column. unique/top/freq are exact unless a
+    column exceeds MAX_TRACKED_VALUES distinct values, in which case the rarest
+    values are pruned and "unique" is reported from distinct_estimates, if given
+    to result(), or as empty.
+    """
+
+    def __init__(self, random_state: int = 0):
+        self.rows = 0
+        self.columns = None
+        self.dtypes = None
+        self.head = None
+        self.missing = None
+        self._numeric = {}
+        self._counts = {}
+        self._pruned = set()
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.dtypes = chunk.dtypes.astype(str).to_dict()
+            self.head = chunk.head(HEAD_ROWS)
+            self.missing = pd.Series(0, index=chunk.columns, dtype="int64")
+
+        self.rows += len(chunk)
+        self.missing = self.missing.add(chunk.isnull().sum(), fill_value=0)
+
+        for column in self.columns:
+            if is_numeric_dtype(chunk[column].dtype):
+                self._update_numeric(column, chunk[column])
+            else:
+                self._update_counts(column, chunk[column])
+
+    def _update_numeric(self, column, values):
+        x = values.dropna().to_numpy(dtype="float64")
+        if x.size == 0:
+            return
+        mean = x.mean()
+        m2 = ((x - mean) ** 2).sum()
+        keys = self._rng.random(x.size)
+
+        state = self._numeric.get(column)
+        if state is None:
+            state = {"count": 0, "mean": 0.0, "m2": 0.0, "min": x.min(), "max": x.max(),
+                     "keys": np.empty(0), "sample": np.empty(0)}
+            self._numeric[column] = state
+
+        # Chan et al. pairwise update of count / mean / sum of squared deviations
+        total = state["count"] + x.size
+        delta = mean - state["mean"]
+        state["m2"] += m2 + delta ** 2 * state["count"] * x.size / total
+        state["mean"] += delta * x.size / total
+        state["count"] = total
+        state["min"] = min(state["min"], x.min())
+        state["max"] = max(state["max"], x.max())
+
+        # Keeping the values with the smallest random keys is a uniform sample
+        keys = np.concatenate([state["keys"], keys])
+        sample = np.concatenate([state["sample"], x])
+        if keys.size > PERCENTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, PERCENTILE_SAMPLE_SIZE)[:PERCENTILE_SAMPLE_SIZE]
+            keys, sample = keys[keep], sample[keep]
+        state["keys"], state["sample"] = keys, sample
+
+    def _update_counts(self, column, values):
+        counts = values.value_counts(dropna=True)
+        if column in self._counts:
+            counts = self._counts[column].add(counts, fill_value=0)
+        if len(counts) > MAX_TRACKED_VALUES:
+            counts = counts.nlargest(MAX_TRACKED_VALUES // 2)
+            self._pruned.add(column)
+        self._counts[column] = counts
+
+    def _column_summary(self, column, distinct_estimates: dict) -> dict:
+        non_null = int(self.rows - self.missing[column])
+        if is_numeric_dtype(self.dtypes[column]):
+            state = self._numeric.get(column)
+            if state is None:
+                return {"count": 0}
+            q25, q50, q75 = np.percentile(state["sample"], [25, 50, 75])
+            std = np.sqrt(state["m2"] / (state["count"] - 1)) if state["count"] > 1 else np.nan
+            return {
+                "count": non_null, "mean": state["mean"], "std": std, "min": state["min"],
+                "25%": q25, "50%": q50, "75%": q75, "max": state["max"],
+            }
+
+        counts = self._counts.get(column, pd.Series(dtype="int64"))
+        unique = distinct_estimates.get(column, np.nan) if column in self._pruned else len(counts)
+        summary = {"count": non_null, "unique": unique}
+        if len(counts):
+            summary["top"] = counts.idxmax()
+            summary["freq"] = counts.max()
+        return summary
+
+    def result(self, distinct_estimates: dict = None) -> dict:
+        """
+        The accumulated statistics, in the same shape generate_eda produces.
+
+        Parameters:
+        distinct_estimates (dict): Approximate distinct counts by column, used for
+            columns whose exact value counts were pruned.
+        """
+        if self.columns is None:
+            raise ValueError("No columns to parse from file")
+
+        numeric_only = all(is_numeric_dtype(dtype) for dtype in self.dtypes.values())
+        stats = NUMERIC_STATS if numeric_only else ALL_STATS
+        summary = {}
+        for column in self.columns:
+            column_summary = self._column_summary(column, distinct_estimates or {})
+            summary[column] = {}
+            for stat in stats:
+                value = column_summary.get(stat, "")
+                summary[column][stat] = "" if pd.isnull(value) else python_value(value)
+
+        return {
+            "shape": (self.rows, len(self.columns)),
+            "columns": self.columns,
+            "dtypes": self.dtypes,
+            "missing_values": {k: int(v) for k, v in self.missing.items()},
+            "summary": summary,
+            "head": records_for_json(self.head),
+        }
@@ -0,0 +1,119 @@
+import gzip
+import json
+import base64
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+# orjson and brotli are optional: figures fall back to the json module and gzip
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Numeric arrays at least this long are sent as base64 typed arrays (plotly.js "bdata")
+TYPED_ARRAY_MIN_LENGTH = 256
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Content codings in order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+# numpy dtypes plotly.js reads from typed arrays, and their short names
+TYPED_ARRAY_DTYPES = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8",
+}
+
+_plotly_default = PlotlyJSONEncoder().default
+
+
+def typed_array_spec(array: np.ndarray):
+    """
+    A numpy array as a plotly.js typed-array spec, or the array itself if
+    plotly.js has no typed array for its dtype. 64-bit integers, which plotly.js
+    cannot read, are narrowed to the smallest type that holds their range, and
+    values are sent little-endian.
+    """
+    if array.dtype.kind in "iu" and array.dtype.itemsize == 8:
+        low, high = array.min(), array.max()
+        for dtype in (("int8", "int16", "int32") if array.dtype.kind == "i" else ("uint8", "uint16", "uint32")):
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                array = array.astype(dtype)
+                break
+    short = TYPED_ARRAY_DTYPES.get(array.dtype.name)
+    if short is None:
+        return array
+    spec = {"dtype": short, "bdata": base64.b64encode(np.ascontiguousarray(array, array.dtype.newbyteorder("<")).tobytes()).decode("ascii")}
+    if array.ndim > 1:
+        spec["shape"] = ",".join(str(n) for n in array.shape)
+    return spec
+
+
+def _numeric_list(values) -> bool:
+    return all(type(value) in (int, float) for value in values)
+
+
+def typed_arrays(value):
+    """
+    A figure dict with its numpy arrays, and its long lists of plain numbers
+    (including rectangular lists of rows, such as heatmap z), replaced by
+    plotly.js typed-array specs: {"dtype": ..., "bdata": base64, "shape": ...}.
+    Base64 of the raw values is smaller than their decimal text and far cheaper
+    to produce and to parse.
+    """
+    if isinstance(value, dict):
+        return {key: typed_arrays(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind in "biuf" and value.size:
+            return typed_array_spec(value)
+        return value
+    if isinstance(value, (list, tuple)):
+        if len(value) >= TYPED_ARRAY_MIN_LENGTH and _numeric_list(value):
+            return typed_array_spec(np.asarray(value))
+        if (value and all(isinstance(row, list) and len(row) == len(value[0]) for row in value)
+                and len(value) * len(value[0]) >= TYPED_ARRAY_MIN_LENGTH
+                and all(_numeric_list(row) for row in value)):
+            return typed_array_spec(np.asarray(value))
+        return [typed_arrays(item) for item in value]
+    return value
+
+
+def encode_figure(fig) -> bytes:
+    """
+    The figure as compact JSON bytes, with numeric arrays as typed arrays.
+
+    orjson is used when installed. Otherwise the json module writes the figure
+    in a single strict pass; plotly's encoder, which re-parses its output to turn
+    NaN and infinity into null, is only needed when a plain list holds them.
+    """
+    figure = typed_arrays(fig.to_plotly_json())
+    if orjson is not None:
+        return orjson.dumps(figure, default=_plotly_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(figure, default=_plotly_default, allow_nan=False, separators=(",", ":"))
+    except ValueError:
+        text = PlotlyJSONEncoder(separators=(",", ":")).encode(figure)
+    return text.encode("utf-8")
+
+
+def negotiate_encoding(accept_encodings) -> str:
+    """
+    The preferred content coding the client accepts, or None for identity.
+
+    Parameters:
+    accept_encodings: The request's parsed Accept-Encoding header (request.accept_encodings).
+    """
+    for encoding in ENCODINGS:
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """body compressed with a coding from negotiate_encoding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
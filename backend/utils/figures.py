@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Plotly figures built from aggregates (bin counts, box statistics, value counts,
+# correlations) rather than raw rows, so their size does not grow with the data.
+
+
+def histogram_figure(column: str, histogram: dict) -> go.Figure:
+    """Bars over the bin edges and counts from plot_aggregates.histogram."""
+    edges = np.asarray(histogram["edges"], dtype="float64")
+    centers, widths = (edges[:-1] + edges[1:]) / 2, np.diff(edges)
+    if histogram.get("datetime"):
+        # Edges are epoch nanoseconds; date axes measure bar widths in milliseconds
+        centers, widths = pd.to_datetime(centers.astype("int64")), widths / 1e6
+    fig = go.Figure(go.Bar(x=centers, y=histogram["counts"], width=widths, name=column))
+    fig.update_layout(xaxis_title=column, yaxis_title="count", bargap=0)
+    return fig
+
+
+def _box_trace(name, box: dict, x, **kwargs) -> go.Box:
+    return go.Box(
+        x=[x], q1=[box["q1"]], median=[box["median"]], q3=[box["q3"]], mean=[box["mean"]],
+        lowerfence=[box["lowerfence"]], upperfence=[box["upperfence"]], name=name, boxpoints=False, **kwargs
+    )
+
+
+def _outlier_trace(box: dict, x) -> go.Scatter:
+    # At most MAX_OUTLIER_POINTS of them, the furthest from the whiskers
+    return go.Scatter(x=[x] * len(box["outliers"]), y=box["outliers"], mode="markers", name="outliers",
+                      marker={"size": 4})
+
+
+def box_figure(column: str, box: dict) -> go.Figure:
+    """A box from precomputed quartiles and whiskers, with its outliers as points."""
+    fig = go.Figure(_box_trace(column, box, column))
+    if box["outliers"]:
+        fig.add_trace(_outlier_trace(box, column))
+    fig.update_layout(yaxis_title=column, showlegend=False)
+    return fig
+
+
+def violin_figure(column: str, box: dict, kde: dict) -> go.Figure:
+    """
+    A violin drawn from a precomputed density curve (mirrored and filled), with
+    the box and outliers inside it, instead of shipping every value to plotly.
+    """
+    y = np.asarray(kde["x"])
+    density = np.asarray(kde["density"])
+    half_width = 0.4 * density / density.max() if density.max() > 0 else density
+    fig = go.Figure(go.Scatter(
+        x=np.concatenate([half_width, -half_width[::-1]]), y=np.concatenate([y, y[::-1]]),
+        fill="toself", mode="lines", name=column, hoverinfo="y"
+    ))
+    fig.add_trace(_box_trace(column, box, 0, width=0.1))
+    if box["outliers"]:
+        fig.add_trace(_outlier_trace(box, 0))
+    fig.update_layout(yaxis_title=column, showlegend=False,
+                      xaxis={"showticklabels": False, "zeroline": False, "title": column})
+    return fig
+
+
+def value_counts_figure(column: str, counts: dict, color: bool = False) -> go.Figure:
+    """
+    One bar per distinct value, optionally coloured by value like
+    px.histogram(color=column). Values beyond the kept ones share an "Other" bar.
+    """
+    values = [str(value) for value in counts["values"]]
+    heights = list(counts["counts"])
+    if counts["other"]:
+        values.append(f"Other ({counts['unique'] - len(counts['values'])} values)")
+        heights.append(counts["other"])
+    fig = px.bar(x=values, y=heights, color=values if color else None,
+                 labels={"x": column, "y": "count", "color": column})
+    return fig
+
+
+def missing_figure(missing: pd.Series) -> go.Figure:
+    """Horizontal bars of the missing-value count of each column that has any."""
+    missing = missing[missing > 0]
+    if missing.empty:
+        raise ValueError("No missing values found in dataset")
+
+    # Sort missing values descending
+    missing = missing.sort_values(ascending=True)
+    return px.bar(
+        x=[int(v) for v in missing.values],
+        y=[str(k) for k in missing.index],
+        orientation='h',
+        labels={"x": "Missing Count", "y": "Feature"},
+        title="Missing Values"
+    )
+
+
+def heatmap_figure(corr: pd.DataFrame) -> go.Figure:
+    if corr.shape[1] < 2:
+        raise ValueError("Not enough numeric columns for heatmap")
+    return px.imshow(corr)
+
+
+def correlation_top_n_figure(corr, column: str, top_n: int) -> go.Figure:
+    """
+    The top_n columns most correlated (in absolute value) with column. corr is
+    the correlation matrix, or just column's correlations as a Series.
+    """
+    if isinstance(corr, pd.DataFrame):
+        if column not in corr.columns:
+            raise ValueError(f"{column} not found in correlation matrix")
+        corr = corr[column]
+    top_corr = corr.drop(column).abs().sort_values(ascending=False).head(top_n)
+    return px.bar(
+        x=top_corr.values,
+        y=top_corr.index,
+        orientation='h',
+        labels={"x": "Correlation", "y": "Feature"}
+    )
+
+
+def density_figure(column: str, column2: str, grid: dict, contour: bool = False) -> go.Figure:
+    """
+    Point density from plot_aggregates.density_grid: a heatmap of counts with
+    empty cells left blank, or density contour lines like px.density_contour.
+    """
+    if contour:
+        trace = go.Contour(x=grid["x"], y=grid["y"], z=grid["z"], contours_coloring="lines", showscale=False)
+    else:
+        z = [[count or None for count in row] for row in grid["z"]]
+        trace = go.Heatmap(x=grid["x"], y=grid["y"], z=z, colorscale="Viridis", colorbar={"title": "count"})
+    fig = go.Figure(trace)
+    fig.update_layout(xaxis_title=column, yaxis_title=column2)
+    return fig
@@ -0,0 +1,112 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Memory budget for DataFrames kept by a worker process (0 disables the cache)
+FRAME_CACHE_MAX_BYTES = int(float(os.environ.get("EDA_FRAME_CACHE_MB", 1024)) * 1024 * 1024)
+
+
+class FrameCache:
+    """
+    In-process LRU cache of loaded DataFrames with a memory budget.
+
+    Entries are keyed by the source file's path, modification time and size (plus
+    the projected columns), so a rewritten file is never served from the cache.
+    Loading is single-flight: concurrent requests for the same key wait for one
+    load instead of each parsing the file. Cached frames are shared between
+    requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = None):
+        """
+        Parameters:
+        max_bytes (int): Memory budget in bytes (default: FRAME_CACHE_MAX_BYTES).
+        """
+        self.max_bytes = FRAME_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "shared_loads": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def key(path: str, columns: list = None) -> tuple:
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size, tuple(columns) if columns else None
+
+    def get(self, path: str, load, columns: list = None):
+        """
+        Returns the frame for path (and columns), calling load() on a miss.
+
+        Parameters:
+        path (str): File the frame is loaded from; its version is part of the key.
+        load (callable): Returns the DataFrame on a cache miss.
+        columns (list): The columns load() returns, when it projects them.
+        """
+        key = self.key(path, columns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[0]
+            flight = self._loading.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._loading[key] = Future()
+                self._counters["misses"] += 1
+            else:
+                self._counters["shared_loads"] += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            frame = load()
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            flight.set_exception(e)
+            raise
+
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            self._loading.pop(key, None)
+            if 0 < self.max_bytes and size <= self.max_bytes:
+                self._entries[key] = (frame, size)
+                self._bytes += size
+                self._evict()
+        flight.set_result(frame)
+        return frame
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._counters["evictions"] += 1
+
+    def invalidate(self, path: str) -> int:
+        """Drops every cached frame loaded from path. Returns the number removed."""
+        path = os.path.abspath(path)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == path]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            self._counters["invalidations"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
+
+
+# Process-wide cache instance used by the EDA controller
+frame_cache = FrameCache()
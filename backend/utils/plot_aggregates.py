@@ -0,0 +1,502 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.db import Database
+from utils.eda_utils import is_numeric_dtype, python_value
+from utils.eda_store import pack_json, unpack_json
+from utils.arrow_cache import ArrowDatasetCache
+from core.src.ingest_data import apply_schema
+
+# Build plot aggregates as the last stage of upload processing (set to 0 to skip)
+PLOT_AGGREGATES_ON_UPLOAD = os.environ.get("PLOT_AGGREGATES_ON_UPLOAD", "1") == "1"
+# Histograms use numpy's "auto" bin rule, capped at this many bins
+MAX_HISTOGRAM_BINS = 100
+# Distinct values kept per column for bar charts; the rest are summed into "other"
+VALUE_COUNTS_LIMIT = 100
+# Box plot outliers kept per column, the furthest from the whiskers first
+MAX_OUTLIER_POINTS = 1000
+# Points on each KDE curve, and the bins the values are counted into before smoothing
+KDE_POINTS = 200
+KDE_GRID_BINS = 1024
+# Aggregates each single-column plot needs
+PLOT_PARTS = {
+    "histogram": ("histogram",),
+    "boxplot": ("box",),
+    "violin": ("box", "kde"),
+    "category_distribution": ("value_counts",),
+}
+ALL_PARTS = ("histogram", "box", "kde", "value_counts")
+# Points scatter, jointplot and pairplot figures send before switching to
+# a sample or a density grid (PLOT_SCATTER_MODE is "sample" or "density")
+PLOT_POINT_BUDGET = int(os.environ.get("PLOT_POINT_BUDGET", 50_000))
+PLOT_SCATTER_MODE = os.environ.get("PLOT_SCATTER_MODE", "sample")
+# Cells per axis of density heatmaps and contours, and the strata samples are spread over
+DENSITY_GRID_BINS = 200
+CONTOUR_GRID_BINS = 50
+SAMPLE_STRATA = 1024
+# Rows per batch when accumulating the correlation matrix
+CORRELATION_BATCH_ROWS = 65_536
+# Cells of the stored correlation matrix per document; wide matrices are split
+# into blocks of whole rows so no document nears MongoDB's 16 MB limit
+CORRELATION_BLOCK_CELLS = int(os.environ.get("CORRELATION_BLOCK_CELLS", 250_000))
+
+
+def finite_values(series: pd.Series) -> np.ndarray:
+    """A numeric column's values as float64, without missing or infinite values."""
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def histogram_bins(values: np.ndarray) -> int:
+    """
+    The number of bins numpy's "auto" rule gives (the smaller of the
+    Freedman-Diaconis and Sturges bin widths), capped at MAX_HISTOGRAM_BINS.
+    """
+    span = float(values.max() - values.min())
+    if span == 0:
+        return 1
+    n = values.size
+    width = span / (np.log2(n) + 1.0)
+    q1, q3 = np.percentile(values, [25, 75])
+    if q3 > q1:
+        width = min(width, 2.0 * (q3 - q1) * n ** (-1.0 / 3.0))
+    return int(min(np.ceil(span / width), MAX_HISTOGRAM_BINS))
+
+
+def histogram(values: np.ndarray) -> dict:
+    """
+    Bin edges and counts, using numpy's "auto" rule with at most MAX_HISTOGRAM_BINS
+    bins. The bin count is worked out and capped before any edges are built, as
+    the "auto" rule alone can ask for billions of bins when one value is far from
+    the rest.
+    """
+    if values.size == 0:
+        return {"edges": [], "counts": []}
+    counts, edges = np.histogram(values, bins=histogram_bins(values))
+    return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+
+def kde(values: np.ndarray) -> dict:
+    """
+    Gaussian kernel density estimate with the rule-of-thumb bandwidth plotly's
+    violin uses, spanning two bandwidths beyond the data. Values are first counted
+    into KDE_GRID_BINS bins and the counts convolved with the kernel, so the cost
+    is linear in the number of values rather than values x curve points.
+    """
+    n = values.size
+    if n == 0:
+        return {}
+    std = values.std(ddof=1) if n > 1 else 0.0
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(std, (q3 - q1) / 1.349) or std
+    bandwidth = 1.059 * spread * n ** -0.2
+    if not bandwidth > 0:
+        # Constant column: any small width shows a single spike
+        bandwidth = 1e-3 * max(abs(float(values[0])), 1.0)
+
+    low, high = values.min() - 2 * bandwidth, values.max() + 2 * bandwidth
+    counts, edges = np.histogram(values, bins=KDE_GRID_BINS, range=(low, high))
+    centers = (edges[:-1] + edges[1:]) / 2
+    step = edges[1] - edges[0]
+    half_width = min(int(np.ceil(4 * bandwidth / step)), KDE_GRID_BINS)
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    smoothed = np.convolve(counts, kernel)[half_width:half_width + KDE_GRID_BINS]
+    density = smoothed / (n * bandwidth * np.sqrt(2 * np.pi))
+
+    x = np.linspace(low, high, KDE_POINTS)
+    return {"x": x.tolist(), "density": np.interp(x, centers, density).tolist(), "bandwidth": float(bandwidth)}
+
+
+def box_stats(values: np.ndarray) -> dict:
+    """
+    Quartiles (linear interpolation, as plotly computes them), mean, 1.5 IQR
+    whiskers and the values beyond them, capped at MAX_OUTLIER_POINTS.
+    """
+    if values.size == 0:
+        return {}
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= low) & (values <= high)]
+    outliers = values[(values < low) | (values > high)]
+    outlier_count = outliers.size
+    if outlier_count > MAX_OUTLIER_POINTS:
+        distance = np.maximum(low - outliers, outliers - high)
+        outliers = outliers[np.argpartition(-distance, MAX_OUTLIER_POINTS)[:MAX_OUTLIER_POINTS]]
+    return {
+        "q1": float(q1), "median": float(median), "q3": float(q3), "mean": float(values.mean()),
+        "min": float(values.min()), "max": float(values.max()),
+        "lowerfence": float(inside.min()), "upperfence": float(inside.max()),
+        "outliers": np.sort(outliers).tolist(), "outlier_count": int(outlier_count),
+    }
+
+
+def value_counts(series: pd.Series) -> dict:
+    """The VALUE_COUNTS_LIMIT most frequent values and the count of all other non-missing values."""
+    counts = series.value_counts()
+    counts = counts[counts > 0]
+    top = counts.iloc[:VALUE_COUNTS_LIMIT]
+    return {
+        "values": [python_value(value) for value in top.index],
+        "counts": [int(count) for count in top.values],
+        "other": int(counts.iloc[VALUE_COUNTS_LIMIT:].sum()),
+        "unique": int(len(counts)),
+    }
+
+
+def column_aggregates(series: pd.Series, parts: tuple = ALL_PARTS) -> dict:
+    """
+    The aggregates single-column plots are drawn from, computed from one column's
+    values: any of "histogram", "box", "kde" and "value_counts" (see PLOT_PARTS).
+    Box and KDE only apply to numeric columns; histograms of text columns are
+    drawn from value counts.
+    """
+    aggregates = {"missing": int(series.isnull().sum()), "numeric": is_numeric_dtype(series.dtype)}
+    if aggregates["numeric"]:
+        values = finite_values(series)
+        if "histogram" in parts:
+            aggregates["histogram"] = histogram(values)
+        if "box" in parts:
+            aggregates["box"] = box_stats(values)
+        if "kde" in parts:
+            aggregates["kde"] = kde(values)
+    elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if "histogram" in parts:
+            # Bins over epoch nanoseconds, labelled with timestamps when drawn
+            values = series.dropna().to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+            aggregates["histogram"] = {**histogram(values), "datetime": True}
+    elif "histogram" in parts and "value_counts" not in parts:
+        parts = parts + ("value_counts",)
+    if "value_counts" in parts:
+        aggregates["value_counts"] = value_counts(series)
+    return aggregates
+
+
+def _axis_codes(series: pd.Series) -> np.ndarray:
+    """A column as float64 positions for stratifying: numbers, epoch nanoseconds or category codes."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = series.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+        values[series.isnull().to_numpy()] = np.nan
+        return values
+    if is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    codes = pd.factorize(series)[0].astype("float64")
+    codes[codes < 0] = np.nan
+    return codes
+
+
+def sample_rows(frame: pd.DataFrame, columns: list, budget: int) -> np.ndarray:
+    """
+    Sorted positions of a deterministic stratified sample of about budget rows
+    (never more than budget plus the extremes) over the given columns.
+
+    The value range of each column is cut into equal-width strata (missing values
+    get their own), and every non-empty cell of the grid they form keeps at least
+    one row, so sparse regions and outliers survive. The rest of the budget is
+    shared in proportion to cell size. The rows holding each numeric column's
+    minimum and maximum are always kept. Within a cell, rows are taken in a fixed
+    pseudo-random order, so the same data always yields the same sample.
+    """
+    n = len(frame)
+    if n <= budget:
+        return np.arange(n)
+
+    extremes = set()
+    bins = max(2, int(SAMPLE_STRATA ** (1 / len(columns))))
+    cells = np.zeros(n, dtype="int64")
+    for column in columns:
+        values = _axis_codes(frame[column])
+        finite = np.isfinite(values)
+        if finite.any():
+            low, high = values[finite].min(), values[finite].max()
+            if is_numeric_dtype(frame[column].dtype):
+                extremes.update((int(np.nanargmin(values)), int(np.nanargmax(values))))
+        else:
+            low = high = 0.0
+        scaled = np.nan_to_num((values - low) / (high - low)) if high > low else np.zeros(n)
+        strata = np.where(finite, np.minimum((scaled * bins).astype("int64"), bins - 1), bins)
+        cells = cells * (bins + 1) + strata
+
+    extremes = np.fromiter(sorted(extremes), dtype="int64")
+    # Fixed seed: the sample is part of a cached, ETag-validated figure
+    rank = np.random.default_rng(0).permutation(n)
+    rank[extremes] = -1
+    order = np.lexsort((rank, cells))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    if starts.size >= budget:
+        # More occupied cells than points to spend: one row from each of the largest
+        sampled = order[starts[np.argsort(-sizes, kind="stable")[:max(budget - extremes.size, 0)]]]
+    else:
+        ratio = (budget - starts.size) / n
+        quotas = 1 + np.floor(sizes * ratio).astype("int64")
+        position = np.arange(n) - np.repeat(starts, sizes)
+        sampled = order[position < np.repeat(quotas, sizes)]
+    return np.union1d(sampled, extremes)
+
+
+def density_grid(x: pd.Series, y: pd.Series, bins: int = None) -> dict:
+    """Counts of the complete (x, y) pairs of two numeric columns on a bins x bins grid (default DENSITY_GRID_BINS)."""
+    bins = bins or DENSITY_GRID_BINS
+    x_values, y_values = _axis_codes(x), _axis_codes(y)
+    complete = np.isfinite(x_values) & np.isfinite(y_values)
+    counts, x_edges, y_edges = np.histogram2d(x_values[complete], y_values[complete], bins=bins)
+    return {
+        "x": ((x_edges[:-1] + x_edges[1:]) / 2).tolist(),
+        "y": ((y_edges[:-1] + y_edges[1:]) / 2).tolist(),
+        # Rows of z run along y, as plotly expects
+        "z": counts.T.astype("int64").tolist(),
+        "points": int(complete.sum()),
+    }
+
+
+class CorrelationAccumulator:
+    """
+    Pearson correlation over row batches, using pairwise-complete observations
+    like DataFrame.corr(): each pair only uses the rows where both values exist.
+    Memory is O(columns²) whatever the row count.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self._shift = None
+        self._n = np.zeros((k, k))
+        self._sx = np.zeros((k, k))
+        self._sxx = np.zeros((k, k))
+        self._sxy = np.zeros((k, k))
+
+    def update(self, frame: pd.DataFrame) -> None:
+        x = frame[self.columns].to_numpy(dtype="float64", na_value=np.nan)
+        if self._shift is None:
+            # Centring on the first batch's means keeps the sums of products well conditioned
+            with np.errstate(all="ignore"):
+                self._shift = np.nan_to_num(np.nanmean(x, axis=0)) if x.size else np.zeros(len(self.columns))
+        x = x - self._shift
+        present = ~np.isnan(x)
+        mask = present.astype("float64")
+        x = np.where(present, x, 0.0)
+        # [i, j] entries only count rows where both column i and column j are present
+        self._n += mask.T @ mask
+        self._sx += x.T @ mask
+        self._sxx += (x * x).T @ mask
+        self._sxy += x.T @ x
+
+    def result(self) -> pd.DataFrame:
+        corr = _pearson(self._n, self._sx, self._sx.T, self._sxx, self._sxx.T, self._sxy)
+        diagonal = np.diag(self._n * self._sxx - self._sx * self._sx) > 0
+        corr[np.diag_indices_from(corr)] = np.where(diagonal, 1.0, np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def _pearson(n, sx, sy, sxx, syy, sxy) -> np.ndarray:
+    """Pearson correlations from counts and (shifted) sums over each pair's common rows."""
+    with np.errstate(all="ignore"):
+        covariance = n * sxy - sx * sy
+        variance_x = n * sxx - sx * sx
+        variance_y = n * syy - sy * sy
+        corr = covariance / np.sqrt(variance_x * variance_y)
+    corr[(n < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _centred(values: np.ndarray) -> tuple:
+    """Values minus their column means with missing values as 0, and the presence mask as 0/1."""
+    with np.errstate(all="ignore"):
+        shift = np.nan_to_num(np.nanmean(values, axis=0)) if values.size else 0.0
+    values = values - shift
+    present = ~np.isnan(values)
+    return np.where(present, values, 0.0), present.astype("float64")
+
+
+def column_correlation(frame: pd.DataFrame, column: str, columns: list) -> pd.Series:
+    """
+    Pearson correlation of one column with each of columns, pairwise-complete
+    like DataFrame.corr(), in O(rows x columns) rather than the full matrix's
+    O(rows x columns²). Where neither side has missing values, the columns are
+    centred once and the correlations come from one matrix-vector product;
+    columns with gaps use masked sums over the rows both values share.
+    """
+    # Filled column by column: cheaper than DataFrame.to_numpy's row-major copy
+    values = np.empty((len(frame), len(columns)), order="F")
+    for j, name in enumerate(columns):
+        values[:, j] = frame[name].to_numpy(dtype="float64", na_value=np.nan)
+    target = frame[column].to_numpy(dtype="float64", na_value=np.nan)
+    present = ~np.isnan(target)
+    if not present.all():
+        # Every pair needs the target's value, so its missing rows can go up front
+        values, target = values[present], target[present]
+    corr = np.full(len(columns), np.nan)
+    if target.size < 2:
+        return pd.Series(corr, index=list(columns), name=column)
+    y = target - target.mean()
+
+    gaps = np.isnan(values).any(axis=0)
+    sparse = np.flatnonzero(gaps)
+    if sparse.size:
+        x, mask = _centred(values[:, sparse])
+        corr[sparse] = _pearson(
+            n=mask.sum(axis=0),
+            sx=x.sum(axis=0), sy=y @ mask,
+            sxx=np.einsum("ij,ij->j", x, x), syy=(y * y) @ mask,
+            sxy=y @ x,
+        )
+    if not gaps.all():
+        # Centred in place; the columns with gaps were handled above and give NaN here
+        values -= values.mean(axis=0)
+        with np.errstate(all="ignore"):
+            scale = np.sqrt(np.einsum("ij,ij->j", values, values) * (y @ y))
+            dense = np.where(scale > 0, (y @ values) / scale, np.nan)
+        corr[~gaps] = dense[~gaps]
+    return pd.Series(np.clip(corr, -1.0, 1.0), index=list(columns), name=column)
+
+
+def correlation_columns(dtypes: pd.Series) -> list:
+    """Columns DataFrame.corr(numeric_only=True) uses: numbers and booleans."""
+    return [column for column, dtype in dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)]
+
+
+def parquet_columns(path: str) -> dict:
+    """Column name -> pandas dtype of a Parquet file, read from its footer."""
+    arrow_schema = pq.read_schema(path)
+    index_columns = (arrow_schema.pandas_metadata or {}).get("index_columns", [])
+    dtypes = {}
+    for field in arrow_schema:
+        if field.name in index_columns:
+            continue
+        try:
+            dtypes[field.name] = np.dtype(field.type.to_pandas_dtype())
+        except NotImplementedError:
+            dtypes[field.name] = np.dtype(object)
+    return dtypes
+
+
+def parquet_null_counts(path: str):
+    """
+    Missing values per column from the null counts in a Parquet file's row group
+    statistics, without reading any values. None when a column chunk has no
+    statistics. Datasets are written from pandas, which stores NaN as null, so
+    the counts match DataFrame.isnull().sum().
+    """
+    parquet = pq.ParquetFile(path)
+    metadata = parquet.metadata
+    if metadata.num_columns != len(parquet.schema_arrow):
+        # Nested columns span several column chunks
+        return None
+    names = list(parquet_columns(path))
+    counts = dict.fromkeys(names, 0)
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        for i in range(row_group.num_columns):
+            chunk = row_group.column(i)
+            if chunk.path_in_schema not in counts:
+                continue
+            if chunk.statistics is None or not chunk.statistics.has_null_count:
+                return None
+            counts[chunk.path_in_schema] += chunk.statistics.null_count
+    return pd.Series(counts, dtype="int64")
+
+
+def build_plot_aggregates(path: str, schema: dict = None) -> dict:
+    """
+    Aggregates for every column of a processed Parquet dataset. Columns are read
+    one at a time and the correlation matrix is accumulated over row batches,
+    so memory is bounded by a single column.
+
+    Parameters:
+    path (str): Processed Parquet file.
+    schema (dict): The dataset's stored schema (see infer_schema); its category
+        levels and datetime formats are applied as when the dataset is loaded.
+
+    Returns:
+    dict: {"columns": {name: column aggregates}, "missing": [[name, count], ...],
+           "correlation": {"columns": [...], "bool_columns": [...], "matrix": [[...]]}}
+    """
+    parquet = pq.ParquetFile(path)
+    index_columns = (parquet.schema_arrow.pandas_metadata or {}).get("index_columns", [])
+    names = [name for name in parquet.schema_arrow.names if name not in index_columns]
+    columns, dtypes = {}, {}
+    for name in names:
+        series = apply_schema(parquet.read(columns=[name]).to_pandas(), schema)[name]
+        columns[name] = column_aggregates(series)
+        dtypes[name] = series.dtype
+
+    numeric = correlation_columns(pd.Series(dtypes, dtype=object))
+    accumulator = CorrelationAccumulator(numeric)
+    if numeric:
+        for batch in parquet.iter_batches(batch_size=CORRELATION_BATCH_ROWS, columns=numeric):
+            accumulator.update(apply_schema(batch.to_pandas(), schema))
+    corr = accumulator.result()
+
+    return {
+        "columns": columns,
+        "missing": [[name, columns[name]["missing"]] for name in names],
+        "correlation": {
+            "columns": numeric,
+            "bool_columns": [name for name in numeric if pd.api.types.is_bool_dtype(dtypes[name])],
+            "matrix": corr.to_numpy().tolist(),
+        },
+    }
+
+
+# --- Storage ------------------------------------------------------------------
+# Aggregates are keyed by the processed file's version (path, size, mtime), so
+# datasets sharing a file share them and a rewritten file never serves stale ones.
+
+def aggregates_version(path: str) -> str:
+    return ArrowDatasetCache.version(path)
+
+
+def save_plot_aggregates(version: str, aggregates: dict) -> None:
+    collection = Database.get_collection("plot_aggregates")
+    collection.create_index([("version", 1), ("kind", 1), ("column", 1)])
+    documents = [{"version": version, "kind": "column", "column": name, **pack_json(value)}
+                 for name, value in aggregates["columns"].items()]
+    documents.append({"version": version, "kind": "missing", "column": None, **pack_json(aggregates["missing"])})
+
+    correlation = aggregates["correlation"]
+    matrix = correlation["matrix"]
+    block_rows = max(1, CORRELATION_BLOCK_CELLS // max(1, len(matrix)))
+    for block, start in enumerate(range(0, len(matrix), block_rows)):
+        documents.append({"version": version, "kind": "correlation_rows", "column": None, "block": block,
+                          **pack_json(matrix[start:start + block_rows])})
+    # Written last: has_plot_aggregates checks for it, so the row blocks are already stored
+    documents.append({"version": version, "kind": "correlation", "column": None,
+                      **pack_json({key: value for key, value in correlation.items() if key != "matrix"})})
+    collection.insert_many(documents)
+
+
+def load_plot_aggregates(version: str, kind: str, column: str = None):
+    """One stored aggregate ("column", "missing" or "correlation"), or None if it was not precomputed."""
+    collection = Database.get_collection("plot_aggregates")
+    document = collection.find_one({"version": version, "kind": kind, "column": column}, {"_id": 0})
+    if not document:
+        return None
+    value = unpack_json(document)
+    if kind == "correlation" and "matrix" not in value:
+        blocks = collection.find({"version": version, "kind": "correlation_rows"}, {"_id": 0}).sort("block", 1)
+        value["matrix"] = [row for block in blocks for row in unpack_json(block)]
+    return value
+
+
+def has_plot_aggregates(version: str) -> bool:
+    return Database.get_collection("plot_aggregates").find_one(
+        {"version": version, "kind": "correlation"}, {"_id": 1}
+    ) is not None
+
+
+def delete_plot_aggregates(version: str) -> None:
+    Database.get_collection("plot_aggregates").delete_many({"version": version})
+
+
+def precompute_plot_aggregates(path: str, schema: dict = None) -> str:
+    """Build and store the aggregates for a processed Parquet file unless they already exist. Returns its version."""
+    version = aggregates_version(path)
+    if not has_plot_aggregates(version):
+        save_plot_aggregates(version, build_plot_aggregates(path, schema))
+        print(f"✅ Plot aggregates precomputed for: {path}")
+    return version
@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Memory budget for encoded figures kept by a worker process (0 disables the cache)
+PLOT_CACHE_MAX_BYTES = int(float(os.environ.get("PLOT_CACHE_MB", 256)) * 1024 * 1024)
+# Bump when figure construction or encoding changes, so clients drop old ETags
+FIGURE_FORMAT_VERSION = "3"
+
+
+def plot_etag(dataset_version: str, **params) -> str:
+    """
+    Strong ETag for a figure: a digest of the dataset version and every request
+    parameter that shapes the figure.
+    """
+    key = json.dumps({"dataset": dataset_version, "format": FIGURE_FORMAT_VERSION, **params},
+                     sort_keys=True, default=str)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class PlotResponseCache:
+    """In-process LRU of encoded figure responses keyed by ETag, bounded by their total size."""
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = PLOT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, etag: str):
+        with self._lock:
+            body = self._entries.get(etag)
+            if body is not None:
+                self._entries.move_to_end(etag)
+            return body
+
+    def put(self, etag: str, body: bytes) -> None:
+        if not 0 < len(body) <= self.max_bytes:
+            return
+        with self._lock:
+            if etag in self._entries:
+                return
+            self._entries[etag] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Process-wide cache instance used by the EDA controller
+plot_cache = PlotResponseCache()
+
+
+# Correlation results kept by a worker process: whole matrices and single-column rows
+CORRELATION_CACHE_ENTRIES = int(os.environ.get("CORRELATION_CACHE_ENTRIES", 64))
+
+
+class CorrelationCache:
+    """
+    In-process LRU of correlation results keyed by dataset version and column
+    (None for the whole matrix). A version changes whenever its file does, so
+    entries never go stale; they only age out.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = CORRELATION_CACHE_ENTRIES if max_entries is None else max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, column: str = None):
+        with self._lock:
+            value = self._entries.get((version, column))
+            if value is not None:
+                self._entries.move_to_end((version, column))
+            return value
+
+    def put(self, version: str, value, column: str = None) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[(version, column)] = value
+            self._entries.move_to_end((version, column))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache instance used by the EDA controller
+correlation_cache = CorrelationCache()
@@ -0,0 +1,358 @@
+import base64
+import numpy as np
+import pandas as pd
+
+from utils.eda_utils import is_numeric_dtype, python_value
+
+# HyperLogLog register index bits: 2**12 registers, about 1.6% standard error
+HLL_PRECISION = 12
+# KLL accuracy parameter: about 1.7% rank error with roughly 3 * k retained values
+KLL_K = 200
+# Counters kept per non-numeric column for frequent values
+FREQUENT_CAPACITY = 64
+# Frequent values reported per column in summaries
+TOP_K = 10
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hashes that agree across chunks, whatever the chunk's dtype width."""
+    if is_numeric_dtype(values.dtype):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    Distinct count estimate (Flajolet et al.) in 2**precision one-byte registers.
+    Two sketches of the same precision merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: np.ndarray = None):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        if hashes.size == 0:
+            return
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # frexp's exponent is the bit length; suffixes below 2**53 convert to float exactly
+        _, bit_length = np.frexp(suffix.astype(np.float64))
+        rank = (suffix_bits - bit_length + 1).astype(np.uint8)
+        best = pd.Series(rank).groupby(index).max()
+        current = self.registers[best.index.to_numpy()]
+        self.registers[best.index.to_numpy()] = np.maximum(current, best.to_numpy())
+
+    def update(self, values: pd.Series) -> None:
+        self.update_hashes(_hash_values(values.dropna()))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def count(self) -> int:
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting over empty registers
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self) -> dict:
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return cls(data["precision"], registers)
+
+
+class KLLSketch:
+    """
+    Quantile sketch (Karnin, Lang and Liberty) over numeric values. Level h holds
+    values of weight 2**h; a full level is sorted and every other value is promoted.
+    Count, mean, variance, min and max are tracked exactly alongside it.
+    """
+
+    def __init__(self, k: int = KLL_K, random_state: int = 0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(random_state)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if values.size >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                values = np.sort(values)
+                # An odd value out stays behind at its current weight
+                keep = values[:values.size % 2]
+                paired = values[values.size % 2:]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Adding a level lowers every capacity below it, so start over
+                level = 0
+                continue
+            level += 1
+
+    def _update_moments(self, count, mean, m2, minimum, maximum) -> None:
+        # Chan et al. pairwise update of count / mean / sum of squared deviations
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values: pd.Series) -> None:
+        x = values.to_numpy(dtype="float64", na_value=np.nan)
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return
+        mean = x.mean()
+        self._update_moments(x.size, mean, ((x - mean) ** 2).sum(), x.min(), x.max())
+        self.levels[0] = np.concatenate([self.levels[0], x])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        merged = KLLSketch(self.k)
+        merged.levels = [np.empty(0)] * max(len(self.levels), len(other.levels))
+        for sketch in (self, other):
+            for level, values in enumerate(sketch.levels):
+                merged.levels[level] = np.concatenate([merged.levels[level], values])
+            if sketch.count:
+                merged._update_moments(sketch.count, sketch.mean, sketch.m2, sketch.min, sketch.max)
+        merged._compress()
+        return merged
+
+    def quantiles(self, qs) -> list:
+        """Approximate quantiles for each q in qs (0 and 1 give the exact min and max)."""
+        if not self.count:
+            return [np.nan for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(v.size, 2.0 ** level) for level, v in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        result = []
+        for q in qs:
+            if q <= 0:
+                result.append(self.min)
+            elif q >= 1:
+                result.append(self.max)
+            else:
+                position = np.searchsorted(cumulative, q * cumulative[-1])
+                result.append(values[min(position, values.size - 1)])
+        return result
+
+    def std(self) -> float:
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def to_dict(self) -> dict:
+        return {
+            "k": self.k, "count": int(self.count), "mean": float(self.mean), "m2": float(self.m2),
+            "min": python_value(self.min) if self.count else None,
+            "max": python_value(self.max) if self.count else None,
+            "levels": [values.tolist() for values in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KLLSketch":
+        sketch = cls(data["k"])
+        sketch.levels = [np.asarray(values, dtype="float64") for values in data["levels"]]
+        sketch.count, sketch.mean, sketch.m2 = data["count"], data["mean"], data["m2"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+
+class FrequentItems:
+    """
+    Misra-Gries summary of the most frequent values in at most `capacity` counters.
+    Estimated counts are never above the true count and at most `error` below it;
+    summaries merge by adding counters and trimming back to capacity.
+    """
+
+    def __init__(self, capacity: int = FREQUENT_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.error = 0
+
+    def _add(self, counts: pd.Series, error: int = 0) -> None:
+        counts = self.counts.add(counts, fill_value=0).astype("int64") if len(self.counts) else counts.astype("int64")
+        self.error += error
+        if len(counts) > self.capacity:
+            cutoff = int(counts.nlargest(self.capacity + 1).iloc[-1])
+            counts = counts - cutoff
+            counts = counts[counts > 0]
+            self.error += cutoff
+        self.counts = counts
+
+    def update(self, values: pd.Series) -> None:
+        counts = values.value_counts()
+        # Unused category levels would otherwise take up counters
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+        self._add(counts.rename_axis(None).rename(None))
+
+    def merge(self, other: "FrequentItems") -> "FrequentItems":
+        merged = FrequentItems(self.capacity)
+        merged._add(self.counts)
+        merged._add(other.counts, self.error + other.error)
+        return merged
+
+    def top(self, n: int = TOP_K) -> list:
+        """The n most frequent values as (value, estimated count) pairs."""
+        return [(python_value(value), int(count)) for value, count in self.counts.nlargest(n).items()]
+
+    def to_dict(self) -> dict:
+        return {"capacity": self.capacity, "error": int(self.error), "items": [list(item) for item in self.top(self.capacity)]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FrequentItems":
+        sketch = cls(data["capacity"])
+        sketch.error = data["error"]
+        if data["items"]:
+            values, counts = zip(*data["items"])
+            sketch.counts = pd.Series(counts, index=pd.Index(values, dtype=object), dtype="int64")
+        return sketch
+
+
+class ColumnSketch:
+    """Missing count, distinct count and either quantiles (numeric) or frequent values for one column."""
+
+    def __init__(self, numeric: bool):
+        self.numeric = numeric
+        self.rows = 0
+        self.missing = 0
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch() if numeric else None
+        self.frequent = None if numeric else FrequentItems()
+
+    def update(self, values: pd.Series) -> None:
+        self.rows += len(values)
+        self.missing += int(values.isnull().sum())
+        self.distinct.update(values)
+        if self.numeric:
+            self.quantiles.update(values)
+        else:
+            self.frequent.update(values)
+
+    def merge(self, other: "ColumnSketch") -> "ColumnSketch":
+        if other.numeric != self.numeric:
+            raise ValueError("Cannot merge sketches of numeric and non-numeric columns")
+        merged = ColumnSketch(self.numeric)
+        merged.rows = self.rows + other.rows
+        merged.missing = self.missing + other.missing
+        merged.distinct = self.distinct.merge(other.distinct)
+        if self.numeric:
+            merged.quantiles = self.quantiles.merge(other.quantiles)
+        else:
+            merged.frequent = self.frequent.merge(other.frequent)
+        return merged
+
+    def summary(self) -> dict:
+        """describe()-style statistics for the column; unique and percentiles are estimates."""
+        summary = {"count": self.rows - self.missing, "unique": self.distinct.count()}
+        if self.numeric:
+            q = self.quantiles
+            q25, q50, q75 = q.quantiles([0.25, 0.5, 0.75])
+            summary.update({"mean": q.mean if q.count else np.nan, "std": q.std(), "min": q.quantiles([0])[0],
+                            "25%": q25, "50%": q50, "75%": q75, "max": q.quantiles([1])[0]})
+        else:
+            top = self.frequent.top()
+            if top:
+                summary["top"], summary["freq"] = top[0]
+            summary["frequent"] = top
+        return {stat: "" if not isinstance(value, list) and pd.isnull(value) else python_value(value)
+                for stat, value in summary.items()}
+
+    def to_dict(self) -> dict:
+        data = {"numeric": self.numeric, "rows": int(self.rows), "missing": int(self.missing),
+                "distinct": self.distinct.to_dict()}
+        if self.numeric:
+            data["quantiles"] = self.quantiles.to_dict()
+        else:
+            data["frequent"] = self.frequent.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnSketch":
+        sketch = cls(data["numeric"])
+        sketch.rows, sketch.missing = data["rows"], data["missing"]
+        sketch.distinct = HyperLogLog.from_dict(data["distinct"])
+        if sketch.numeric:
+            sketch.quantiles = KLLSketch.from_dict(data["quantiles"])
+        else:
+            sketch.frequent = FrequentItems.from_dict(data["frequent"])
+        return sketch
+
+
+class DatasetSketch:
+    """
+    Per-column sketches built in one pass over a dataset's chunks.
+
+    They answer summary statistics and IQR outlier thresholds without reading the
+    data again, in memory independent of the row count, and sketches of appended
+    or partitioned data merge into the sketch of the combined data.
+    """
+
+    def __init__(self):
+        self.columns = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnSketch(is_numeric_dtype(chunk[column].dtype))
+            self.columns[column].update(chunk[column])
+
+    def merge(self, other: "DatasetSketch") -> "DatasetSketch":
+        merged = DatasetSketch()
+        for column in list(self.columns) + [c for c in other.columns if c not in self.columns]:
+            mine, theirs = self.columns.get(column), other.columns.get(column)
+            merged.columns[column] = mine.merge(theirs) if mine and theirs else (mine or theirs)
+        return merged
+
+    def summary(self) -> dict:
+        return {column: sketch.summary() for column, sketch in self.columns.items()}
+
+    def outlier_bounds(self, factor: float = 1.5) -> dict:
+        """
+        Tukey fences (Q1 - factor * IQR, Q3 + factor * IQR) per numeric column,
+        the thresholds IQROutlierDetection applies.
+        """
+        bounds = {}
+        for column, sketch in self.columns.items():
+            if sketch.numeric and sketch.quantiles.count:
+                q1, q3 = sketch.quantiles.quantiles([0.25, 0.75])
+                iqr = q3 - q1
+                bounds[column] = {"lower": float(q1 - factor * iqr), "upper": float(q3 + factor * iqr)}
+        return bounds
+
+    def to_dict(self) -> dict:
+        # Column names become list entries, since MongoDB keys cannot contain "." or start with "$"
+        return {"columns": [{"name": column, **sketch.to_dict()} for column, sketch in self.columns.items()]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DatasetSketch":
+        sketch = cls()
+        for column in data["columns"]:
+            column = dict(column)
+            sketch.columns[column.pop("name")] = ColumnSketch.from_dict(column)
+        return sketch
@@ -16,12 +16,12 @@ export const fetchDatasets = async (userId) => {
     }
 };
 
-// ✅ Fetch EDA for a specific dataset
+// ✅ Fetch EDA for a specific dataset (dataset details only carry the compact EDA)
 export const fetchEdaData = async (datasetId) => {
     try {
-        const response = await api.get(`datasets/${datasetId}`);
+        const response = await api.get(`dataset/${datasetId}/eda`);
         toast.success('EDA data loaded successfully.');
-        return response.data.dataset || {};
+        return response.data || {};
     } catch (error) {
         toast.error('Failed to load EDA data.');
         console.error(error);